@@ -3,34 +3,43 @@ Agent setup and initialization
 """
 import streamlit as st
 from langchain import hub
-from langchain.agents import AgentExecutor, create_tool_calling_agent
+from langchain.agents import create_tool_calling_agent
 from langchain_openai import ChatOpenAI
 
 from config.settings import LLM_CONFIG, AGENT_CONFIG
+from agents.parallel_executor import ParallelAgentExecutor
 from tools import (
     web_search,
     get_weather,
     convert_currency,
+    convert_currency_batch,
     get_stock_price,
     calculator,
+    calculator_batch,
     query_documents
 )
 
 
+# Tag on the agent's own LLM, so the chat UI streams its tokens but not those of LLMs called inside tools
+ANSWER_TAG = "agent_answer"
+
+
 @st.cache_resource
 def setup_agent():
     """Initialize the agent with all tools"""
     
     # Initialize LLM
-    llm = ChatOpenAI(**LLM_CONFIG)
+    llm = ChatOpenAI(**LLM_CONFIG, streaming=AGENT_CONFIG["stream_responses"], tags=[ANSWER_TAG])
     
     # Define all available tools
     tools = [
         web_search,
         get_weather,
         convert_currency,
+        convert_currency_batch,
         get_stock_price,
         calculator,
+        calculator_batch,
         query_documents,
     ]
     
@@ -54,16 +63,25 @@ IMPORTANT INSTRUCTIONS FOR DOCUMENT QUERIES:
 - Users may have uploaded their resume, CV, reports, or other documents - always check these before saying you can't help
 - If a user mentions they uploaded something, believe them and use the query_documents tool
 - Follow-up questions about documents (like "summarize it", "tell me more", "what else") should also use query_documents
+- Always send query_documents a standalone question (e.g. "tell me more about it" → "tell me more about my role at Acme")
+- query_documents returns numbered passages with (file, page) citations: answer from them, cite the sources you used, and say so if the passages don't contain the answer
+- When the user means one document, page or section ("the contract", "page 3 of the report", "my education section"), pass it as query_documents' file/page/section arguments, using the names listed below
+
+Uploaded documents:
+{available_documents}
 
 Available tools and when to use them:
 - query_documents: For ANY questions about uploaded files, resumes, personal documents, AND follow-ups about them
 - web_search: For current events, news, latest information not in documents
 - get_weather: For weather information
 - convert_currency: For currency conversion
-- get_stock_price: For stock market data
-- calculator: For mathematical calculations
+- convert_currency_batch: For several amounts and/or target currencies at once
+- get_stock_price: For stock market data (pass every ticker of a comparison in one call)
+- calculator: For mathematical calculations (mode 'decimal' for money, 'fraction' for exact ratios)
+- calculator_batch: For several calculations at once
 
-Always use the most appropriate tool for the user's question, considering the conversation context."""
+Always use the most appropriate tool for the user's question, considering the conversation context.
+When a question needs several independent lookups (e.g. weather in three cities and a currency conversion), request all of those tool calls at once: they run in parallel."""
 
     # Update the system message in the prompt
     from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
@@ -73,7 +91,7 @@ Always use the most appropriate tool for the user's question, considering the co
     MessagesPlaceholder("chat_history", optional=True),  # ← Memory
     ("human", "{input}"),                          # ← User question
     MessagesPlaceholder("agent_scratchpad"),       # ← Agent's thinking
-])
+]).partial(available_documents="None yet")             # ← Overridden per request from the metadata index
     
     # Create the agent
     agent = create_tool_calling_agent(
@@ -82,13 +100,16 @@ Always use the most appropriate tool for the user's question, considering the co
         prompt=prompt,
     )
     
-    # Create the agent executor
-    agent_executor = AgentExecutor.from_agent_and_tools(
+    # Create the agent executor (tool calls of one step run concurrently)
+    agent_executor = ParallelAgentExecutor.from_agent_and_tools(
         agent=agent,
         tools=tools,
         verbose=AGENT_CONFIG["verbose"],
         handle_parsing_errors=AGENT_CONFIG["handle_parsing_errors"],
         max_iterations=AGENT_CONFIG["max_iterations"],
+        parallel_tool_calls=AGENT_CONFIG["parallel_tool_calls"],
+        tool_timeout=AGENT_CONFIG["tool_timeout_seconds"],
+        tool_timeouts=AGENT_CONFIG["tool_timeouts"],
     )
     
     return agent_executor
\ No newline at end of file
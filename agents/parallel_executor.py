@@ -0,0 +1,101 @@
+"""
+Agent executor that runs the tool calls of one agent step concurrently
+"""
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Dict, Optional
+
+from langchain.agents import AgentExecutor
+from langchain_core.agents import AgentAction, AgentStep
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from config.settings import AGENT_CONFIG
+from tools.script_context import script_run_ctx
+
+
+_pool: Optional[ThreadPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def get_tool_pool() -> ThreadPoolExecutor:
+    """Return the process-wide pool tool calls run on (bounded by AGENT_CONFIG["max_parallel_tools"])"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(
+                max_workers=max(1, AGENT_CONFIG["max_parallel_tools"]),
+                thread_name_prefix="agent-tool",
+            )
+        return _pool
+
+
+class ParallelAgentExecutor(AgentExecutor):
+    """
+    AgentExecutor whose tool calls from one step run at the same time.
+
+    When the model asks for several tools in one turn (weather in three
+    cities plus a currency conversion), the turn takes about as long as the
+    slowest call instead of the sum of all of them. Observations are returned
+    in call order. A tool that raises or exceeds its timeout becomes an error
+    observation for the model, the other calls of the step are unaffected.
+    """
+
+    parallel_tool_calls: bool = True
+    tool_timeout: Optional[float] = 30.0  # Seconds per call, None = wait forever
+    tool_timeouts: Dict[str, float] = {}  # Per-tool overrides of tool_timeout
+
+    def _perform_agent_action(self, name_to_tool_map, color_mapping, agent_action, run_manager=None):
+        """Start the tool call on the pool; _iter_next_step collects the result"""
+        if not self.parallel_tool_calls:
+            return super()._perform_agent_action(name_to_tool_map, color_mapping, agent_action, run_manager)
+
+        perform = super()._perform_agent_action
+        # Tools read st.session_state, which needs the calling script run's context
+        ctx = get_script_run_ctx()
+
+        def run():
+            with script_run_ctx(ctx):
+                return perform(name_to_tool_map, color_mapping, agent_action, run_manager)
+
+        return get_tool_pool().submit(run)
+
+    def _iter_next_step(self, name_to_tool_map, color_mapping, inputs, intermediate_steps, run_manager=None):
+        # The base step yields every action before performing any, so all calls are
+        # submitted before the first result is awaited
+        actions, pending = [], []
+        for item in super()._iter_next_step(name_to_tool_map, color_mapping, inputs, intermediate_steps, run_manager):
+            if isinstance(item, Future):
+                pending.append(item)
+                continue
+            if isinstance(item, AgentAction):
+                actions.append(item)
+            yield item
+
+        started = time.monotonic()
+        for action, future in zip(actions, pending):
+            yield self._collect(action, future, started)
+
+    def _collect(self, action: AgentAction, future: Future, started: float) -> AgentStep:
+        """
+        Wait for one tool call, turning failures into observations
+
+        Args:
+            action: The tool call
+            future: Its pending result
+            started: When the step's calls were submitted (monotonic clock)
+
+        Returns:
+            The AgentStep of the call
+        """
+        timeout = self.tool_timeouts.get(action.tool, self.tool_timeout)
+        remaining = None if timeout is None else max(0.0, started + timeout - time.monotonic())
+        try:
+            return future.result(timeout=remaining)
+        except FutureTimeout:
+            # The thread cannot be interrupted; its late result is discarded
+            future.cancel()
+            observation = f"{action.tool} did not respond within {timeout:g} seconds"
+        except Exception as e:
+            observation = f"{action.tool} failed: {e}"
+        return AgentStep(action=action, observation=observation)
@@ -12,6 +12,7 @@ from agents.agent_setup import setup_agent
 from ui.sidebar import render_sidebar
 from ui.chat import render_chat_interface
 from utils.helpers import generate_session_title
+from rag.index_store import has_saved_index
 
 # Load environment variables
 load_dotenv()
@@ -55,6 +56,10 @@ def _auto_load_last_session():
             messages = firestore_manager.load_messages(last_session)
             if messages:
                 st.session_state.messages = messages
+
+                # Its saved document index is rehydrated on the first document question
+                if has_saved_index(last_session):
+                    st.session_state.pending_index_restore = last_session
                 
                 # Generate session name from first message
                 first_user_msg = next((m for m in messages if m["role"] == "user"), None)
@@ -78,6 +83,13 @@ def initialize_session_state():
         st.session_state.messages = []
     if "rag_chain" not in st.session_state:
         st.session_state.rag_chain = None
+    if "document_index" not in st.session_state:
+        st.session_state.document_index = None
+    if "rag_namespace" not in st.session_state:
+        # Namespaces this browser session's vector collection
+        st.session_state.rag_namespace = uuid.uuid4().hex
+    if "pending_index_restore" not in st.session_state:
+        st.session_state.pending_index_restore = None
     if "uploaded_files_names" not in st.session_state:
         st.session_state.uploaded_files_names = []
     if "pending_question" not in st.session_state:
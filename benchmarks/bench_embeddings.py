@@ -0,0 +1,73 @@
+"""
+Benchmark: embedding throughput of each available provider
+
+Usage:
+    python -m benchmarks.bench_embeddings [--chunks 2000] [--batch 256] [--repeat 3] [--openai]
+
+Embeds the same synthetic chunks with every installed local provider (and
+with OpenAI when --openai is given, which costs API calls) and reports
+chunks/second and vector size. Also shows a same-topic vs different-topic
+cosine similarity as a quick sanity check of each vector space.
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+
+from rag.embedding_providers import list_providers
+
+
+_TOPICS = {
+    "career": "engineer python project team led built designed data pipeline production senior developer".split(),
+    "contract": "agreement party termination notice payment invoice supplier buyer clause liability term".split(),
+    "weather": "rain forecast temperature wind humidity storm sunny cloudy degrees celsius week".split(),
+}
+
+
+def _chunks(n: int, seed: int = 0):
+    rng = random.Random(seed)
+    topics = list(_TOPICS)
+    chunks = []
+    for i in range(n):
+        words = _TOPICS[topics[i % len(topics)]]
+        sentences = [" ".join(rng.choice(words) for _ in range(rng.randint(8, 16))).capitalize() + "." for _ in range(8)]
+        chunks.append(" ".join(sentences))
+    return chunks
+
+
+def _cosine(a, b):
+    a, b = np.asarray(a), np.asarray(b)
+    return float(a @ b / (np.linalg.norm(a) * np.linalg.norm(b) or 1.0))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunks", type=int, default=2000)
+    parser.add_argument("--batch", type=int, default=256, help="Chunks per embed_documents call")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--openai", action="store_true", help="Include the OpenAI provider (network, billed)")
+    args = parser.parse_args()
+
+    chunks = _chunks(args.chunks)
+    print(f"{'provider':<28}{'chunks/s':>10}{'dims':>7}{'same':>8}{'diff':>8}")
+    for provider in list_providers():
+        if provider.remote and not args.openai:
+            continue
+        if not provider.available():
+            print(f"{provider.name:<28}(not installed)")
+            continue
+        embeddings = provider.create()
+
+        best = float("inf")
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            vectors = []
+            for start in range(0, len(chunks), args.batch):
+                vectors.extend(embeddings.embed_documents(chunks[start:start + args.batch]))
+            best = min(best, time.perf_counter() - started)
+
+        # Chunks cycle through the topics, so i and i + 3 share a topic and i + 1 does not
+        same = np.mean([_cosine(vectors[i], vectors[i + 3]) for i in range(0, 300, 3)])
+        diff = np.mean([_cosine(vectors[i], vectors[i + 1]) for i in range(0, 300, 3)])
+        print(f"{provider.provider_id:<28}{len(chunks) / best:>10.0f}{len(vectors[0]):>7}{same:>8.2f}{diff:>8.2f}")
@@ -0,0 +1,148 @@
+"""
+Benchmark: text-extraction throughput of every installed loader backend
+
+Usage:
+    python -m benchmarks.bench_loaders [--corpus DIR] [--pages 40] [--files 5] [--repeat 3]
+
+Reports pages/second and MB/second per backend and file type. With --corpus,
+every .pdf/.docx/.txt file in DIR is used; otherwise a synthetic fixture corpus
+(multi-page PDFs, DOCX files and text files in several encodings) is generated
+in a temporary directory.
+"""
+import argparse
+import io
+import os
+import random
+import tempfile
+import time
+import zipfile
+from collections import defaultdict
+
+from rag.loaders import list_backends
+
+
+_WORDS = (
+    "experience engineer python data model system project team led built designed improved "
+    "the of and to in a for with on by from performance retrieval document analysis report"
+).split()
+
+
+def _sentence(rng):
+    return " ".join(rng.choice(_WORDS) for _ in range(rng.randint(8, 16))).capitalize() + "."
+
+
+def _write_pdf(path, pages, rng):
+    """Write a minimal multi-page PDF with Helvetica text lines"""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for _ in range(pages):
+        lines = " ".join(f"({_sentence(rng)}) '" for _ in range(40))
+        stream = f"BT /F1 10 Tf 14 TL 50 790 Td {lines} ET".encode("latin-1")
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n".encode("latin-1") + stream + b"\nendstream")
+        content_ref = len(objects)
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_ref} 0 R >>"
+        )
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {pages} >>"
+
+    out, offsets = io.BytesIO(), []
+    out.write(b"%PDF-1.4\n")
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(f"{number} 0 obj\n".encode("latin-1"))
+        out.write(body if isinstance(body, bytes) else body.encode("latin-1"))
+        out.write(b"\nendobj\n")
+    xref = out.tell()
+    out.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1"))
+    for offset in offsets:
+        out.write(f"{offset:010d} 00000 n \n".encode("latin-1"))
+    out.write(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1"))
+    with open(path, "wb") as f:
+        f.write(out.getvalue())
+
+
+def _write_docx(path, paragraphs, rng):
+    """Write a minimal DOCX package with body paragraphs and one table"""
+    ns = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+    body = "".join(f"<w:p><w:r><w:t>{_sentence(rng)} {_sentence(rng)}</w:t></w:r></w:p>" for _ in range(paragraphs))
+    table = "<w:tbl>" + "".join(
+        f"<w:tr><w:tc><w:p><w:r><w:t>{_sentence(rng)}</w:t></w:r></w:p></w:tc></w:tr>" for _ in range(5)
+    ) + "</w:tbl>"
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/word/document.xml" ContentType='
+            '"application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/></Types>'
+        ))
+        archive.writestr("_rels/.rels", (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/'
+            'relationships/officeDocument" Target="word/document.xml"/></Relationships>'
+        ))
+        archive.writestr("word/document.xml", f'<?xml version="1.0" encoding="UTF-8"?><w:document {ns}>'
+                                              f"<w:body>{body}{table}</w:body></w:document>")
+
+
+def build_fixtures(directory, n_files, pages, seed=0):
+    """Generate the synthetic fixture corpus"""
+    rng = random.Random(seed)
+    encodings = ["utf-8", "utf-8-sig", "utf-16", "cp1252"]
+    for i in range(n_files):
+        _write_pdf(os.path.join(directory, f"report_{i}.pdf"), pages, rng)
+        _write_docx(os.path.join(directory, f"resume_{i}.docx"), pages * 10, rng)
+        text = "\n\n".join(_sentence(rng) + " Café résumé naïve." for _ in range(pages * 20))
+        with open(os.path.join(directory, f"notes_{i}.txt"), "wb") as f:
+            f.write(text.encode(encodings[i % len(encodings)]))
+
+
+def run(directory, repeat):
+    corpus = defaultdict(list)
+    for name in sorted(os.listdir(directory)):
+        file_type = name.rsplit(".", 1)[-1].lower()
+        with open(os.path.join(directory, name), "rb") as f:
+            corpus[file_type].append((name, f.read()))
+
+    print(f"{'type':<6}{'backend':<14}{'speed':<9}{'pages':>7}{'pages/s':>10}{'MB/s':>8}{'chars':>10}")
+    for file_type, files in sorted(corpus.items()):
+        size_mb = sum(len(data) for _, data in files) / 1e6
+        for backend in list_backends(file_type):
+            if not backend.available():
+                print(f"{file_type:<6}{backend.name:<14}(not installed)")
+                continue
+            best, pages, chars = float("inf"), 0, 0
+            try:
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    documents = [
+                        document for name, data in files for document in backend.iter_pages(io.BytesIO(data), name)
+                    ]
+                    best = min(best, time.perf_counter() - started)
+            except Exception as e:
+                print(f"{file_type:<6}{backend.name:<14}failed: {e}")
+                continue
+            pages = len(documents)
+            chars = sum(len(document.page_content) for document in documents)
+            print(f"{file_type:<6}{backend.name:<14}{backend.profile.get('speed', ''):<9}{pages:>7}"
+                  f"{pages / best:>10.0f}{size_mb / best:>8.1f}{chars:>10}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", help="Directory of .pdf/.docx/.txt fixtures (generated when omitted)")
+    parser.add_argument("--pages", type=int, default=40, help="Pages per generated PDF")
+    parser.add_argument("--files", type=int, default=5, help="Generated files per type")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.corpus:
+        run(args.corpus, args.repeat)
+    else:
+        with tempfile.TemporaryDirectory() as fixtures:
+            build_fixtures(fixtures, args.files, args.pages)
+            run(fixtures, args.repeat)
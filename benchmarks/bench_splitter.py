@@ -0,0 +1,81 @@
+"""
+Benchmark: token-aware splitter vs RecursiveCharacterTextSplitter
+
+Usage:
+    python -m benchmarks.bench_splitter [--file path.txt] [--pages 200] [--repeat 3]
+
+Splits the same pages with both splitters and reports throughput (MB/s),
+chunk count, and mean/max tokens per chunk measured with the embedding
+tokenizer. Without --file, synthetic paragraphs are used.
+"""
+import argparse
+import random
+import time
+
+from langchain_core.documents import Document
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+from config.settings import RAG_CONFIG
+from rag.token_splitter import TokenAwareSplitter
+from rag.tokenizer import count_tokens
+
+
+_WORDS = (
+    "the of and to in a is that for it as was with be by on not he this are or his from at which but have "
+    "an had they you were their one all we can her has there been if more when will would who so no "
+    "retrieval embedding vector index document python experience engineer project data model system"
+).split()
+
+
+def _synthetic_pages(n_pages: int, seed: int = 0):
+    rng = random.Random(seed)
+    pages = []
+    for _ in range(n_pages):
+        paragraphs = []
+        for _ in range(rng.randint(3, 8)):
+            sentences = [
+                " ".join(rng.choice(_WORDS) for _ in range(rng.randint(6, 30))).capitalize() + "."
+                for _ in range(rng.randint(2, 9))
+            ]
+            paragraphs.append(" ".join(sentences))
+        pages.append("\n\n".join(paragraphs))
+    return pages
+
+
+def _bench(name, splitter, pages, repeat):
+    documents = [Document(page_content=page, metadata={"page": i}) for i, page in enumerate(pages)]
+    size_mb = sum(len(page.encode("utf-8")) for page in pages) / 1e6
+
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        chunks = splitter.split_documents(documents)
+        best = min(best, time.perf_counter() - started)
+
+    tokens = [count_tokens(chunk.page_content) for chunk in chunks]
+    print(f"{name:<12}{size_mb / best:>10.2f}{len(chunks):>9}{sum(tokens) / len(tokens):>12.1f}{max(tokens):>12}")
+
+
+def run(pages, repeat):
+    print(f"{'splitter':<12}{'MB/s':>10}{'chunks':>9}{'mean tok':>12}{'max tok':>12}")
+    _bench("recursive", RecursiveCharacterTextSplitter(
+        chunk_size=RAG_CONFIG["chunk_size"], chunk_overlap=RAG_CONFIG["chunk_overlap"], add_start_index=True
+    ), pages, repeat)
+    _bench("token", TokenAwareSplitter(
+        chunk_tokens=RAG_CONFIG["chunk_tokens"], chunk_overlap_tokens=RAG_CONFIG["chunk_overlap_tokens"]
+    ), pages, repeat)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--file", help="Plain-text file to split (pages separated by form feeds)")
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.file:
+        with open(args.file, encoding="utf-8") as f:
+            pages = f.read().split("\f")
+    else:
+        pages = _synthetic_pages(args.pages)
+    run(pages, args.repeat)
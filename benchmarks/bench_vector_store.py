@@ -0,0 +1,78 @@
+"""
+Benchmark: NumPy vector store backends vs Chroma on session-sized corpora
+
+Usage:
+    python -m benchmarks.bench_vector_store [--sizes 1000 10000 50000] [--dim 1536] [--queries 200]
+
+Reports build time, mean query latency, recall@k against exact search and vector memory
+for each backend. Vectors are synthetic topic clusters, so no API key is needed.
+"""
+import argparse
+import time
+
+import numpy as np
+
+from rag.numpy_store import NumpyVectorStore
+from rag.vector_store import ChromaVectorStore
+
+
+def _build(store, ids, vectors, batch_size=1000):
+    started = time.perf_counter()
+    for start in range(0, len(ids), batch_size):
+        end = start + batch_size
+        store.add(ids[start:end], vectors[start:end], [""] * len(ids[start:end]), [{"chunk_id": i} for i in ids[start:end]])
+    return time.perf_counter() - started
+
+
+def _query(store, queries, k):
+    started = time.perf_counter()
+    results = [[chunk_id for chunk_id, _, _ in store.search(query, k)] for query in queries]
+    return (time.perf_counter() - started) / len(queries), results
+
+
+def run(sizes, dim, n_queries, k):
+    rng = np.random.default_rng(42)
+    print(f"{'backend':<16}{'n':>8}{'build s':>10}{'query ms':>10}{'recall@k':>10}{'vector MB':>11}")
+
+    for n in sizes:
+        # Embeddings cluster by topic; mimic that with a mixture of topic centers
+        topics = rng.standard_normal((max(8, n // 200), dim)).astype(np.float32)
+        vectors = topics[rng.integers(0, len(topics), n)] + 0.6 * rng.standard_normal((n, dim)).astype(np.float32)
+        # Queries near stored vectors, like real questions near relevant chunks
+        picks = rng.integers(0, n, n_queries)
+        queries = vectors[picks] + 0.3 * rng.standard_normal((n_queries, dim)).astype(np.float32)
+        ids = [f"chunk-{i}" for i in range(n)]
+
+        exact = None
+        backends = [
+            ("numpy-f32", lambda: NumpyVectorStore("float32")),
+            ("numpy-f16", lambda: NumpyVectorStore("float16")),
+            ("numpy-int8", lambda: NumpyVectorStore("int8")),
+            ("numpy-ivf", lambda: NumpyVectorStore("float32", ivf=True, ivf_min_vectors=min(4096, n), nprobe=8)),
+            ("chroma", lambda: ChromaVectorStore(f"bench_{n}")),
+        ]
+        for name, factory in backends:
+            try:
+                store = factory()
+            except ImportError:
+                print(f"{name:<16}{n:>8}  (not installed)")
+                continue
+
+            build_seconds = _build(store, ids, vectors)
+            query_seconds, results = _query(store, queries, k)
+            if exact is None:
+                exact = results
+            recall = np.mean([len(set(r) & set(e)) / k for r, e in zip(results, exact)])
+            print(f"{name:<16}{n:>8}{build_seconds:>10.3f}{query_seconds * 1000:>10.3f}{recall:>10.3f}"
+                  f"{store.nbytes / 1e6:>11.1f}")
+            store.drop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args()
+    run(args.sizes, args.dim, args.queries, args.k)
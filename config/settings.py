@@ -19,16 +19,121 @@ AGENT_CONFIG = {
     "verbose": True,
     "handle_parsing_errors": True,
     "max_iterations": 5,
+    "stream_responses": True,  # Stream answer tokens and tool status into the chat as they happen
+    # Tool calls requested in the same agent step run concurrently
+    "parallel_tool_calls": True,
+    "max_parallel_tools": 8,  # Tool calls running at once (across sessions)
+    "tool_timeout_seconds": 30,  # Per call; a slower tool becomes an error observation
+    "tool_timeouts": {"query_documents": 120},  # Per-tool overrides
+}
+
+# Tool Configuration
+TOOL_CONFIG = {
+    # Shared result cache: identical calls (after normalizing arguments) within the TTL,
+    # from any session, are answered without an upstream request
+    "cache_enabled": True,
+    "cache_max_entries": 2048,  # Least recently used results are evicted beyond this
+    "cache_ttl_seconds": {  # Per tool; None = until evicted
+        "weather": 600,
+        "fx_rates": 3600,
+        "stock": 60,
+        "web_search": 900,
+        "calculator": None,  # Results never change
+    },
+    "cache_default_ttl_seconds": 300,
+    # Currency conversion: one rate table (refreshed per the fx_rates TTL); cross rates are derived from it
+    "fx_base_currency": "USD",
+    # Stock quotes: "serpapi" (Google finance results) or "static" (fixed quotes, for tests)
+    "quote_fetcher": "serpapi",
+    "quote_workers": 8,  # Tickers fetched at once
+    # Calculator limits: every expression has a hard ceiling on CPU and memory
+    "calc_max_length": 500,  # Characters per expression
+    "calc_max_nodes": 200,  # Syntax-tree elements (numbers, operators, calls) per expression
+    "calc_max_exponent": 1000,  # Largest power exponent / factorial argument
+    "calc_max_result_digits": 1000,  # Largest magnitude of any intermediate result
+    "calc_decimal_precision": 50,  # Significant digits in decimal mode
+    "calc_max_batch": 50,  # Expressions per calculator_batch call
+    # Shared keep-alive HTTP session for the tools' upstream APIs
+    "http_connect_timeout": 3.05,  # Seconds to establish a connection
+    "http_read_timeout": 15,  # Seconds to wait for response data
+    "http_max_retries": 3,  # On connection errors, 429 and 5xx (Retry-After is honored)
+    "http_backoff_seconds": 0.5,  # Exponential backoff base, with full jitter
+    "http_max_retry_after_seconds": 10,  # Longest Retry-After wait honored before retrying
+    "http_pool_per_host": 10,  # Keep-alive connections per host (more callers wait)
+    "http_pool_hosts": 16,  # Hosts with a cached connection pool
 }
 
 # RAG Configuration
 RAG_CONFIG = {
-    "chunk_size": 1000,
-    "chunk_overlap": 200,
-    "embedding_model": "text-embedding-3-small",
-    "retriever_k": 3,
+    "splitter": "token",  # "token" (token-aware, fast) or "recursive" (character-based)
+    "chunk_tokens": 256,  # token splitter: max tokens per chunk
+    "chunk_overlap_tokens": 48,  # token splitter: tokens shared by consecutive chunks
+    "chunk_size": 1000,  # recursive splitter: characters per chunk
+    "chunk_overlap": 200,  # recursive splitter: characters shared by consecutive chunks
+    "embedding_model": "text-embedding-3-small",  # openai provider
+    # Embedding provider: "openai" (API), "hashing" (local feature hashing, no model download),
+    # "onnx" (local sentence model in onnx_model_dir; needs onnxruntime + tokenizers)
+    # or "local" (onnx when present, else hashing). Each index keeps the provider it was built with.
+    "embedding_provider": "openai",
+    "hashing_dimensions": 1024,
+    "onnx_model_dir": ".cache/models/all-MiniLM-L6-v2",  # model.onnx + tokenizer.json
+    "retriever_k": 6,  # Safe to raise: the packed context is capped by context_token_budget
+    "context_token_budget": 3000,  # Max context tokens after merging overlapping chunks
+    "context_min_fragment_tokens": 64,  # Smallest truncated passage worth including
+    # "retrieval": query_documents returns cited passages and the agent answers itself;
+    # "chain": the nested history-aware RAG chain answers (two extra LLM calls)
+    "query_mode": "retrieval",
+    "retrieval_k": 5,  # Passages returned to the agent in retrieval mode
+    # Semantic answer cache for repeated document questions
+    "answer_cache_enabled": True,
+    "answer_cache_threshold": 0.92,  # Minimum cosine similarity between questions
+    "answer_cache_ttl_seconds": 3600,
+    "answer_cache_max_entries": 512,
     "similarity_score_threshold": 0.1,
-    "collection_name": "uploaded_docs"
+    "hybrid_retrieval": True,  # Fuse BM25 keyword ranking with vector ranking (reciprocal-rank fusion)
+    "hybrid_fetch_k": 10,  # Candidates taken from each ranking before fusion
+    "collection_name": "uploaded_docs",  # Prefix; each session gets "<prefix>_<session>"
+    # Near-duplicate chunks (boilerplate, file versions) are embedded once
+    "dedup_enabled": True,
+    "dedup_threshold": 0.9,  # Minimum estimated Jaccard similarity of word 3-gram shingles
+    "dedup_num_perm": 128,  # MinHash permutations per chunk
+    "dedup_bands": 32,  # LSH bands (num_perm / bands rows each)
+    # Vector store backend: "numpy" (contiguous in-process matrix) or "chroma"
+    "vector_backend": "numpy",
+    "vector_dtype": "float32",  # numpy backend storage: "float32", "float16" or "int8"
+    "ivf_enabled": False,  # numpy backend: IVF coarse quantizer for larger corpora
+    "ivf_min_vectors": 4096,  # Train the quantizer once this many chunks are indexed
+    "ivf_nprobe": 8,  # Inverted lists scanned per query
+    # Per-session collection garbage collection
+    "collection_idle_seconds": 1800,  # Free a session's collection after this long without use
+    "collection_memory_cap_mb": 512,  # Evict least recently used collections beyond this total
+    # Saved indexes (restored with cloud chat sessions, no re-embedding)
+    "persist_index": True,
+    "index_store_dir": ".cache/indexes",
+    # Persistent embedding cache (content-addressed by chunk text + model)
+    "embedding_cache_enabled": True,
+    "embedding_cache_path": ".cache/embeddings.sqlite3",
+    "embedding_cache_max_mb": 256,  # Least recently used vectors are evicted beyond this size
+    # Text extraction backends: "fast" prefers PyMuPDF/pdfium and a direct DOCX XML reader,
+    # "accurate" prefers pypdf and python-docx; uninstalled backends are skipped
+    "loader_profile": "fast",
+    "loader_backends": {},  # Per-type overrides, e.g. {"pdf": "pypdf"}
+    # Document loading: 1 streams pages straight from the upload buffer in-process (memory stays flat
+    # as files grow); > 1 parses on a process pool, which is faster for many CPU-heavy files but holds
+    # whole files and page lists for up to 2 * loader_workers tasks and stages large PDFs in temp files
+    "loader_workers": 1,
+    "pdf_pages_per_task": 50,  # With a process pool: PDFs longer than this are parsed in page ranges across workers
+    # Background ingestion jobs (the UI stays usable while files are indexed)
+    "ingest_workers": 2,  # Jobs indexing at once across all sessions
+    "ingest_job_ttl_seconds": 3600,  # Finished jobs are kept this long for status lookups
+    "ingest_poll_seconds": 1.0,  # Sidebar progress refresh interval
+    # Streaming ingestion
+    "ingest_queue_size": 8,  # Items buffered between load/split stages (bounds peak memory)
+    "embed_batch_size": 256,  # Chunks embedded and upserted per pipeline batch
+    # Embedding requests
+    "embedding_batch_tokens": 8000,  # Token budget per embedding request
+    "embedding_concurrency": 4,  # Max requests in flight across all callers (halved on every 429, regrown on success)
+    "embedding_max_retries": 6,  # Rate-limit retries per request
 }
 
 # Voice Configuration
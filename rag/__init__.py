@@ -1,5 +1,90 @@
 """RAG package - Retrieval Augmented Generation utilities"""
-from .document_loader import load_document
-from .rag_chain import process_documents
+from .document_loader import load_document, iter_document_pages
+from .rag_chain import create_rag_chain
+from .document_index import DocumentIndex
+from .collection_manager import CollectionManager, get_collection_manager
+from .vector_store import VectorStore, ChromaVectorStore, create_vector_store
+from .numpy_store import NumpyVectorStore
+from .bm25_index import BM25Index
+from .hybrid_retriever import HybridRetriever
+from .passages import retrieve_passages, format_passages
+from .context_packer import pack_context, merge_overlapping
+from .answer_cache import SemanticAnswerCache, get_answer_cache
+from .index_store import save_index, load_index, delete_saved_index, has_saved_index, restore_pending_index
+from .loaders import LoaderBackend, get_backend, list_backends, register_backend, decode_text
+from .parallel_loader import iter_loaded_pages
+from .ingest_pipeline import stream_chunk_batches
+from .token_splitter import TokenAwareSplitter, create_text_splitter
+from .dedup import MinHashLSH
+from .metadata_index import MetadataIndex
+from .ingest_jobs import IngestJob, IngestJobManager, get_ingest_manager
+from .embedding_cache import (
+    EmbeddingCache,
+    CachedEmbeddings,
+    get_embedding_cache,
+    get_embedding_executor,
+    get_embeddings,
+    get_local_embeddings
+)
+from .embedding_executor import EmbeddingExecutor
+from .embedding_providers import (
+    EmbeddingProvider,
+    HashingEmbeddings,
+    OnnxEmbeddings,
+    get_provider,
+    list_providers,
+    register_provider
+)
 
-__all__ = ['load_document', 'process_documents']
\ No newline at end of file
+__all__ = [
+    'load_document',
+    'iter_document_pages',
+    'create_rag_chain',
+    'DocumentIndex',
+    'CollectionManager',
+    'get_collection_manager',
+    'VectorStore',
+    'ChromaVectorStore',
+    'NumpyVectorStore',
+    'create_vector_store',
+    'BM25Index',
+    'HybridRetriever',
+    'retrieve_passages',
+    'format_passages',
+    'pack_context',
+    'merge_overlapping',
+    'SemanticAnswerCache',
+    'get_answer_cache',
+    'save_index',
+    'load_index',
+    'delete_saved_index',
+    'has_saved_index',
+    'restore_pending_index',
+    'LoaderBackend',
+    'get_backend',
+    'list_backends',
+    'register_backend',
+    'decode_text',
+    'iter_loaded_pages',
+    'stream_chunk_batches',
+    'TokenAwareSplitter',
+    'create_text_splitter',
+    'MinHashLSH',
+    'MetadataIndex',
+    'IngestJob',
+    'IngestJobManager',
+    'get_ingest_manager',
+    'EmbeddingCache',
+    'CachedEmbeddings',
+    'get_embedding_cache',
+    'get_embedding_executor',
+    'get_embeddings',
+    'get_local_embeddings',
+    'EmbeddingExecutor',
+    'EmbeddingProvider',
+    'HashingEmbeddings',
+    'OnnxEmbeddings',
+    'get_provider',
+    'list_providers',
+    'register_provider'
+]
\ No newline at end of file
@@ -0,0 +1,162 @@
+"""
+Semantic cache of document answers keyed by (document set, query embedding)
+"""
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import numpy as np
+import streamlit as st
+
+from config.settings import RAG_CONFIG
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase, strip punctuation and collapse whitespace so trivial rewrites match exactly"""
+    query = re.sub(r"['\u2019]", "", query.lower())
+    return " ".join(re.sub(r"[^\w\s]", " ", query).split())
+
+
+class SemanticAnswerCache:
+    """
+    In-memory cache of answers to document questions.
+
+    An entry belongs to a document set (DocumentIndex.fingerprint) and a
+    history context key, so answers never leak across different documents or
+    conversational contexts, and any change to the indexed files invalidates
+    every answer computed before it. Within a (document set, context) bucket a
+    question hits when its normalized text matches exactly (no embedding
+    needed) or its embedding has cosine similarity >= threshold with a stored
+    question. Entries expire after ttl_seconds and the least recently used are
+    evicted beyond max_entries.
+    """
+
+    def __init__(self, threshold: float, ttl_seconds: float, max_entries: int):
+        """
+        Args:
+            threshold: Minimum cosine similarity between questions for a hit
+            ttl_seconds: Lifetime of an answer
+            max_entries: Maximum number of stored answers
+        """
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[int, Dict]" = OrderedDict()
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def _expire(self, now: float):
+        for entry_id, entry in list(self._entries.items()):
+            if now - entry["created"] > self.ttl_seconds:
+                del self._entries[entry_id]
+
+    def _bucket(self, fingerprint: str, context: str):
+        return [
+            (entry_id, entry) for entry_id, entry in self._entries.items()
+            if entry["fingerprint"] == fingerprint and entry["context"] == context
+        ]
+
+    def lookup_exact(self, fingerprint: str, context: str, query: str) -> Optional[str]:
+        """
+        Find an answer to the same question (after normalization) without embedding it
+
+        Args:
+            fingerprint: Document set the answer must belong to
+            context: History context key
+            query: Question text
+
+        Returns:
+            Cached answer or None
+        """
+        normalized = normalize_query(query)
+        with self._lock:
+            self._expire(time.monotonic())
+            for entry_id, entry in self._bucket(fingerprint, context):
+                if entry["normalized"] == normalized:
+                    self._entries.move_to_end(entry_id)
+                    self.hits += 1
+                    return entry["answer"]
+        return None
+
+    def lookup(self, fingerprint: str, context: str, query_vector) -> Optional[str]:
+        """
+        Find the answer to the most similar stored question
+
+        Args:
+            fingerprint: Document set the answer must belong to
+            context: History context key
+            query_vector: Embedding of the question
+
+        Returns:
+            Cached answer or None if no stored question is similar enough
+        """
+        vector = _unit(query_vector)
+        with self._lock:
+            self._expire(time.monotonic())
+            bucket = self._bucket(fingerprint, context)
+            if bucket:
+                scores = np.stack([entry["vector"] for _, entry in bucket]) @ vector
+                best = int(np.argmax(scores))
+                if scores[best] >= self.threshold:
+                    entry_id, entry = bucket[best]
+                    self._entries.move_to_end(entry_id)
+                    self.hits += 1
+                    return entry["answer"]
+            self.misses += 1
+        return None
+
+    def put(self, fingerprint: str, context: str, query: str, query_vector, answer: str):
+        """
+        Store an answer
+
+        Args:
+            fingerprint: Document set the answer was computed from
+            context: History context key
+            query: Question text
+            query_vector: Embedding of the question
+            answer: Answer to cache
+        """
+        with self._lock:
+            self._entries[self._next_id] = {
+                "fingerprint": fingerprint,
+                "context": context,
+                "normalized": normalize_query(query),
+                "vector": _unit(query_vector),
+                "answer": answer,
+                "created": time.monotonic(),
+            }
+            self._next_id += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, fingerprint: str = None):
+        """Drop the answers of one document set, or everything when fingerprint is None"""
+        with self._lock:
+            for entry_id, entry in list(self._entries.items()):
+                if fingerprint is None or entry["fingerprint"] == fingerprint:
+                    del self._entries[entry_id]
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and the number of stored answers"""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
+
+
+def _unit(vector) -> np.ndarray:
+    vector = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+@st.cache_resource
+def get_answer_cache() -> SemanticAnswerCache:
+    """Return the process-wide answer cache"""
+    return SemanticAnswerCache(
+        threshold=RAG_CONFIG["answer_cache_threshold"],
+        ttl_seconds=RAG_CONFIG["answer_cache_ttl_seconds"],
+        max_entries=RAG_CONFIG["answer_cache_max_entries"],
+    )
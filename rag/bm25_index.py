@@ -0,0 +1,134 @@
+"""
+In-memory inverted index with BM25 scoring for exact-term retrieval
+"""
+import math
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Set, Tuple
+
+from langchain_core.documents import Document
+
+
+# Keeps identifiers like "c++", "c#", "node.js", "gpt-4o" and tickers together as single terms
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9_+#.\-]*")
+
+STOP_WORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "did", "do", "does", "for", "from", "had", "has", "have",
+    "how", "i", "in", "is", "it", "its", "me", "my", "of", "on", "or", "that", "the", "their", "there", "this",
+    "to", "was", "were", "what", "when", "where", "which", "who", "why", "with", "you", "your",
+})
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase index terms, dropping stop words
+
+    Args:
+        text: Text to tokenize
+
+    Returns:
+        List of terms in order of appearance
+    """
+    terms = (term.rstrip(".-") for term in _TOKEN_RE.findall(text.lower()))
+    return [term for term in terms if term and term not in STOP_WORDS]
+
+
+class BM25Index:
+    """Inverted index (term -> {chunk id: term frequency}) scored with Okapi BM25"""
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        """
+        Args:
+            k1: Term-frequency saturation
+            b: Document length normalization
+        """
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._lengths: Dict[str, int] = {}
+        self._documents: Dict[str, Document] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def add(self, chunk_id: str, document: Document):
+        """
+        Index a chunk
+
+        Args:
+            chunk_id: Unique chunk id
+            document: Chunk to index
+        """
+        if chunk_id in self._lengths:
+            self.remove([chunk_id])
+
+        terms = tokenize(document.page_content)
+        for term, count in Counter(terms).items():
+            self._postings.setdefault(term, {})[chunk_id] = count
+        self._lengths[chunk_id] = len(terms)
+        self._documents[chunk_id] = document
+        self._total_length += len(terms)
+
+    def remove(self, chunk_ids: Iterable[str]):
+        """
+        Drop chunks from the index
+
+        Args:
+            chunk_ids: Ids of the chunks to drop
+        """
+        for chunk_id in chunk_ids:
+            document = self._documents.pop(chunk_id, None)
+            if document is None:
+                continue
+            self._total_length -= self._lengths.pop(chunk_id)
+            for term in set(tokenize(document.page_content)):
+                postings = self._postings.get(term)
+                if postings is not None:
+                    postings.pop(chunk_id, None)
+                    if not postings:
+                        del self._postings[term]
+
+    def clear(self):
+        """Remove every chunk"""
+        self._postings.clear()
+        self._lengths.clear()
+        self._documents.clear()
+        self._total_length = 0
+
+    def covers(self, query: str) -> bool:
+        """Check whether every term of the query occurs somewhere in the index"""
+        terms = tokenize(query)
+        return bool(terms) and all(term in self._postings for term in terms)
+
+    def search(self, query: str, k: int, candidate_ids: Set[str] = None) -> List[Tuple[str, Document, float]]:
+        """
+        Rank chunks for a query
+
+        Args:
+            query: Search text
+            k: Number of results
+            candidate_ids: Only score these chunks (collection statistics still cover every chunk)
+
+        Returns:
+            Up to k (chunk id, document, BM25 score) tuples, best first
+        """
+        if not self._lengths:
+            return []
+
+        doc_count = len(self._lengths)
+        avg_length = self._total_length / doc_count or 1.0
+        scores: Dict[str, float] = {}
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for chunk_id, tf in postings.items():
+                if candidate_ids is not None and chunk_id not in candidate_ids:
+                    continue
+                norm = self.k1 * (1 - self.b + self.b * self._lengths[chunk_id] / avg_length)
+                scores[chunk_id] = scores.get(chunk_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+
+        best = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+        return [(chunk_id, self._documents[chunk_id], score) for chunk_id, score in best]
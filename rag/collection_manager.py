@@ -0,0 +1,140 @@
+"""
+Per-session vector collections with idle and memory-based garbage collection
+"""
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import streamlit as st
+
+from config.settings import RAG_CONFIG
+from .document_index import DocumentIndex
+
+
+class CollectionManager:
+    """
+    Owns one DocumentIndex (and vector collection) per browser session.
+
+    Entries are kept in least-recently-used order. Collections idle for longer
+    than idle_seconds are dropped, and if the estimated size of the remaining
+    ones exceeds max_bytes the least recently used are dropped until it fits.
+    A session whose index was collected notices on its next rerun (get()
+    returns a different object) and releases its own references.
+    """
+
+    def __init__(self, idle_seconds: float, max_bytes: int):
+        """
+        Args:
+            idle_seconds: Time without access after which a collection is freed
+            max_bytes: Memory budget across all live collections
+        """
+        self.idle_seconds = idle_seconds
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def collection_name(namespace: str) -> str:
+        """
+        Build a backend-safe collection name for a session namespace
+
+        Args:
+            namespace: Per-session identifier
+
+        Returns:
+            Collection name of the form "<base>_<namespace>"
+        """
+        safe = re.sub(r"[^a-zA-Z0-9_-]", "", namespace)[:40]
+        return f"{RAG_CONFIG['collection_name']}_{safe}"
+
+    def get(self, namespace: str) -> Optional[DocumentIndex]:
+        """
+        Return a session's index and mark it as used
+
+        Args:
+            namespace: Per-session identifier
+
+        Returns:
+            The live DocumentIndex, or None if there is none (never created or collected)
+        """
+        with self._lock:
+            entry = self._entries.get(namespace)
+            if entry is None:
+                return None
+            entry["last_access"] = time.monotonic()
+            self._entries.move_to_end(namespace)
+            return entry["index"]
+
+    def get_or_create(self, namespace: str) -> DocumentIndex:
+        """
+        Return a session's index, creating an empty one if needed
+
+        Args:
+            namespace: Per-session identifier
+
+        Returns:
+            The session's DocumentIndex
+        """
+        index = self.get(namespace)
+        if index is None:
+            index = DocumentIndex(self.collection_name(namespace))
+            with self._lock:
+                self._entries[namespace] = {"index": index, "last_access": time.monotonic()}
+        self.collect()
+        return index
+
+    def release(self, namespace: str):
+        """
+        Free a session's collection immediately
+
+        Args:
+            namespace: Per-session identifier
+        """
+        with self._lock:
+            entry = self._entries.pop(namespace, None)
+        if entry is not None:
+            entry["index"].drop()
+
+    def collect(self) -> int:
+        """
+        Drop idle collections, then least recently used ones while over the memory cap
+
+        Returns:
+            Number of collections freed
+        """
+        victims = []
+        now = time.monotonic()
+        with self._lock:
+            for namespace, entry in list(self._entries.items()):
+                if now - entry["last_access"] > self.idle_seconds:
+                    victims.append(self._entries.pop(namespace))
+
+            total = sum(entry["index"].estimated_bytes for entry in self._entries.values())
+            # Never evict the most recently used collection, it belongs to the caller
+            while total > self.max_bytes and len(self._entries) > 1:
+                _, entry = self._entries.popitem(last=False)
+                total -= entry["index"].estimated_bytes
+                victims.append(entry)
+
+        for entry in victims:
+            entry["index"].drop()
+        return len(victims)
+
+    def stats(self) -> Dict[str, int]:
+        """Number of live collections and their estimated total size"""
+        with self._lock:
+            return {
+                "collections": len(self._entries),
+                "estimated_bytes": sum(entry["index"].estimated_bytes for entry in self._entries.values()),
+            }
+
+
+@st.cache_resource
+def get_collection_manager() -> CollectionManager:
+    """Return the process-wide collection manager"""
+    return CollectionManager(
+        idle_seconds=RAG_CONFIG["collection_idle_seconds"],
+        max_bytes=int(RAG_CONFIG["collection_memory_cap_mb"] * 1024 * 1024),
+    )
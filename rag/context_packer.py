@@ -0,0 +1,132 @@
+"""
+Context assembly between the retriever and the answer prompt: merge overlapping
+chunks and pack the best content into a token budget
+"""
+import re
+from typing import Dict, List, Tuple
+
+from langchain_core.documents import Document
+
+from config.settings import LLM_CONFIG, RAG_CONFIG
+from .tokenizer import count_tokens, truncate_to_tokens
+
+
+# Chunks separated by at most this many characters (stripped whitespace) count as adjacent
+_ADJACENT_GAP = 2
+
+
+def dedupe_passages(documents: List[Document]) -> List[Document]:
+    """
+    Drop repeated chunks while keeping rank order
+
+    The same text can come back twice, for example when identical files were
+    uploaded under different names. Duplicates are detected by chunk id and by
+    whitespace-normalized text.
+    """
+    seen_ids, seen_texts, unique = set(), set(), []
+    for document in documents:
+        chunk_id = document.metadata.get("chunk_id")
+        text = re.sub(r"\s+", " ", document.page_content).strip().lower()
+        if not text or chunk_id in seen_ids or text in seen_texts:
+            continue
+        if chunk_id is not None:
+            seen_ids.add(chunk_id)
+        seen_texts.add(text)
+        unique.append(document)
+    return unique
+
+
+def _span_key(document: Document) -> Tuple:
+    """Chunks can only be merged within the same page of the same file"""
+    metadata = document.metadata
+    return metadata.get("content_hash") or metadata.get("source"), metadata.get("page")
+
+
+def merge_overlapping(documents: List[Document]) -> List[Tuple[int, Document]]:
+    """
+    Merge chunks of the same page whose character spans overlap or touch
+
+    Chunks carry their offset into the page as metadata["start_index"]; those
+    without it are kept as they are.
+
+    Args:
+        documents: Retrieved chunks, best first
+
+    Returns:
+        (best rank of the merged chunks, document) pairs; merged text follows page order
+    """
+    groups: Dict[Tuple, List[Tuple[int, Document]]] = {}
+    merged: List[Tuple[int, Document]] = []
+    for rank, document in enumerate(documents):
+        if document.metadata.get("start_index") is None:
+            merged.append((rank, document))
+        else:
+            groups.setdefault(_span_key(document), []).append((rank, document))
+
+    for members in groups.values():
+        members.sort(key=lambda item: item[1].metadata["start_index"])
+        best_rank, first = members[0]
+        text, start = first.page_content, first.metadata["start_index"]
+        end, count = start + len(text), 1
+
+        for rank, document in members[1:]:
+            next_start = document.metadata["start_index"]
+            next_end = next_start + len(document.page_content)
+            if next_start > end + _ADJACENT_GAP:
+                merged.append((best_rank, _merged_document(first, text, count)))
+                best_rank, first, text, end, count = rank, document, document.page_content, next_end, 1
+                continue
+            if next_end > end:
+                # Append only the part of the chunk not already covered
+                tail = document.page_content[max(0, end - next_start):]
+                text += (" " if next_start > end else "") + tail
+                end = next_end
+            best_rank = min(best_rank, rank)
+            count += 1
+        merged.append((best_rank, _merged_document(first, text, count)))
+
+    merged.sort(key=lambda item: item[0])
+    return merged
+
+
+def _merged_document(first: Document, text: str, count: int) -> Document:
+    metadata = dict(first.metadata)
+    if count > 1:
+        metadata["merged_chunks"] = count
+    return Document(page_content=text, metadata=metadata)
+
+
+def pack_context(documents: List[Document], token_budget: int = None, model: str = None) -> List[Document]:
+    """
+    Build the context for the answer prompt
+
+    Duplicate chunks are dropped, overlapping or adjacent chunks of the same
+    page are merged, and the merged passages are added in retrieval order until
+    the token budget is spent. A passage that does not fit is cut to the
+    remaining budget when that leaves a useful fragment.
+
+    Args:
+        documents: Retrieved chunks, best first
+        token_budget: Context budget in tokens (defaults to RAG_CONFIG["context_token_budget"])
+        model: Model whose tokenizer measures the budget (defaults to the chat model)
+
+    Returns:
+        Documents to put in the prompt, best first
+    """
+    token_budget = token_budget or RAG_CONFIG["context_token_budget"]
+    model = model or LLM_CONFIG["model"]
+    min_fragment = RAG_CONFIG.get("context_min_fragment_tokens", 64)
+
+    packed, remaining = [], token_budget
+    for _, document in merge_overlapping(dedupe_passages(documents)):
+        tokens = count_tokens(document.page_content, model)
+        if tokens <= remaining:
+            packed.append(document)
+            remaining -= tokens
+        elif remaining >= min_fragment:
+            text = truncate_to_tokens(document.page_content, remaining, model)
+            packed.append(Document(page_content=text, metadata={**document.metadata, "truncated": True}))
+            remaining = 0
+        if remaining < min_fragment:
+            break
+    return packed
@@ -0,0 +1,123 @@
+"""
+Near-duplicate chunk detection with MinHash signatures and LSH banding
+"""
+import re
+import zlib
+from typing import Dict, List, Optional, Set
+
+import numpy as np
+
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_WORD = re.compile(r"\w+")
+
+
+class MinHashLSH:
+    """
+    Index of chunk signatures that finds near-duplicates of new chunks.
+
+    A chunk is represented by the set of its word shingles (shingle_words
+    consecutive lowercase words). Its MinHash signature has num_perm values;
+    the fraction of equal values between two signatures estimates the Jaccard
+    similarity of their shingle sets. Signatures are split into bands, and two
+    chunks become candidates when any band matches exactly, so a lookup only
+    compares against a handful of chunks. Candidates are confirmed with the
+    estimated similarity against threshold.
+    """
+
+    def __init__(self, threshold: float = 0.9, num_perm: int = 128, bands: int = 32, shingle_words: int = 3):
+        """
+        Args:
+            threshold: Minimum estimated Jaccard similarity for a near-duplicate
+            num_perm: Number of hash permutations per signature
+            bands: Number of LSH bands (num_perm must be divisible by it)
+            shingle_words: Words per shingle
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_words = shingle_words
+
+        rng = np.random.default_rng(1)
+        # a * h stays below 2**64 for 32-bit shingle hashes, so uint64 arithmetic is exact
+        self._a = rng.integers(1, 1 << 32, num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, 1 << 32, num_perm, dtype=np.uint64)
+
+        self._signatures: Dict[str, np.ndarray] = {}
+        self._buckets: Dict[bytes, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def signature(self, text: str) -> np.ndarray:
+        """
+        Compute the MinHash signature of a text
+
+        Args:
+            text: Chunk text
+
+        Returns:
+            Array of num_perm uint64 values
+        """
+        words = _WORD.findall(text.lower())
+        n = self.shingle_words
+        shingles = {" ".join(words[i:i + n]) for i in range(max(1, len(words) - n + 1))}
+        hashes = np.fromiter(
+            (zlib.crc32(shingle.encode("utf-8")) for shingle in shingles), dtype=np.uint64, count=len(shingles)
+        )
+        values = (np.outer(hashes, self._a) % _MERSENNE_PRIME + self._b) % _MERSENNE_PRIME
+        return values.min(axis=0)
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [
+            band.to_bytes(2, "little") + signature[band * self.rows:(band + 1) * self.rows].tobytes()
+            for band in range(self.bands)
+        ]
+
+    def query(self, signature: np.ndarray) -> Optional[str]:
+        """
+        Find an indexed chunk that is a near-duplicate of a signature
+
+        Args:
+            signature: Signature from signature()
+
+        Returns:
+            Id of the most similar indexed chunk at or above threshold, or None
+        """
+        candidates = set()
+        for key in self._band_keys(signature):
+            candidates |= self._buckets.get(key, set())
+
+        best_id, best_score = None, self.threshold
+        for chunk_id in candidates:
+            score = float(np.mean(self._signatures[chunk_id] == signature))
+            if score >= best_score:
+                best_id, best_score = chunk_id, score
+        return best_id
+
+    def add(self, chunk_id: str, signature: np.ndarray):
+        """Index a chunk's signature"""
+        self._signatures[chunk_id] = signature
+        for key in self._band_keys(signature):
+            self._buckets.setdefault(key, set()).add(chunk_id)
+
+    def remove(self, chunk_ids):
+        """Forget chunks (unknown ids are ignored)"""
+        for chunk_id in chunk_ids:
+            signature = self._signatures.pop(chunk_id, None)
+            if signature is None:
+                continue
+            for key in self._band_keys(signature):
+                bucket = self._buckets.get(key)
+                if bucket is not None:
+                    bucket.discard(chunk_id)
+                    if not bucket:
+                        del self._buckets[key]
+
+    def clear(self):
+        """Forget every chunk"""
+        self._signatures.clear()
+        self._buckets.clear()
@@ -0,0 +1,473 @@
+"""
+Incrementally maintained vector index over the uploaded files
+"""
+import hashlib
+import threading
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from langchain_core.documents import Document
+
+from config.settings import RAG_CONFIG
+from .bm25_index import BM25Index
+from .dedup import MinHashLSH
+from .embedding_cache import get_embeddings
+from .embedding_providers import get_provider
+from .hybrid_retriever import HybridRetriever
+from .metadata_index import MetadataIndex, assign_section
+from .vector_store import VectorStore, create_vector_store
+from .ingest_pipeline import stream_chunk_batches
+from .token_splitter import create_text_splitter
+
+
+class DocumentIndex:
+    """
+    Vector index that only loads, splits and embeds files it has not seen before.
+
+    Every chunk id is prefixed with the content hash of its file, so a file can be
+    removed by deleting exactly its own chunks. Chunks are embedded here and
+    handed to a pluggable VectorStore as precomputed vectors. The retriever
+    returned by as_retriever() reads from the live index, so a RAG chain built
+    on it stays valid while files are added and removed.
+
+    Near-duplicate chunks (repeated boilerplate, several versions of a file)
+    are detected with MinHash/LSH before embedding. Only the first copy is
+    embedded and stored; the others are kept as pointers to it so their
+    sources can still be cited, and one of them takes over if the file owning
+    the embedded copy is removed.
+
+    A MetadataIndex maps file, page and section heading to chunk ids, so a
+    query can be scoped to part of the corpus before it is scored.
+
+    Files may be ingested on a background thread while the script thread
+    queries: every structure is guarded by `lock` (re-entrant), which
+    add_files() releases while a batch is being embedded.
+    """
+
+    def __init__(self, collection_name: str = None, embeddings=None, vector_store: VectorStore = None,
+                 provider_id: str = None):
+        """
+        Args:
+            collection_name: Name of the collection backing this index
+            embeddings: Embedding model (defaults to RAG_CONFIG["embedding_provider"], cached)
+            vector_store: Store for the chunk vectors (defaults to RAG_CONFIG["vector_backend"])
+            provider_id: Vector space of custom embeddings (ignored when embeddings is None)
+        """
+        self.collection_name = collection_name or RAG_CONFIG["collection_name"]
+        if embeddings is None:
+            provider = get_provider()
+            embeddings, provider_id = get_embeddings(provider), provider.provider_id
+        self.embeddings = embeddings
+        # Fixed for the index's lifetime, so its vectors always come from one provider
+        self.provider_id = provider_id or type(embeddings).__name__
+        self.store = vector_store or create_vector_store(self.collection_name)
+        self.text_splitter = create_text_splitter()
+        # content_hash -> {"name": file name, "chunk_ids": [...], "duplicate_ids": [...], "text_bytes": int}
+        self.files: Dict[str, Dict] = {}
+        # Near-duplicate detection over the embedded chunks
+        self.dedup = MinHashLSH(
+            threshold=RAG_CONFIG["dedup_threshold"],
+            num_perm=RAG_CONFIG["dedup_num_perm"],
+            bands=RAG_CONFIG["dedup_bands"],
+        ) if RAG_CONFIG.get("dedup_enabled", True) else None
+        # duplicate chunk id -> {"of": embedded chunk id, "text": ..., "metadata": ...}
+        self.duplicates: Dict[str, Dict] = {}
+        # embedded chunk id -> ids of its duplicates
+        self.duplicates_of: Dict[str, List[str]] = {}
+        # Chunk and duplicate counts, and per-file load errors, of the last add_files() call
+        self.last_ingest = {"chunks": 0, "duplicates": 0, "errors": {}}
+        # Lexical side of hybrid retrieval, maintained alongside the vectors
+        self.bm25 = BM25Index()
+        # File/page/section -> chunk ids (embedded chunks and duplicates) for scoped queries
+        self.metadata = MetadataIndex()
+        # Bumped on every change so dependents (saved copies, caches) can tell the index moved on
+        self.version = 0
+        # Guards every structure above against concurrent ingestion and queries
+        self.lock = threading.RLock()
+
+    @staticmethod
+    def hash_content(data) -> str:
+        """
+        Compute the content hash that identifies a file in the index
+
+        Args:
+            data: Raw file bytes (or any buffer-protocol object)
+
+        Returns:
+            Hex digest of the file content
+        """
+        return hashlib.sha256(data).hexdigest()
+
+    @classmethod
+    def hash_upload(cls, uploaded_file) -> str:
+        """Content hash of an uploaded file, computed on its buffer without copying the bytes"""
+        with uploaded_file.getbuffer() as buffer:
+            return cls.hash_content(buffer)
+
+    def has_file(self, content_hash: str) -> bool:
+        """Check whether a file with this content hash is already indexed"""
+        return content_hash in self.files
+
+    @property
+    def file_names(self) -> List[str]:
+        """Names of the indexed files in insertion order"""
+        with self.lock:
+            return [info["name"] for info in self.files.values()]
+
+    @property
+    def chunk_count(self) -> int:
+        """Total number of chunks currently indexed"""
+        with self.lock:
+            return sum(len(info["chunk_ids"]) for info in self.files.values())
+
+    @property
+    def fingerprint(self) -> str:
+        """
+        Hash of the indexed chunks and embedding provider; changes whenever a file is added or removed
+
+        Each file's chunk count is included, so a file that is still being
+        indexed batch by batch changes the fingerprint until it is complete.
+        """
+        digest = hashlib.sha256(self.provider_id.encode("utf-8"))
+        with self.lock:
+            for content_hash in sorted(self.files):
+                digest.update(f"{content_hash}:{len(self.files[content_hash]['chunk_ids'])}".encode("ascii"))
+        return digest.hexdigest()
+
+    def add_files(self, uploaded_files, progress: Callable[[str, int], None] = None) -> List[str]:
+        """
+        Load, split and embed the files that are not indexed yet
+
+        Each batch of chunks is searchable as soon as it is stored. Files that
+        fail to load are rolled back and reported in last_ingest["errors"]; if
+        embedding fails, every file of the call is rolled back and the error raised.
+
+        Args:
+            uploaded_files: List of uploaded file objects from Streamlit (or any named binary buffers)
+            progress: Called with (content hash, chunks stored so far) after every stored batch
+
+        Returns:
+            Content hashes of the files that were added
+        """
+        pending = []
+        for uploaded_file in uploaded_files:
+            content_hash = self.hash_upload(uploaded_file)
+            if self.has_file(content_hash) or any(content_hash == h for _, h in pending):
+                continue
+            pending.append((uploaded_file, content_hash))
+
+        if not pending:
+            return []
+
+        # Pages are loaded, split and embedded as a stream of batches, straight from the upload buffers
+        failed, errors = set(), {}
+        chunk_counts = [0] * len(pending)
+        stored_counts = [0] * len(pending)
+        duplicate_count = 0
+        # Section heading in force at the end of each file's previous chunk
+        sections = [None] * len(pending)
+        batches = stream_chunk_batches([(f.name, f) for f, _ in pending], self.text_splitter)
+        for batch in batches:
+            texts, metadatas, ids, owners = [], [], [], []
+            with self.lock:
+                for position, chunk, error in batch:
+                    if error is not None:
+                        errors[pending[position][0].name] = str(error)
+                        failed.add(position)
+                        continue
+                    if position in failed:
+                        continue
+
+                    uploaded_file, content_hash = pending[position]
+                    chunk_id = f"{content_hash}:{chunk_counts[position]}"
+                    chunk.metadata["source"] = uploaded_file.name
+                    chunk.metadata["content_hash"] = content_hash
+                    chunk.metadata["chunk_id"] = chunk_id
+                    section, sections[position] = assign_section(chunk.page_content, sections[position])
+                    if section:
+                        chunk.metadata["section"] = section
+                    chunk_counts[position] += 1
+
+                    # Near-duplicates of an already embedded chunk are only recorded as pointers
+                    if self.dedup is not None:
+                        signature = self.dedup.signature(chunk.page_content)
+                        original = self.dedup.query(signature)
+                        if original is not None:
+                            self._add_duplicate(chunk_id, original, chunk.page_content, chunk.metadata, uploaded_file.name)
+                            duplicate_count += 1
+                            continue
+                        self.dedup.add(chunk_id, signature)
+
+                    texts.append(chunk.page_content)
+                    metadatas.append(chunk.metadata)
+                    ids.append(chunk_id)
+                    owners.append(position)
+
+            if not texts:
+                continue
+            # Embedding is the slow part: queries may run meanwhile
+            try:
+                vectors = self.embeddings.embed_documents(texts)
+            except Exception:
+                with self.lock:
+                    # Chunks of this batch were registered for dedup but never stored
+                    if self.dedup is not None:
+                        self.dedup.remove(ids)
+                    # Roll back every file of the call, so none is left half-indexed (and skipped on re-upload)
+                    self._remove_files([content_hash for _, content_hash in pending])
+                raise
+            with self.lock:
+                self.store.add(ids, vectors, texts, metadatas)
+                for position, chunk_id, text, metadata in zip(owners, ids, texts, metadatas):
+                    self.bm25.add(chunk_id, Document(page_content=text, metadata=metadata))
+                    self.metadata.add(chunk_id, metadata)
+                    uploaded_file, content_hash = pending[position]
+                    info = self._file_info(content_hash, uploaded_file.name)
+                    info["chunk_ids"].append(chunk_id)
+                    info["text_bytes"] += len(text)
+                    stored_counts[position] += 1
+                self.version += 1
+            if progress is not None:
+                for position in set(owners):
+                    progress(pending[position][1], stored_counts[position])
+
+        # A file that failed part-way must not leave half of its chunks behind
+        self.remove_files([pending[position][1] for position in failed])
+        with self.lock:
+            self.version += 1
+        self.last_ingest = {"chunks": sum(chunk_counts), "duplicates": duplicate_count, "errors": errors}
+
+        return [content_hash for _, content_hash in pending if content_hash in self.files]
+
+    def remove_files(self, content_hashes: List[str]) -> List[str]:
+        """
+        Delete the chunks of the given files from the index
+
+        Args:
+            content_hashes: Content hashes of the files to remove
+
+        Returns:
+            Content hashes that were actually removed
+        """
+        with self.lock:
+            return self._remove_files(content_hashes)
+
+    def _remove_files(self, content_hashes: List[str]) -> List[str]:
+        removed = [content_hash for content_hash in content_hashes if content_hash in self.files]
+
+        # Forget the duplicates owned by these files first, so none of them is promoted below
+        for content_hash in removed:
+            duplicate_ids = self.files[content_hash].get("duplicate_ids", [])
+            for duplicate_id in duplicate_ids:
+                self._forget_duplicate(duplicate_id)
+            self.metadata.remove(duplicate_ids)
+
+        for content_hash in removed:
+            info = self.files.pop(content_hash)
+            if info["chunk_ids"]:
+                for chunk_id in info["chunk_ids"]:
+                    self._promote_duplicate(chunk_id)
+                self.store.delete(info["chunk_ids"])
+                self.bm25.remove(info["chunk_ids"])
+                self.metadata.remove(info["chunk_ids"])
+                if self.dedup is not None:
+                    self.dedup.remove(info["chunk_ids"])
+        if removed:
+            self.version += 1
+        return removed
+
+    def add_precomputed(self, file_name: str, content_hash: str, chunk_ids: List[str], texts: List[str],
+                        metadatas: List[Dict], vectors, duplicates: List[Dict] = None) -> bool:
+        """
+        Add an already chunked and embedded file (e.g. from a saved index) without calling the embedding model
+
+        Args:
+            file_name: Original file name
+            content_hash: Content hash of the file
+            chunk_ids: Ids of the embedded chunks, prefixed with the content hash
+            texts: Chunk texts
+            metadatas: Chunk metadata
+            vectors: Embedding rows aligned with texts
+            duplicates: Near-duplicate chunks as {"id", "of", "text", "metadata"} dictionaries
+
+        Returns:
+            True if the file was added, False if it was already indexed
+        """
+        with self.lock:
+            return self._add_precomputed(file_name, content_hash, chunk_ids, texts, metadatas, vectors, duplicates)
+
+    def _add_precomputed(self, file_name, content_hash, chunk_ids, texts, metadatas, vectors, duplicates) -> bool:
+        if self.has_file(content_hash):
+            return False
+        if chunk_ids:
+            self.store.add(list(chunk_ids), vectors, texts, metadatas)
+        for chunk_id, text, metadata in zip(chunk_ids, texts, metadatas):
+            self.bm25.add(chunk_id, Document(page_content=text, metadata=metadata))
+            self.metadata.add(chunk_id, metadata)
+            if self.dedup is not None:
+                self.dedup.add(chunk_id, self.dedup.signature(text))
+        info = self._file_info(content_hash, file_name)
+        info["chunk_ids"] = list(chunk_ids)
+        info["text_bytes"] = sum(len(text) for text in texts)
+        for duplicate in duplicates or []:
+            # The embedded copy may be gone if its file could not be restored
+            if self._is_stored(duplicate["of"]):
+                self._add_duplicate(duplicate["id"], duplicate["of"], duplicate["text"], duplicate["metadata"], file_name)
+        self.version += 1
+        return True
+
+    def export_file(self, content_hash: str) -> Dict:
+        """
+        Read back a file's chunks together with their stored embeddings
+
+        Args:
+            content_hash: Content hash of an indexed file
+
+        Returns:
+            Dictionary with ids, documents, metadatas and embeddings in chunk order,
+            plus the file's near-duplicate chunks under "duplicates"
+        """
+        with self.lock:
+            info = self.files[content_hash]
+            data = self.store.get(info["chunk_ids"])
+            data["duplicates"] = [
+                {"id": duplicate_id, **self.duplicates[duplicate_id]} for duplicate_id in info.get("duplicate_ids", [])
+            ]
+        return data
+
+    # ----- near-duplicate bookkeeping -----
+
+    def _file_info(self, content_hash: str, file_name: str) -> Dict:
+        return self.files.setdefault(
+            content_hash, {"name": file_name, "chunk_ids": [], "duplicate_ids": [], "text_bytes": 0}
+        )
+
+    def _is_stored(self, chunk_id: str) -> bool:
+        content_hash = chunk_id.split(":", 1)[0]
+        return content_hash in self.files and chunk_id in self.files[content_hash]["chunk_ids"]
+
+    def _add_duplicate(self, chunk_id: str, original_id: str, text: str, metadata: Dict, file_name: str):
+        self.duplicates[chunk_id] = {"of": original_id, "text": text, "metadata": metadata}
+        self.duplicates_of.setdefault(original_id, []).append(chunk_id)
+        self.metadata.add(chunk_id, metadata)
+        info = self._file_info(metadata["content_hash"], file_name)
+        info["duplicate_ids"].append(chunk_id)
+        info["text_bytes"] += len(text)
+
+    def _forget_duplicate(self, chunk_id: str):
+        entry = self.duplicates.pop(chunk_id, None)
+        if entry is None:
+            return
+        siblings = self.duplicates_of.get(entry["of"], [])
+        if chunk_id in siblings:
+            siblings.remove(chunk_id)
+        if not siblings:
+            self.duplicates_of.pop(entry["of"], None)
+
+    def _promote_duplicate(self, chunk_id: str):
+        """Before an embedded chunk is deleted, store its first duplicate in its place (reusing the vector)"""
+        duplicate_ids = self.duplicates_of.pop(chunk_id, None)
+        if not duplicate_ids:
+            return
+        promoted_id, others = duplicate_ids[0], duplicate_ids[1:]
+        entry = self.duplicates.pop(promoted_id)
+        vector = self.store.get([chunk_id])["embeddings"][0]
+
+        self.store.add([promoted_id], [vector], [entry["text"]], [entry["metadata"]])
+        self.bm25.add(promoted_id, Document(page_content=entry["text"], metadata=entry["metadata"]))
+        if self.dedup is not None:
+            self.dedup.add(promoted_id, self.dedup.signature(entry["text"]))
+        info = self.files[entry["metadata"]["content_hash"]]
+        info["duplicate_ids"].remove(promoted_id)
+        info["chunk_ids"].append(promoted_id)
+
+        for duplicate_id in others:
+            self.duplicates[duplicate_id]["of"] = promoted_id
+        if others:
+            self.duplicates_of[promoted_id] = others
+
+    def duplicate_sources(self, chunk_id: str) -> List[Dict]:
+        """Metadata of the near-duplicates recorded for an embedded chunk"""
+        return [self.duplicates[duplicate_id]["metadata"] for duplicate_id in self.duplicates_of.get(chunk_id, [])]
+
+    def candidate_ids(self, file: str = None, page: int = None, section: str = None) -> Optional[Set[str]]:
+        """
+        Embedded chunk ids within a file, page and/or section
+
+        A near-duplicate that matches is replaced by the embedded chunk it points
+        to, so scoped queries still find passages that were stored only once.
+
+        Args:
+            file: File name or part of it (e.g. "contract")
+            page: Page number, 1-based
+            section: Text contained in the section heading
+
+        Returns:
+            Set of chunk ids (possibly empty), or None when no filter is given
+        """
+        with self.lock:
+            selected = self.metadata.select(file=file, page=page, section=section)
+            if selected is None:
+                return None
+            return {
+                self.duplicates[chunk_id]["of"] if chunk_id in self.duplicates else chunk_id for chunk_id in selected
+            }
+
+    def similarity_search(self, query: str, k: int, candidate_ids: Set[str] = None,
+                          query_vector: Sequence[float] = None) -> List[Tuple[str, Document, float]]:
+        """
+        Embed a query and find the most similar chunks
+
+        Args:
+            query: Search text
+            k: Number of results
+            candidate_ids: Only score these chunks (from candidate_ids())
+            query_vector: Embedding of the query, when the caller already has it
+
+        Returns:
+            Up to k (chunk id, document, cosine similarity) tuples, best first
+        """
+        if not self.files or (candidate_ids is not None and not candidate_ids):
+            return []
+        if query_vector is None:
+            query_vector = self.embeddings.embed_query(query)
+        with self.lock:
+            return self.store.search(query_vector, k, candidate_ids=candidate_ids)
+
+    @property
+    def estimated_bytes(self) -> int:
+        """Approximate memory held by the index (chunk text plus stored vectors)"""
+        with self.lock:
+            return self.store.nbytes + sum(info["text_bytes"] for info in self.files.values())
+
+    def clear(self):
+        """Remove every file from the index"""
+        self.remove_files(list(self.files))
+
+    def drop(self):
+        """Delete the whole collection and forget all files"""
+        with self.lock:
+            self.files.clear()
+            self.duplicates.clear()
+            self.duplicates_of.clear()
+            if self.dedup is not None:
+                self.dedup.clear()
+            self.bm25.clear()
+            self.metadata.clear()
+            self.store.drop()
+
+    def as_retriever(self, k: int = None, filters: Dict = None):
+        """
+        Create a retriever over the live index (hybrid BM25 + vector unless disabled)
+
+        Args:
+            k: Number of chunks to return (defaults to RAG_CONFIG["retriever_k"])
+            filters: Optional file/page/section filters, as accepted by candidate_ids()
+        """
+        return HybridRetriever(
+            index=self,
+            k=k or RAG_CONFIG["retriever_k"],
+            filters=filters or None,
+            fetch_k=RAG_CONFIG["hybrid_fetch_k"],
+            score_threshold=RAG_CONFIG["similarity_score_threshold"],
+            hybrid=RAG_CONFIG.get("hybrid_retrieval", True),
+        )
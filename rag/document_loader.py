@@ -1,17 +1,18 @@
 """
 Document loading utilities for different file types
 """
+import os
+from typing import BinaryIO, Iterator
+
 import streamlit as st
-from langchain_community.document_loaders import (
-    PyPDFLoader,
-    TextLoader,
-    UnstructuredWordDocumentLoader
-)
+from langchain_core.documents import Document
+
+from .loaders import get_backend
 
 
 def load_document(file_path: str, file_type: str):
     """
-    Load a document based on its type
+    Load a document based on its type, with the configured extraction backend
     
     Args:
         file_path: Path to the document file
@@ -21,17 +22,27 @@ def load_document(file_path: str, file_type: str):
         List of document objects or None if loading fails
     """
     try:
-        if file_type == "pdf":
-            loader = PyPDFLoader(file_path)
-        elif file_type == "txt":
-            loader = TextLoader(file_path)
-        elif file_type in ["docx", "doc"]:
-            loader = UnstructuredWordDocumentLoader(file_path)
-        else:
-            return None
-        
-        documents = loader.load()
-        return documents
+        with open(file_path, "rb") as stream:
+            return list(iter_document_pages(stream, os.path.basename(file_path), file_type))
     except Exception as e:
         st.error(f"Error loading document: {e}")
-        return None
\ No newline at end of file
+        return None
+
+
+def iter_document_pages(stream: BinaryIO, file_name: str, file_type: str) -> Iterator[Document]:
+    """
+    Lazily yield the pages of an in-memory document
+    
+    Text is extracted by the backend that RAG_CONFIG["loader_profile"] (or a
+    per-type entry in RAG_CONFIG["loader_backends"]) selects for the file type.
+    
+    Args:
+        stream: Seekable binary buffer holding the file (e.g. a Streamlit UploadedFile)
+        file_name: Original file name, recorded as the page source
+        file_type: Type of file (pdf, txt, docx, doc)
+        
+    Yields:
+        One document per page (PDF) or per file (other types)
+    """
+    stream.seek(0)
+    yield from get_backend(file_type).iter_pages(stream, file_name)
@@ -0,0 +1,272 @@
+"""
+Persistent, content-addressed embedding cache for document ingestion
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from typing import Dict, List, Optional
+
+import streamlit as st
+from langchain_core.embeddings import Embeddings
+
+from config.settings import RAG_CONFIG
+from .embedding_executor import EmbeddingExecutor
+from .embedding_providers import EmbeddingProvider, get_provider
+
+
+# SQLite limits the number of bound parameters per statement
+_SQL_BATCH = 500
+
+
+class EmbeddingCache:
+    """SQLite-backed embedding store keyed by a hash of (embedding provider id, chunk text)"""
+
+    def __init__(self, path: str, max_bytes: int):
+        """
+        Open (or create) the cache database
+
+        Args:
+            path: Location of the SQLite file
+            max_bytes: Size budget for stored vectors; least recently used entries are evicted beyond it
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            " key TEXT PRIMARY KEY,"
+            " vector BLOB NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_last_access ON embeddings(last_access)")
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM embeddings").fetchone()[0]
+
+    @staticmethod
+    def make_key(text: str, model: str) -> str:
+        """
+        Build the content address for a chunk
+
+        Args:
+            text: Chunk text
+            model: Embedding provider id (e.g. "openai:text-embedding-3-small")
+
+        Returns:
+            Hex digest identifying the (provider, text) pair
+        """
+        return hashlib.sha256(f"{model}\0{text}".encode("utf-8")).hexdigest()
+
+    def get_many(self, keys: List[str]) -> List[Optional[List[float]]]:
+        """
+        Look up several vectors at once
+
+        Args:
+            keys: Cache keys from make_key()
+
+        Returns:
+            List aligned with keys, holding the vector or None for a miss
+        """
+        found: Dict[str, List[float]] = {}
+        now = time.time()
+
+        with self._lock:
+            for start in range(0, len(keys), _SQL_BATCH):
+                batch = keys[start:start + _SQL_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", batch
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = array("f", blob).tolist()
+
+                hit_keys = [key for key, _ in rows]
+                if hit_keys:
+                    self._conn.execute(
+                        f"UPDATE embeddings SET last_access = ? WHERE key IN ({','.join('?' * len(hit_keys))})",
+                        [now, *hit_keys],
+                    )
+
+            results = [found.get(key) for key in keys]
+            hit_count = sum(1 for r in results if r is not None)
+            self.hits += hit_count
+            self.misses += len(keys) - hit_count
+
+        return results
+
+    def put_many(self, items: Dict[str, List[float]]):
+        """
+        Store vectors and evict old entries if the size budget is exceeded
+
+        Args:
+            items: Mapping of cache key to embedding vector
+        """
+        if not items:
+            return
+
+        now = time.time()
+        rows = []
+        for key, vector in items.items():
+            blob = array("f", vector).tobytes()
+            rows.append((key, blob, len(blob), now))
+
+        with self._lock:
+            self._conn.execute("BEGIN")
+            added = 0
+            for row in rows:
+                cursor = self._conn.execute(
+                    "INSERT OR IGNORE INTO embeddings (key, vector, size, last_access) VALUES (?, ?, ?, ?)", row
+                )
+                if cursor.rowcount:
+                    added += row[2]
+            self._conn.execute("COMMIT")
+            self._total_bytes += added
+            self._evict()
+
+    def _evict(self):
+        """Drop least recently used entries until the cache fits its budget (caller holds the lock)"""
+        while self._total_bytes > self.max_bytes:
+            victims = self._conn.execute(
+                "SELECT key, size FROM embeddings ORDER BY last_access LIMIT 256"
+            ).fetchall()
+            if not victims:
+                self._total_bytes = 0
+                return
+
+            self._conn.execute("BEGIN")
+            for key, size in victims:
+                self._conn.execute("DELETE FROM embeddings WHERE key = ?", (key,))
+                self._total_bytes -= size
+                self.evictions += 1
+                if self._total_bytes <= self.max_bytes:
+                    break
+            self._conn.execute("COMMIT")
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Report cache effectiveness
+
+        Returns:
+            Dictionary with hit/miss counters, hit rate, entry count and stored size
+        """
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": entries,
+                "size_bytes": self._total_bytes,
+            }
+
+    def clear(self):
+        """Remove every cached vector and reset counters"""
+        with self._lock:
+            self._conn.execute("DELETE FROM embeddings")
+            self._total_bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+
+class CachedEmbeddings(Embeddings):
+    """Embeddings wrapper that only calls the underlying model for chunks not seen before"""
+
+    def __init__(self, embeddings: Embeddings, cache: EmbeddingCache, model_name: str):
+        """
+        Args:
+            embeddings: The real embedding model (e.g. OpenAIEmbeddings)
+            cache: Shared EmbeddingCache
+            model_name: Provider id mixed into cache keys so vectors of different providers never collide
+        """
+        self.embeddings = embeddings
+        self.cache = cache
+        self.model_name = model_name
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys = [self.cache.make_key(text, self.model_name) for text in texts]
+        vectors = self.cache.get_many(keys)
+
+        # Embed each distinct missing text once, even if it repeats within the batch
+        missing: Dict[str, str] = {}
+        for key, text, vector in zip(keys, texts, vectors):
+            if vector is None and key not in missing:
+                missing[key] = text
+
+        if missing:
+            new_vectors = self.embeddings.embed_documents(list(missing.values()))
+            fresh = dict(zip(missing.keys(), new_vectors))
+            self.cache.put_many(fresh)
+            vectors = [vector if vector is not None else fresh[key] for key, vector in zip(keys, vectors)]
+
+        return vectors
+
+    def embed_query(self, text: str) -> List[float]:
+        key = self.cache.make_key(text, self.model_name)
+        vector = self.cache.get_many([key])[0]
+        if vector is None:
+            vector = self.embeddings.embed_query(text)
+            self.cache.put_many({key: vector})
+        return vector
+
+
+@st.cache_resource
+def get_embedding_cache() -> EmbeddingCache:
+    """Return the process-wide embedding cache shared by all sessions"""
+    return EmbeddingCache(
+        RAG_CONFIG["embedding_cache_path"],
+        max_bytes=int(RAG_CONFIG["embedding_cache_max_mb"] * 1024 * 1024),
+    )
+
+
+@st.cache_resource
+def get_embedding_executor() -> EmbeddingExecutor:
+    """
+    Return the process-wide embedding executor
+
+    Shared by all sessions so its adaptive concurrency reflects the rate
+    limits of the one API key they all use.
+    """
+    return EmbeddingExecutor(
+        get_provider("openai").create(),
+        max_batch_tokens=RAG_CONFIG["embedding_batch_tokens"],
+        max_concurrency=RAG_CONFIG["embedding_concurrency"],
+        max_retries=RAG_CONFIG["embedding_max_retries"],
+    )
+
+
+@st.cache_resource
+def get_local_embeddings(name: str) -> Embeddings:
+    """Return the process-wide model of a local embedding provider (loaded once)"""
+    return get_provider(name).create()
+
+
+def get_embeddings(provider: EmbeddingProvider = None) -> Embeddings:
+    """
+    Build the embedding model used for ingestion and retrieval
+
+    Args:
+        provider: Embedding provider (defaults to RAG_CONFIG["embedding_provider"])
+
+    Returns:
+        The batched OpenAI embedding executor or a local model, wrapped with the
+        persistent cache when it is enabled and worthwhile for the provider
+    """
+    provider = provider or get_provider()
+    embeddings = get_embedding_executor() if provider.remote else get_local_embeddings(provider.name)
+    if not RAG_CONFIG.get("embedding_cache_enabled", True) or not provider.cacheable:
+        return embeddings
+    return CachedEmbeddings(embeddings, get_embedding_cache(), provider.provider_id)
@@ -0,0 +1,222 @@
+"""
+Batched, concurrent embedding execution with adaptive rate-limit backoff
+"""
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, List, Optional
+
+from langchain_core.embeddings import Embeddings
+
+from config.settings import RAG_CONFIG
+from .tokenizer import count_tokens
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """Read the server's requested delay (seconds) from a rate-limit error, if any"""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        if headers.get("retry-after"):
+            return float(headers["retry-after"])
+    except (TypeError, ValueError):
+        pass
+    return None
+
+
+def _is_rate_limit(error: Exception) -> bool:
+    """Check whether an error is an HTTP 429 from the embedding API"""
+    if type(error).__name__ == "RateLimitError":
+        return True
+    status = getattr(error, "status_code", None) or getattr(getattr(error, "response", None), "status_code", None)
+    return status == 429
+
+
+class EmbeddingExecutor(Embeddings):
+    """
+    Embeddings wrapper that packs texts into token-budgeted batches and embeds
+    several batches at once.
+
+    Concurrency follows additive-increase / multiplicative-decrease: every
+    rate-limited batch halves the number of batches in flight and pauses new
+    submissions for the server's retry-after delay (or an exponential backoff
+    with jitter); each run of successful batches raises the limit by one again.
+
+    The limit counts requests of every caller together (concurrent ingestion
+    jobs, sessions and query embeddings), and all of them share one worker
+    pool; query embeddings take part in the same backoff and retries.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        max_batch_tokens: int = 8000,
+        max_concurrency: int = 4,
+        max_retries: int = 6,
+    ):
+        """
+        Args:
+            embeddings: The real embedding model
+            max_batch_tokens: Token budget of a single embedding request
+            max_concurrency: Upper bound on batches in flight
+            max_retries: Rate-limit retries allowed per batch
+        """
+        self.embeddings = embeddings
+        self.max_batch_tokens = max_batch_tokens
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_retries = max_retries
+
+        self._lock = threading.Lock()
+        # Signalled whenever a request slot is released
+        self._slots = threading.Condition(self._lock)
+        self._pool = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="embed")
+        self._active = 0
+        self._limit = self.max_concurrency
+        self._successes = 0
+        self._resume_at = 0.0
+        self._stats = {"chunks": 0, "tokens": 0, "requests": 0, "rate_limited": 0, "seconds": 0.0}
+
+    def _pack(self, texts: List[str]) -> List[List[int]]:
+        """Group text indices into batches whose summed token count stays within the budget"""
+        batches, current, current_tokens = [], [], 0
+        for i, text in enumerate(texts):
+            tokens = count_tokens(text)
+            if current and current_tokens + tokens > self.max_batch_tokens:
+                batches.append(current)
+                current, current_tokens = [], 0
+            current.append(i)
+            current_tokens += tokens
+        if current:
+            batches.append(current)
+        return batches
+
+    def _try_acquire(self) -> bool:
+        """Take a request slot if under the limit and not backing off"""
+        with self._lock:
+            if self._active < self._limit and time.monotonic() >= self._resume_at:
+                self._active += 1
+                return True
+            return False
+
+    def _acquire(self):
+        """Block until a request slot is free and any backoff pause is over, then take it"""
+        with self._slots:
+            while True:
+                delay = self._resume_at - time.monotonic()
+                if delay <= 0 and self._active < self._limit:
+                    self._active += 1
+                    return
+                self._slots.wait(delay if delay > 0 else None)
+
+    def _release(self, _future=None):
+        with self._slots:
+            self._active -= 1
+            self._slots.notify_all()
+
+    def _on_success(self):
+        with self._lock:
+            self._successes += 1
+            if self._successes >= self._limit and self._limit < self.max_concurrency:
+                self._limit += 1
+                self._successes = 0
+
+    def _on_rate_limit(self, error: Exception, attempt: int):
+        delay = _retry_after(error)
+        if delay is None:
+            delay = min(60.0, 2 ** attempt) * (0.5 + random.random())
+        with self._lock:
+            self._stats["rate_limited"] += 1
+            self._limit = max(1, self._limit // 2)
+            self._successes = 0
+            self._resume_at = max(self._resume_at, time.monotonic() + delay)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+
+        started = time.monotonic()
+        token_count = sum(count_tokens(text) for text in texts)
+        results: List[Optional[List[float]]] = [None] * len(texts)
+        pending = deque((batch, 0) for batch in self._pack(texts))
+        requests = 0
+
+        in_flight = {}
+        while pending or in_flight:
+            # Submit while under the shared adaptive limit and not backing off
+            while pending and self._try_acquire():
+                self._submit(pending, in_flight, texts)
+                requests += 1
+            if not in_flight:
+                # Other callers hold every slot, or a backoff pause is running
+                self._acquire()
+                self._submit(pending, in_flight, texts)
+                requests += 1
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                batch, attempt = in_flight.pop(future)
+                try:
+                    vectors = future.result()
+                except Exception as e:
+                    if not _is_rate_limit(e) or attempt >= self.max_retries:
+                        raise
+                    self._on_rate_limit(e, attempt)
+                    pending.appendleft((batch, attempt + 1))
+                    continue
+
+                for i, vector in zip(batch, vectors):
+                    results[i] = vector
+                self._on_success()
+
+        with self._lock:
+            self._stats["chunks"] += len(texts)
+            self._stats["tokens"] += token_count
+            self._stats["requests"] += requests
+            self._stats["seconds"] += time.monotonic() - started
+
+        return results
+
+    def _submit(self, pending: deque, in_flight: Dict, texts: List[str]):
+        """Send the next pending batch on the shared pool (the caller holds a slot for it)"""
+        batch, attempt = pending.popleft()
+        future = self._pool.submit(self.embeddings.embed_documents, [texts[i] for i in batch])
+        future.add_done_callback(self._release)
+        in_flight[future] = (batch, attempt)
+
+    def embed_query(self, text: str) -> List[float]:
+        attempt = 0
+        while True:
+            self._acquire()
+            try:
+                vector = self.embeddings.embed_query(text)
+            except Exception as e:
+                if not _is_rate_limit(e) or attempt >= self.max_retries:
+                    raise
+                self._on_rate_limit(e, attempt)
+                attempt += 1
+                continue
+            finally:
+                self._release()
+            self._on_success()
+            return vector
+
+    def metrics(self) -> Dict[str, float]:
+        """
+        Report embedding throughput
+
+        Returns:
+            Dictionary with totals, the current concurrency limit, and chunks/s and tokens/s
+            measured over the time spent inside embed_documents
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["concurrency"] = self._limit
+
+        seconds = stats["seconds"]
+        stats["chunks_per_second"] = stats["chunks"] / seconds if seconds else 0.0
+        stats["tokens_per_second"] = stats["tokens"] / seconds if seconds else 0.0
+        return stats
@@ -0,0 +1,240 @@
+"""
+Registry of embedding providers: the OpenAI API and local CPU backends
+"""
+import importlib.util
+import os
+import zlib
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Dict, List
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from config.settings import RAG_CONFIG
+from .bm25_index import tokenize
+
+
+@lru_cache(maxsize=1 << 17)
+def _feature_hash(feature: str) -> int:
+    return zlib.crc32(feature.encode("utf-8"))
+
+
+class HashingEmbeddings(Embeddings):
+    """
+    Local embeddings by feature hashing, with no model download.
+
+    Each text is reduced to its word unigrams and bigrams (BM25 tokenizer, stop
+    words dropped). Every feature is hashed into one of `dimensions` buckets
+    with a hash-derived sign, weighted by sublinear term frequency
+    (1 + log tf), and the row is L2-normalised. Similarity is therefore
+    lexical, not semantic, but the vectors are deterministic, need no network,
+    and a whole batch is built with a few NumPy operations.
+    """
+
+    def __init__(self, dimensions: int = 1024):
+        """
+        Args:
+            dimensions: Vector size (number of hash buckets)
+        """
+        self.dimensions = dimensions
+
+    def _features(self, text: str) -> List[str]:
+        terms = tokenize(text)
+        return terms + [f"{a} {b}" for a, b in zip(terms, terms[1:])]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        rows, hashes = [], []
+        for row, text in enumerate(texts):
+            features = self._features(text)
+            rows.extend([row] * len(features))
+            hashes.extend(_feature_hash(feature) for feature in features)
+
+        matrix = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        if hashes:
+            # Count each (row, feature) pair once, then scatter the weights into hash buckets
+            keys = (np.asarray(rows, dtype=np.uint64) << np.uint64(32)) | np.asarray(hashes, dtype=np.uint64)
+            unique, counts = np.unique(keys, return_counts=True)
+            row_index = (unique >> np.uint64(32)).astype(np.int64)
+            feature = (unique & np.uint64(0xFFFFFFFF)).astype(np.int64)
+            signs = np.where(feature & 0x80000000, 1.0, -1.0)
+            np.add.at(matrix, (row_index, feature % self.dimensions), signs * (1.0 + np.log(counts)))
+
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return (matrix / norms).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+
+class OnnxEmbeddings(Embeddings):
+    """
+    Local sentence-transformer embeddings run with ONNX Runtime on the CPU.
+
+    model_dir must hold an exported model.onnx and its tokenizer.json (e.g.
+    all-MiniLM-L6-v2). Token embeddings are mean-pooled over the attention
+    mask and L2-normalised.
+    """
+
+    def __init__(self, model_dir: str, batch_size: int = 32, max_length: int = 256):
+        """
+        Args:
+            model_dir: Directory with model.onnx and tokenizer.json
+            batch_size: Texts per inference call
+            max_length: Tokens kept per text
+        """
+        import onnxruntime
+        from tokenizers import Tokenizer
+
+        self.batch_size = batch_size
+        self.session = onnxruntime.InferenceSession(
+            os.path.join(model_dir, "model.onnx"), providers=["CPUExecutionProvider"]
+        )
+        self.input_names = {model_input.name for model_input in self.session.get_inputs()}
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=max_length)
+        self.tokenizer.enable_padding()
+
+    def _embed(self, texts: List[str]) -> np.ndarray:
+        encodings = self.tokenizer.encode_batch(texts)
+        ids = np.array([encoding.ids for encoding in encodings], dtype=np.int64)
+        mask = np.array([encoding.attention_mask for encoding in encodings], dtype=np.int64)
+        feeds = {"input_ids": ids, "attention_mask": mask}
+        if "token_type_ids" in self.input_names:
+            feeds["token_type_ids"] = np.zeros_like(ids)
+        hidden = self.session.run(None, feeds)[0]
+
+        weights = mask[..., None].astype(np.float32)
+        pooled = (hidden * weights).sum(axis=1) / np.maximum(weights.sum(axis=1), 1e-9)
+        norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return pooled / norms
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        vectors = [self._embed(texts[start:start + self.batch_size]) for start in range(0, len(texts), self.batch_size)]
+        return np.concatenate(vectors).tolist() if vectors else []
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed([text])[0].tolist()
+
+
+class EmbeddingProvider(ABC):
+    """
+    A source of embedding vectors.
+
+    provider_id identifies the vector space (provider, model and anything else
+    that changes the vectors); indexes, saved indexes and the embedding cache
+    record it so vectors of different providers are never mixed.
+    """
+
+    name = ""
+    requires = ()
+    # Remote providers are wrapped by the EmbeddingExecutor (token batching, rate-limit backoff)
+    remote = False
+    # Whether vectors are worth keeping in the persistent embedding cache
+    cacheable = True
+
+    def available(self) -> bool:
+        """Check whether the provider's libraries (and model files) are present"""
+        try:
+            return all(importlib.util.find_spec(module) is not None for module in self.requires)
+        except (ImportError, ValueError):
+            return False
+
+    @property
+    @abstractmethod
+    def provider_id(self) -> str:
+        """Identifier of the vector space the provider produces"""
+
+    @abstractmethod
+    def create(self) -> Embeddings:
+        """Build the embedding model"""
+
+
+class OpenAIProvider(EmbeddingProvider):
+    name = "openai"
+    requires = ("langchain_openai",)
+    remote = True
+
+    @property
+    def provider_id(self):
+        return f"openai:{RAG_CONFIG['embedding_model']}"
+
+    def create(self):
+        from langchain_openai import OpenAIEmbeddings
+
+        # The executor owns retries and backoff, so the client must not retry on its own
+        return OpenAIEmbeddings(model=RAG_CONFIG["embedding_model"], max_retries=0)
+
+
+class HashingProvider(EmbeddingProvider):
+    name = "hashing"
+    # Recomputing is cheaper than a SQLite lookup
+    cacheable = False
+
+    @property
+    def provider_id(self):
+        return f"hashing:v1:{RAG_CONFIG.get('hashing_dimensions', 1024)}"
+
+    def create(self):
+        return HashingEmbeddings(dimensions=RAG_CONFIG.get("hashing_dimensions", 1024))
+
+
+class OnnxProvider(EmbeddingProvider):
+    name = "onnx"
+    requires = ("onnxruntime", "tokenizers")
+
+    def available(self):
+        return super().available() and os.path.exists(os.path.join(RAG_CONFIG["onnx_model_dir"], "model.onnx"))
+
+    @property
+    def provider_id(self):
+        return f"onnx:{os.path.basename(os.path.normpath(RAG_CONFIG['onnx_model_dir']))}"
+
+    def create(self):
+        return OnnxEmbeddings(RAG_CONFIG["onnx_model_dir"])
+
+
+_REGISTRY: Dict[str, EmbeddingProvider] = {}
+
+
+def register_provider(provider: EmbeddingProvider):
+    """Add a provider to the registry (replacing one with the same name)"""
+    _REGISTRY[provider.name] = provider
+
+
+for _provider in (OpenAIProvider(), HashingProvider(), OnnxProvider()):
+    register_provider(_provider)
+
+
+def list_providers() -> List[EmbeddingProvider]:
+    """Registered embedding providers"""
+    return list(_REGISTRY.values())
+
+
+def get_provider(name: str = None) -> EmbeddingProvider:
+    """
+    Look up an embedding provider
+
+    Args:
+        name: Provider name (defaults to RAG_CONFIG["embedding_provider"]);
+            "local" picks the ONNX model when present, else hashing
+
+    Returns:
+        EmbeddingProvider instance
+
+    Raises:
+        ValueError: If the provider is unknown or not installed
+    """
+    name = name or RAG_CONFIG.get("embedding_provider", "openai")
+    if name == "local":
+        name = "onnx" if _REGISTRY["onnx"].available() else "hashing"
+    provider = _REGISTRY.get(name)
+    if provider is None:
+        raise ValueError(f"Unknown embedding provider: {name}")
+    if not provider.available():
+        raise ValueError(f"Embedding provider {name!r} is not installed")
+    return provider
@@ -0,0 +1,112 @@
+"""
+Hybrid lexical (BM25) + vector retriever fused with reciprocal-rank fusion
+"""
+import re
+from typing import Any, Dict, List, Optional
+
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+from .bm25_index import tokenize
+
+
+# Quoted text is matched literally
+_QUOTED_RE = re.compile(r'"[^"]+"|“[^”]+”')
+# Codes and versions ("INV-2041", "gpt-4o", "node.js", "c++") and upper-case tickers or acronyms ("AAPL", "AWS")
+_IDENTIFIER_RE = re.compile(r"\w*\d\w*|\w+[_+#.\-/]\S*|\w+[+#]+|[A-Z][A-Z0-9&]+")
+
+
+def _looks_like_identifier(word: str) -> bool:
+    """Check whether a query word is a code, ticker, acronym or version rather than an ordinary word"""
+    return bool(_IDENTIFIER_RE.fullmatch(word.strip("?!,;:()[]'\"")))
+
+
+class HybridRetriever(BaseRetriever):
+    """
+    Retriever over a DocumentIndex that combines BM25 and embedding similarity
+    (or, with hybrid=False, uses embedding similarity only).
+
+    Both rankings are fused with reciprocal-rank fusion, score(d) = sum 1 / (rrf_k + rank).
+    Short identifier queries (codes, tickers, acronyms, quoted text) whose terms
+    all occur in the corpus are answered from BM25 alone, without an embedding
+    call, as long as BM25 finds matches within the filtered chunks. Questions
+    in ordinary words ("what is my current job") are always fused with the
+    vector ranking, however short.
+    With filters (file/page/section), both rankings only score the chunks the
+    index's metadata selects.
+    """
+
+    index: Any
+    k: int = 3
+    fetch_k: int = 10
+    rrf_k: int = 60
+    score_threshold: float = 0.0
+    keyword_max_terms: int = 3
+    hybrid: bool = True
+    filters: Optional[Dict[str, Any]] = None
+
+    def _is_keyword_query(self, query: str) -> bool:
+        if len(tokenize(query)) > self.keyword_max_terms or not self.index.bm25.covers(query):
+            return False
+        # Every word outside quotes that survives tokenization must look like an identifier
+        # (so "what's" or "summarize my resume" never qualify)
+        unquoted = _QUOTED_RE.sub(" ", query).split()
+        return all(_looks_like_identifier(word) for word in unquoted if tokenize(word))
+
+    def _with_duplicate_sources(self, documents: List[Document]) -> List[Document]:
+        """Attach the sources of deduplicated copies so every file containing a passage can be cited"""
+        annotated = []
+        for document in documents:
+            duplicates = self.index.duplicate_sources(document.metadata.get("chunk_id"))
+            if duplicates:
+                sources = [{"source": m.get("source"), "page": m.get("page")} for m in duplicates]
+                document = Document(
+                    page_content=document.page_content,
+                    metadata={**document.metadata, "duplicate_sources": sources},
+                )
+            annotated.append(document)
+        return annotated
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun = None
+    ) -> List[Document]:
+        # Files may be ingesting on a background thread, so the index is only read under its lock;
+        # the query is embedded (a network call for remote providers) without holding it
+        with self.index.lock:
+            candidates = self.index.candidate_ids(**self.filters) if self.filters else None
+            if candidates is not None and not candidates:
+                return []
+            lexical = self.index.bm25.search(query, self.fetch_k, candidates) if self.hybrid else []
+            # Keyword fast path, only when the (scoped) lexical search found something
+            if lexical and self._is_keyword_query(query):
+                return self._with_duplicate_sources([document for _, document, _ in lexical[:self.k]])
+            has_files = bool(self.index.files)
+
+        query_vector = self.index.embeddings.embed_query(query) if has_files else None
+        with self.index.lock:
+            return self._with_duplicate_sources(self._rank(query, query_vector, candidates, lexical))
+
+    def _rank(self, query: str, query_vector, candidates, lexical) -> List[Document]:
+        if query_vector is None:
+            vector_results = []
+        else:
+            k = self.fetch_k if self.hybrid else self.k
+            vector_results = self.index.similarity_search(query, k, candidates, query_vector=query_vector)
+
+        if not self.hybrid:
+            return [document for _, document, score in vector_results if score >= self.score_threshold]
+
+        vector = [(chunk_id, document) for chunk_id, document, score in vector_results if score >= self.score_threshold]
+
+        fused: Dict[str, float] = {}
+        documents: Dict[str, Document] = {}
+        for rank, (chunk_id, document, _) in enumerate(lexical):
+            fused[chunk_id] = fused.get(chunk_id, 0.0) + 1.0 / (self.rrf_k + rank + 1)
+            documents[chunk_id] = document
+        for rank, (chunk_id, document) in enumerate(vector):
+            fused[chunk_id] = fused.get(chunk_id, 0.0) + 1.0 / (self.rrf_k + rank + 1)
+            documents.setdefault(chunk_id, document)
+
+        ranked = sorted(fused, key=fused.get, reverse=True)[:self.k]
+        return [documents[chunk_id] for chunk_id in ranked]
@@ -0,0 +1,169 @@
+"""
+On-disk persistence of a session's document index, linked to the chat session ID
+"""
+import json
+import os
+import re
+import shutil
+import time
+from typing import Optional
+
+import numpy as np
+import streamlit as st
+
+from config.settings import RAG_CONFIG
+from .collection_manager import get_collection_manager
+from .document_index import DocumentIndex
+from .rag_chain import create_rag_chain
+
+
+MANIFEST_FILE = "manifest.json"
+VECTORS_FILE = "vectors.npy"
+CHUNKS_FILE = "chunks.jsonl"
+
+
+def index_path(session_id: str) -> str:
+    """
+    Directory holding the saved index of a chat session
+
+    Args:
+        session_id: Chat session identifier
+
+    Returns:
+        Path under RAG_CONFIG["index_store_dir"]
+    """
+    safe = re.sub(r"[^a-zA-Z0-9_-]", "_", session_id)
+    return os.path.join(RAG_CONFIG["index_store_dir"], safe)
+
+
+def has_saved_index(session_id: str) -> bool:
+    """Check whether a chat session has a saved index"""
+    return os.path.exists(os.path.join(index_path(session_id), MANIFEST_FILE))
+
+
+def save_index(session_id: str, index: DocumentIndex):
+    """
+    Save the chunks and embeddings of an index for a chat session
+
+    Vectors go into one contiguous float32 .npy matrix so they can be memory-mapped
+    on load; chunk text and metadata go into a JSON-lines file in the same row order.
+    The manifest is written last, so a partially written index is never picked up.
+
+    Args:
+        session_id: Chat session identifier
+        index: Index to save
+    """
+    path = index_path(session_id)
+    os.makedirs(path, exist_ok=True)
+
+    files, vectors, row = [], [], 0
+    with open(os.path.join(path, CHUNKS_FILE + ".tmp"), "w", encoding="utf-8") as chunks_file, index.lock:
+        for content_hash, info in index.files.items():
+            data = index.export_file(content_hash)
+            for chunk_id, text, metadata in zip(data["ids"], data["documents"], data["metadatas"]):
+                chunks_file.write(json.dumps({"id": chunk_id, "text": text, "metadata": metadata}) + "\n")
+            # Near-duplicates have no vector of their own; they follow the file's chunks
+            for duplicate in data["duplicates"]:
+                chunks_file.write(json.dumps(duplicate) + "\n")
+            vectors.extend(data["embeddings"])
+            files.append({
+                "name": info["name"],
+                "content_hash": content_hash,
+                "start": row,
+                "count": len(data["ids"]),
+                "duplicates": len(data["duplicates"]),
+            })
+            row += len(data["ids"])
+
+    matrix = np.asarray(vectors, dtype=np.float32).reshape(row, -1)
+    with open(os.path.join(path, VECTORS_FILE + ".tmp"), "wb") as vectors_file:
+        np.save(vectors_file, matrix)
+
+    manifest = {
+        "session_id": session_id,
+        "embedding_provider": index.provider_id,
+        "dimensions": int(matrix.shape[1]) if row else 0,
+        "chunk_count": row,
+        "files": files,
+        "saved_at": time.time(),
+    }
+    with open(os.path.join(path, MANIFEST_FILE + ".tmp"), "w", encoding="utf-8") as manifest_file:
+        json.dump(manifest, manifest_file)
+
+    for name in (CHUNKS_FILE, VECTORS_FILE, MANIFEST_FILE):
+        os.replace(os.path.join(path, name + ".tmp"), os.path.join(path, name))
+
+
+def load_index(session_id: str, index: DocumentIndex) -> int:
+    """
+    Rehydrate a saved index into a DocumentIndex without re-parsing or re-embedding
+
+    Args:
+        session_id: Chat session identifier
+        index: Index to add the saved files to
+
+    Returns:
+        Number of files restored (0 if nothing usable was saved)
+    """
+    path = index_path(session_id)
+    try:
+        with open(os.path.join(path, MANIFEST_FILE), encoding="utf-8") as manifest_file:
+            manifest = json.load(manifest_file)
+    except (OSError, ValueError):
+        return 0
+
+    # Vectors from another embedding provider live in a different space
+    # (indexes saved before providers existed were always built with OpenAI)
+    provider_id = manifest.get("embedding_provider") or f"openai:{manifest.get('embedding_model')}"
+    if provider_id != index.provider_id or not manifest["chunk_count"]:
+        return 0
+
+    vectors = np.load(os.path.join(path, VECTORS_FILE), mmap_mode="r")
+    restored = 0
+    with open(os.path.join(path, CHUNKS_FILE), encoding="utf-8") as chunks_file:
+        for file_info in manifest["files"]:
+            chunks = [json.loads(chunks_file.readline()) for _ in range(file_info["count"])]
+            duplicates = [json.loads(chunks_file.readline()) for _ in range(file_info.get("duplicates", 0))]
+            start = file_info["start"]
+            added = index.add_precomputed(
+                file_info["name"],
+                file_info["content_hash"],
+                [chunk["id"] for chunk in chunks],
+                [chunk["text"] for chunk in chunks],
+                [chunk["metadata"] for chunk in chunks],
+                vectors[start:start + file_info["count"]],
+                duplicates,
+            )
+            restored += int(added)
+    return restored
+
+
+def delete_saved_index(session_id: str):
+    """Remove the saved index of a chat session, if any"""
+    shutil.rmtree(index_path(session_id), ignore_errors=True)
+
+
+def restore_pending_index() -> Optional[int]:
+    """
+    Rehydrate the saved index of a just-loaded chat session on first use
+
+    load_chat_from_cloud only records the session in
+    st.session_state.pending_index_restore; the index is restored the first
+    time documents are actually needed.
+
+    Returns:
+        Number of files restored, or None if no restore was pending
+    """
+    session_id = st.session_state.get("pending_index_restore")
+    if not session_id:
+        return None
+    st.session_state.pending_index_restore = None
+
+    index = get_collection_manager().get_or_create(st.session_state.rag_namespace)
+    st.session_state.document_index = index
+    restored = load_index(session_id, index)
+    if index.files and st.session_state.get("rag_chain") is None:
+        st.session_state.rag_chain = create_rag_chain(index.as_retriever())
+    # The restored state is what is saved for this session now
+    st.session_state.index_saved_for = (session_id, index.version)
+    return restored
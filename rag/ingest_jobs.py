@@ -0,0 +1,313 @@
+"""
+Background document ingestion jobs with per-file progress
+"""
+import hashlib
+import io
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Deque, Dict, List, Optional, Set, Tuple
+
+import streamlit as st
+
+from config.settings import RAG_CONFIG
+
+
+class BufferedUpload(io.BytesIO):
+    """
+    Private buffer over an uploaded file's bytes, so a job never shares a file position with the script thread
+
+    The bytes object itself is immutable and shared (BytesIO only copies on write), so this costs no memory.
+    """
+
+    def __init__(self, name: str, data: bytes):
+        super().__init__(data)
+        self.name = name
+
+
+class IngestJob:
+    """
+    One change to a session's index: files to remove, then files to add.
+
+    Files are indexed one at a time, so each becomes searchable as soon as it
+    is done. Progress is read by the script thread through snapshot().
+    """
+
+    def __init__(self, job_id: str, namespace: str, files: List[Tuple[str, str]], remove_hashes: List[str]):
+        """
+        Args:
+            job_id: Key of the job (see IngestJobManager.job_key)
+            namespace: Session namespace of the index
+            files: (content hash, file name) pairs to add
+            remove_hashes: Content hashes to remove first
+        """
+        self.id = job_id
+        self.namespace = namespace
+        self.remove_hashes = list(remove_hashes)
+        self.status = "queued"
+        self.error: Optional[str] = None
+        self.chunks = 0
+        self.duplicates = 0
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        # content hash -> {"name", "status": queued/indexing/done/failed, "chunks": stored so far, "error"}
+        self.files: "OrderedDict[str, Dict]" = OrderedDict(
+            (content_hash, {"name": name, "status": "queued", "chunks": 0, "error": None})
+            for content_hash, name in files
+        )
+        self._lock = threading.Lock()
+        self._finished = threading.Event()
+
+    @property
+    def done(self) -> bool:
+        """Whether the job has finished (successfully or not)"""
+        return self._finished.is_set()
+
+    def wait(self, timeout: float = None) -> bool:
+        """Block until the job finishes or the timeout expires; returns done"""
+        return self._finished.wait(timeout)
+
+    def _update_file(self, content_hash: str, **changes):
+        with self._lock:
+            self.files[content_hash].update(changes)
+
+    def _finish(self, status: str, error: str = None):
+        with self._lock:
+            self.status = status
+            self.error = error
+            self.finished_at = time.time()
+        self._finished.set()
+
+    def snapshot(self) -> Dict:
+        """
+        Consistent copy of the job's progress
+
+        Returns:
+            Dictionary with status, error, chunk/duplicate counts, per-file
+            entries and the number of finished files
+        """
+        with self._lock:
+            files = [dict(info, content_hash=content_hash) for content_hash, info in self.files.items()]
+            return {
+                "id": self.id,
+                "status": self.status,
+                "error": self.error,
+                "chunks": self.chunks,
+                "duplicates": self.duplicates,
+                "files": files,
+                "finished_files": sum(1 for info in files if info["status"] in ("done", "failed")),
+                "total_files": len(files),
+            }
+
+
+class IngestJobManager:
+    """
+    Runs ingestion jobs for all sessions on a shared worker pool.
+
+    Jobs are keyed by session namespace plus the hash of the file set they
+    change, so a Streamlit rerun that finds the same upload delta gets the
+    running (or finished) job back instead of starting the work over. Jobs of
+    one session run one after another, in submission order: only a session's
+    current job is on the pool, and the next one is submitted when it finishes,
+    so a session with many queued jobs never occupies more than one worker.
+    """
+
+    def __init__(self, max_workers: int = 2, ttl_seconds: float = 3600):
+        """
+        Args:
+            max_workers: Jobs running at once (across sessions)
+            ttl_seconds: How long finished jobs are kept for status lookups
+        """
+        self.ttl_seconds = ttl_seconds
+        self._pool = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="ingest")
+        self._jobs: Dict[str, IngestJob] = {}
+        # namespace -> jobs waiting behind the session's current job (present while one is on the pool)
+        self._queues: Dict[str, Deque[Tuple]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def job_key(namespace: str, add_hashes, remove_hashes) -> str:
+        """
+        Identify a change to a session's index
+
+        Args:
+            namespace: Session namespace
+            add_hashes: Content hashes of the files to add
+            remove_hashes: Content hashes of the files to remove
+
+        Returns:
+            Hex digest of the namespace and both (sorted) file sets
+        """
+        digest = hashlib.sha256(namespace.encode("utf-8"))
+        for marker, hashes in (("+", add_hashes), ("-", remove_hashes)):
+            for content_hash in sorted(hashes):
+                digest.update(f"{marker}{content_hash}".encode("ascii"))
+        return digest.hexdigest()[:32]
+
+    def submit(self, namespace: str, index, uploads: List[Tuple[str, object]],
+               remove_hashes: List[str] = ()) -> IngestJob:
+        """
+        Start (or find) the job that brings an index to a new file set
+
+        Args:
+            namespace: Session namespace of the index
+            index: DocumentIndex to change
+            uploads: (content hash, uploaded file) pairs to add
+            remove_hashes: Content hashes to remove before adding
+
+        Returns:
+            The new job, or the existing job with the same key
+        """
+        key = self.job_key(namespace, [content_hash for content_hash, _ in uploads], remove_hashes)
+        with self._lock:
+            self._prune()
+            job = self._jobs.get(key)
+            if job is not None and (not job.done or self._still_applied(job, index)):
+                return job
+            job = IngestJob(key, namespace, [(content_hash, f.name) for content_hash, f in uploads], remove_hashes)
+            self._jobs[key] = job
+
+        # Own buffers now: the script thread keeps reading and seeking its UploadedFile objects
+        copies = [(content_hash, BufferedUpload(f.name, f.getvalue())) for content_hash, f in uploads]
+        with self._lock:
+            queue = self._queues.get(namespace)
+            if queue is not None:
+                queue.append((job, index, copies))
+            else:
+                self._queues[namespace] = deque()
+                self._pool.submit(self._run, job, index, copies)
+        return job
+
+    def get(self, job_id: str) -> Optional[IngestJob]:
+        """Look up a job by id"""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def active(self, namespace: str) -> List[IngestJob]:
+        """Unfinished jobs of a session, oldest first"""
+        with self._lock:
+            jobs = [job for job in self._jobs.values() if job.namespace == namespace and not job.done]
+        return sorted(jobs, key=lambda job: job.created_at)
+
+    def tracked_hashes(self, namespace: str) -> Set[str]:
+        """
+        Files a session should not submit again
+
+        Returns:
+            Content hashes still queued or indexing in unfinished jobs, plus
+            those that failed in kept jobs (until the job is forgotten)
+        """
+        tracked = set()
+        with self._lock:
+            jobs = [job for job in self._jobs.values() if job.namespace == namespace]
+        for job in jobs:
+            with job._lock:
+                for content_hash, info in job.files.items():
+                    if not job.done or info["status"] == "failed":
+                        tracked.add(content_hash)
+        return tracked
+
+    def forget(self, job_id: str):
+        """Drop a finished job, so the same change can be submitted again (e.g. to retry)"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None and job.done:
+                del self._jobs[job_id]
+
+    @staticmethod
+    def _still_applied(job: IngestJob, index) -> bool:
+        """
+        Whether the index still reflects a finished job
+
+        A file that failed is not retried, but a change that was undone since
+        (a file removed and uploaded again) needs a new job.
+        """
+        with job._lock:
+            added = all(info["status"] == "failed" or index.has_file(content_hash)
+                        for content_hash, info in job.files.items())
+        return added and not any(index.has_file(content_hash) for content_hash in job.remove_hashes)
+
+    def _prune(self):
+        """Drop finished jobs older than the TTL (caller holds the lock)"""
+        cutoff = time.time() - self.ttl_seconds
+        for job_id, job in list(self._jobs.items()):
+            if job.done and job.finished_at < cutoff:
+                del self._jobs[job_id]
+
+    def _submit_next(self, namespace: str):
+        """Put the session's next queued job on the pool, or mark the session idle"""
+        with self._lock:
+            queue = self._queues[namespace]
+            if not queue:
+                del self._queues[namespace]
+                return
+            self._pool.submit(self._run, *queue.popleft())
+
+    def _run(self, job: IngestJob, index, copies: List[Tuple[str, BufferedUpload]]):
+        try:
+            self._apply(job, index, copies)
+        finally:
+            self._submit_next(job.namespace)
+
+    @staticmethod
+    def _apply(job: IngestJob, index, copies: List[Tuple[str, BufferedUpload]]):
+        """Remove and add the job's files, recording per-file progress"""
+        with job._lock:
+            job.status = "running"
+        try:
+            index.remove_files(job.remove_hashes)
+            for content_hash, upload in copies:
+                if index.has_file(content_hash):
+                    # Indexed meanwhile by an earlier job of this session
+                    job._update_file(content_hash, status="done")
+                    continue
+
+                job._update_file(content_hash, status="indexing")
+                try:
+                    index.add_files([upload], progress=lambda _, stored, h=content_hash: job._update_file(h, chunks=stored))
+                except Exception as e:
+                    # Never leave half a file behind
+                    index.remove_files([content_hash])
+                    job._update_file(content_hash, status="failed", error=str(e))
+                    continue
+
+                ingest = index.last_ingest
+                with job._lock:
+                    job.chunks += ingest["chunks"]
+                    job.duplicates += ingest["duplicates"]
+                if index.has_file(content_hash):
+                    job._update_file(content_hash, status="done")
+                else:
+                    error = ingest["errors"].get(upload.name, "no text could be extracted")
+                    job._update_file(content_hash, status="failed", error=error)
+        except Exception as e:
+            job._finish("failed", str(e))
+            return
+        job._finish("done")
+
+
+@st.cache_resource
+def get_ingest_manager() -> IngestJobManager:
+    """Return the process-wide ingestion job manager"""
+    return IngestJobManager(
+        max_workers=RAG_CONFIG["ingest_workers"],
+        ttl_seconds=RAG_CONFIG["ingest_job_ttl_seconds"],
+    )
+
+
+def describe_pending(namespace: str) -> str:
+    """
+    Summarise a session's unfinished ingestion, for answers given meanwhile
+
+    Returns:
+        Text such as "report.pdf (120 chunks so far), notes.txt", or "" when nothing is pending
+    """
+    pending = []
+    for job in get_ingest_manager().active(namespace):
+        for info in job.snapshot()["files"]:
+            if info["status"] == "indexing":
+                pending.append(f"{info['name']} ({info['chunks']} chunks so far)")
+            elif info["status"] == "queued":
+                pending.append(info["name"])
+    return ", ".join(pending)
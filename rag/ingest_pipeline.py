@@ -0,0 +1,116 @@
+"""
+Streaming ingestion pipeline: load pages -> split -> batch, with bounded queues between stages
+"""
+import queue
+import threading
+from typing import BinaryIO, Iterable, Iterator, List, Tuple
+
+from config.settings import RAG_CONFIG
+from .parallel_loader import iter_loaded_pages
+
+
+_DONE = object()
+
+
+class _StageError:
+    """Carries an exception raised inside a stage thread over to the consumer"""
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+def bounded(iterable: Iterable, maxsize: int) -> Iterator:
+    """
+    Run an iterable on a background thread and hand items over through a bounded queue
+
+    The producer blocks once maxsize items are waiting, so a slow downstream
+    stage caps how much upstream data is held in memory.
+
+    Args:
+        iterable: Upstream stage
+        maxsize: Queue capacity
+
+    Yields:
+        Items of the upstream stage in order
+    """
+    items = queue.Queue(maxsize=maxsize)
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in iterable:
+                if not put(item):
+                    return
+            put(_DONE)
+        except BaseException as e:
+            put(_StageError(e))
+
+    producer = threading.Thread(target=produce, name="ingest-stage", daemon=True)
+    producer.start()
+    try:
+        while True:
+            item = items.get()
+            if item is _DONE:
+                return
+            if isinstance(item, _StageError):
+                raise item.error
+            yield item
+    finally:
+        stop.set()
+
+
+def iter_chunks(pages: Iterable, text_splitter) -> Iterator:
+    """
+    Split pages into chunks one page at a time
+
+    Yields:
+        (file position, chunk, None) or the loader's (file position, None, error) unchanged
+    """
+    for position, page, error in pages:
+        if error is not None:
+            yield position, None, error
+            continue
+        for chunk in text_splitter.split_documents([page]):
+            yield position, chunk, None
+
+
+def iter_batches(items: Iterable, batch_size: int) -> Iterator[List]:
+    """Group consecutive items into lists of at most batch_size"""
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def stream_chunk_batches(files: List[Tuple[str, BinaryIO]], text_splitter) -> Iterator[List]:
+    """
+    Stream the chunks of several files as embedding-sized batches
+
+    Loading and splitting each run on their own thread behind a queue of
+    RAG_CONFIG["ingest_queue_size"] items, so at most a few pages and batches
+    are in memory regardless of document size.
+
+    Args:
+        files: List of (file_name, binary buffer) pairs
+        text_splitter: Splitter applied page by page
+
+    Yields:
+        Lists of (file position, chunk or None, error or None) tuples
+    """
+    queue_size = RAG_CONFIG["ingest_queue_size"]
+    pages = bounded(iter_loaded_pages(files), queue_size)
+    chunks = bounded(iter_chunks(pages, text_splitter), queue_size)
+    return iter_batches(chunks, RAG_CONFIG["embed_batch_size"])
@@ -0,0 +1,330 @@
+"""
+Registry of document text-extraction backends, selectable per file type
+"""
+import codecs
+import importlib.util
+import os
+import tempfile
+import zipfile
+from abc import ABC, abstractmethod
+from typing import BinaryIO, Dict, Iterator, List, Union
+from xml.etree import ElementTree
+
+from langchain_core.documents import Document
+
+from config.settings import RAG_CONFIG
+
+
+# Backend preference per file type for each loader profile; the first installed backend wins
+LOADER_PROFILES = {
+    "fast": {
+        "pdf": ["pymupdf", "pdfium", "pypdf"],
+        "docx": ["docx-xml", "python-docx"],
+        "txt": ["text"],
+        "doc": ["unstructured"],
+    },
+    "accurate": {
+        "pdf": ["pypdf", "pymupdf", "pdfium"],
+        "docx": ["python-docx", "docx-xml"],
+        "txt": ["text"],
+        "doc": ["unstructured"],
+    },
+}
+
+PdfSource = Union[str, BinaryIO]
+
+
+class LoaderBackend(ABC):
+    """
+    A way of extracting text from one or more file types.
+
+    Subclasses declare the modules they need in `requires`, so a backend whose
+    library is not installed is simply skipped, and describe themselves in
+    `profile` (relative speed and notable features) for the settings UI and
+    the loader benchmark.
+    """
+
+    name = ""
+    file_types = ()
+    requires = ()
+    profile: Dict[str, str] = {}
+
+    def available(self) -> bool:
+        """Check whether the backend's libraries are installed"""
+        try:
+            return all(importlib.util.find_spec(module) is not None for module in self.requires)
+        except (ImportError, ValueError):
+            return False
+
+    @abstractmethod
+    def iter_pages(self, stream: BinaryIO, file_name: str) -> Iterator[Document]:
+        """
+        Lazily yield the pages of an in-memory document
+
+        Args:
+            stream: Seekable binary buffer positioned at the start of the file
+            file_name: Original file name, recorded as the page source
+
+        Yields:
+            One document per page (PDF) or per file (other types)
+        """
+
+
+class PdfBackend(LoaderBackend):
+    """PDF backend: subclasses open a document and extract one page's text"""
+
+    file_types = ("pdf",)
+
+    @abstractmethod
+    def open(self, source: PdfSource):
+        """Open a PDF given as a path or binary buffer"""
+
+    @abstractmethod
+    def count(self, document) -> int:
+        """Number of pages in an opened document"""
+
+    @abstractmethod
+    def page_text(self, document, page: int) -> str:
+        """Text of one page (0-based) of an opened document"""
+
+    def page_count(self, source: PdfSource) -> int:
+        """Number of pages in a PDF given as a path or binary buffer"""
+        return self.count(self.open(source))
+
+    def load_range(self, source: PdfSource, file_name: str, start: int, end: int) -> List[Document]:
+        """
+        Extract a range of pages
+
+        Args:
+            source: Path or binary buffer of the PDF
+            file_name: Original file name, recorded as the page source
+            start: First page (0-based)
+            end: Page after the last one
+
+        Returns:
+            One document per page, with source and page metadata
+        """
+        document = self.open(source)
+        return [
+            Document(page_content=self.page_text(document, page), metadata={"source": file_name, "page": page})
+            for page in range(start, end)
+        ]
+
+    def iter_pages(self, stream, file_name):
+        document = self.open(stream)
+        for page in range(self.count(document)):
+            yield Document(page_content=self.page_text(document, page), metadata={"source": file_name, "page": page})
+
+
+class PyPdfBackend(PdfBackend):
+    name = "pypdf"
+    requires = ("pypdf",)
+    profile = {"speed": "slow", "features": "pure Python, no native dependencies"}
+
+    def open(self, source):
+        from pypdf import PdfReader
+
+        return PdfReader(source)
+
+    def count(self, document):
+        return len(document.pages)
+
+    def page_text(self, document, page):
+        return document.pages[page].extract_text()
+
+
+class PyMuPdfBackend(PdfBackend):
+    name = "pymupdf"
+    requires = ("fitz",)
+    profile = {"speed": "fastest", "features": "MuPDF engine, good reading order (AGPL)"}
+
+    def open(self, source):
+        import fitz
+
+        if isinstance(source, str):
+            return fitz.open(source)
+        source.seek(0)
+        return fitz.open(stream=source.read(), filetype="pdf")
+
+    def count(self, document):
+        return document.page_count
+
+    def page_text(self, document, page):
+        return document.load_page(page).get_text()
+
+
+class PdfiumBackend(PdfBackend):
+    name = "pdfium"
+    requires = ("pypdfium2",)
+    profile = {"speed": "fast", "features": "PDFium engine (Chrome's), permissive license"}
+
+    def open(self, source):
+        import pypdfium2
+
+        if not isinstance(source, str):
+            source.seek(0)
+            source = source.read()
+        return pypdfium2.PdfDocument(source)
+
+    def count(self, document):
+        return len(document)
+
+    def page_text(self, document, page):
+        text_page = document[page].get_textpage()
+        try:
+            return text_page.get_text_range()
+        finally:
+            text_page.close()
+
+
+def decode_text(data: bytes) -> str:
+    """
+    Decode a text file of unknown encoding
+
+    A byte-order mark wins, then strict UTF-8; otherwise the encoding is
+    sniffed with charset_normalizer when installed, falling back to cp1252.
+    """
+    for bom, encoding in (
+        (codecs.BOM_UTF8, "utf-8-sig"),
+        (codecs.BOM_UTF32_LE, "utf-32"),
+        (codecs.BOM_UTF32_BE, "utf-32"),
+        (codecs.BOM_UTF16_LE, "utf-16"),
+        (codecs.BOM_UTF16_BE, "utf-16"),
+    ):
+        if data.startswith(bom):
+            return data.decode(encoding, errors="replace")
+    try:
+        return data.decode("utf-8")
+    except UnicodeDecodeError:
+        pass
+    try:
+        from charset_normalizer import from_bytes
+
+        # A prefix is enough to identify the encoding
+        match = from_bytes(data[:16384]).best()
+        if match is not None:
+            return data.decode(match.encoding, errors="replace")
+    except ImportError:
+        pass
+    return data.decode("cp1252", errors="replace")
+
+
+class TextBackend(LoaderBackend):
+    name = "text"
+    file_types = ("txt",)
+    profile = {"speed": "fastest", "features": "BOM and charset sniffing"}
+
+    def iter_pages(self, stream, file_name):
+        yield Document(page_content=decode_text(stream.read()), metadata={"source": file_name})
+
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+
+class DocxXmlBackend(LoaderBackend):
+    name = "docx-xml"
+    file_types = ("docx",)
+    profile = {"speed": "fastest", "features": "reads document.xml directly; includes table text"}
+
+    def iter_pages(self, stream, file_name):
+        with zipfile.ZipFile(stream) as archive:
+            root = ElementTree.fromstring(archive.read("word/document.xml"))
+
+        paragraphs = []
+        for paragraph in root.iter(_W + "p"):
+            parts = []
+            for node in paragraph.iter():
+                if node.tag == _W + "t":
+                    parts.append(node.text or "")
+                elif node.tag == _W + "tab":
+                    parts.append("\t")
+                elif node.tag in (_W + "br", _W + "cr"):
+                    parts.append("\n")
+            text = "".join(parts)
+            if text.strip():
+                paragraphs.append(text)
+        yield Document(page_content="\n\n".join(paragraphs), metadata={"source": file_name})
+
+
+class PythonDocxBackend(LoaderBackend):
+    name = "python-docx"
+    file_types = ("docx",)
+    requires = ("docx",)
+    profile = {"speed": "fast", "features": "python-docx body paragraphs (no tables)"}
+
+    def iter_pages(self, stream, file_name):
+        import docx
+
+        paragraphs = (paragraph.text for paragraph in docx.Document(stream).paragraphs)
+        yield Document(
+            page_content="\n\n".join(text for text in paragraphs if text.strip()),
+            metadata={"source": file_name},
+        )
+
+
+class UnstructuredBackend(LoaderBackend):
+    name = "unstructured"
+    file_types = ("doc", "docx")
+    requires = ("unstructured",)
+    profile = {"speed": "slow", "features": "handles legacy .doc; needs the unstructured stack"}
+
+    def iter_pages(self, stream, file_name):
+        from langchain_community.document_loaders import UnstructuredWordDocumentLoader
+
+        suffix = os.path.splitext(file_name)[1] or ".doc"
+        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_file:
+            tmp_file.write(stream.read())
+            tmp_file_path = tmp_file.name
+        try:
+            for document in UnstructuredWordDocumentLoader(tmp_file_path).load():
+                document.metadata["source"] = file_name
+                yield document
+        finally:
+            os.unlink(tmp_file_path)
+
+
+_REGISTRY: Dict[str, LoaderBackend] = {}
+
+
+def register_backend(backend: LoaderBackend):
+    """Add a backend to the registry (replacing one with the same name)"""
+    _REGISTRY[backend.name] = backend
+
+
+for _backend in (PyPdfBackend(), PyMuPdfBackend(), PdfiumBackend(), TextBackend(),
+                 DocxXmlBackend(), PythonDocxBackend(), UnstructuredBackend()):
+    register_backend(_backend)
+
+
+def list_backends(file_type: str = None) -> List[LoaderBackend]:
+    """Registered backends, optionally only those handling a file type"""
+    return [backend for backend in _REGISTRY.values() if file_type is None or file_type in backend.file_types]
+
+
+def get_backend(file_type: str, name: str = None) -> LoaderBackend:
+    """
+    Pick the extraction backend for a file type
+
+    An explicit name, then RAG_CONFIG["loader_backends"][file_type], then the
+    preference order of RAG_CONFIG["loader_profile"] is used; the first
+    installed backend wins.
+
+    Args:
+        file_type: File extension (pdf, txt, docx, doc)
+        name: Backend name to force
+
+    Returns:
+        LoaderBackend instance
+
+    Raises:
+        ValueError: If no installed backend handles the file type
+    """
+    override = name or RAG_CONFIG.get("loader_backends", {}).get(file_type)
+    profile = LOADER_PROFILES.get(RAG_CONFIG.get("loader_profile", "fast"), LOADER_PROFILES["fast"])
+    candidates = ([override] if override else []) + profile.get(file_type, [])
+
+    for candidate in candidates:
+        backend = _REGISTRY.get(candidate)
+        if backend is not None and file_type in backend.file_types and backend.available():
+            return backend
+    raise ValueError(f"No installed loader backend for .{file_type} files")
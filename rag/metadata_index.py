@@ -0,0 +1,220 @@
+"""
+Metadata index over the uploaded files: file, page and section of every chunk
+"""
+import re
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+_MARKDOWN_HEADING = re.compile(r"^#{1,6}\s+(.+?)\s*#*$")
+_NUMBERED_HEADING = re.compile(r"^(?:\d+(?:\.\d+)*\.?|[IVX]+\.)\s+([A-Z].{0,70})$")
+_WORD = re.compile(r"\w+")
+
+# Joins the headings of a chunk that spans several sections in its "section" metadata
+SECTION_SEPARATOR = " | "
+
+
+def _is_heading_line(line: str) -> bool:
+    """Short, unpunctuated, all-caps or title-case line (e.g. "EXPERIENCE", "Payment Terms")"""
+    words = line.split()
+    if not words or len(words) > 8 or len(line) > 60 or line[-1] in ".,;!?":
+        return False
+    if not any(c.isalpha() for c in line):
+        return False
+    if line.isupper():
+        return True
+    # Short connecting words may stay lowercase ("Terms of Service")
+    return all(word[0].isupper() or not word[0].isalpha() or len(word) <= 3 for word in words) and words[0][0].isupper()
+
+
+def find_headings(text: str) -> List[Tuple[int, str]]:
+    """
+    Find the section headings of a chunk
+
+    Args:
+        text: Chunk text
+
+    Returns:
+        (line number among non-empty lines, heading title) pairs in order
+    """
+    headings = []
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    for number, line in enumerate(lines):
+        match = _MARKDOWN_HEADING.match(line) or _NUMBERED_HEADING.match(line)
+        if match:
+            title = match.group(1)
+        elif _is_heading_line(line.rstrip(":")):
+            title = line
+        else:
+            continue
+        title = title.rstrip(":").strip()
+        if title:
+            headings.append((number, title))
+    return headings
+
+
+def assign_section(text: str, current: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Decide which sections a chunk belongs to, given the section in force before it
+
+    Args:
+        text: Chunk text
+        current: Section in force at the end of the previous chunk of the same file (None at the start)
+
+    Returns:
+        (SECTION_SEPARATOR-joined sections of this chunk or None, section in force after it)
+    """
+    headings = find_headings(text)
+    if not headings:
+        return current, current
+    # Text before the first heading continues the previous section
+    covered = [current] if headings[0][0] > 0 and current else []
+    for _, title in headings:
+        if title not in covered:
+            covered.append(title)
+    return SECTION_SEPARATOR.join(covered), headings[-1][1]
+
+
+class MetadataIndex:
+    """
+    Inverted index from file, page and section to chunk ids.
+
+    Lets retrieval be scoped ("the contract", "page 3 of the report", "the
+    education section") by selecting candidate chunk ids before any BM25 or
+    vector scoring, and summarises the uploaded files for the agent prompt
+    without touching chunk text.
+    """
+
+    def __init__(self):
+        # chunk id -> (content hash, page or None, section titles)
+        self._chunks: Dict[str, Tuple[str, Optional[int], List[str]]] = {}
+        # content hash -> {"name", "chunk_ids": set, "pages": {page: ids}, "sections": {title: ids}}
+        self._files: Dict[str, Dict] = {}
+
+    def __len__(self) -> int:
+        return len(self._chunks)
+
+    def add(self, chunk_id: str, metadata: Dict):
+        """
+        Record a chunk's file, page and section
+
+        Args:
+            chunk_id: Chunk id
+            metadata: Chunk metadata with content_hash, source and optional page/section
+        """
+        if chunk_id in self._chunks:
+            return
+        content_hash = metadata["content_hash"]
+        page = metadata.get("page")
+        page = int(page) if page is not None else None
+        sections = metadata.get("section")
+        sections = sections.split(SECTION_SEPARATOR) if sections else []
+
+        info = self._files.setdefault(
+            content_hash, {"name": metadata.get("source", ""), "chunk_ids": set(), "pages": {}, "sections": {}}
+        )
+        info["chunk_ids"].add(chunk_id)
+        if page is not None:
+            info["pages"].setdefault(page, set()).add(chunk_id)
+        for section in sections:
+            info["sections"].setdefault(section, set()).add(chunk_id)
+        self._chunks[chunk_id] = (content_hash, page, sections)
+
+    def remove(self, chunk_ids: Iterable[str]):
+        """Forget chunks (unknown ids are ignored)"""
+        for chunk_id in chunk_ids:
+            entry = self._chunks.pop(chunk_id, None)
+            if entry is None:
+                continue
+            content_hash, page, sections = entry
+            info = self._files[content_hash]
+            info["chunk_ids"].discard(chunk_id)
+            for key, groups in [(page, info["pages"])] + [(section, info["sections"]) for section in sections]:
+                if key in groups:
+                    groups[key].discard(chunk_id)
+                    if not groups[key]:
+                        del groups[key]
+            if not info["chunk_ids"]:
+                del self._files[content_hash]
+
+    def clear(self):
+        """Forget every chunk"""
+        self._chunks.clear()
+        self._files.clear()
+
+    def match_files(self, name: str) -> List[str]:
+        """
+        Resolve a loose file reference ("contract", "Report.pdf") to indexed files
+
+        An exact file name wins, then names containing the reference, then
+        names containing all of its words.
+
+        Returns:
+            Content hashes of the matching files
+        """
+        wanted = name.strip().lower()
+        names = {content_hash: info["name"].lower() for content_hash, info in self._files.items()}
+        exact = [content_hash for content_hash, file_name in names.items() if file_name == wanted]
+        if exact:
+            return exact
+        contained = [content_hash for content_hash, file_name in names.items() if wanted in file_name]
+        if contained:
+            return contained
+        words = set(_WORD.findall(wanted))
+        return [
+            content_hash for content_hash, file_name in names.items()
+            if words and words <= set(_WORD.findall(file_name.replace("_", " ")))
+        ]
+
+    def select(self, file: str = None, page: int = None, section: str = None) -> Optional[Set[str]]:
+        """
+        Chunk ids matching every given filter
+
+        Args:
+            file: File name or part of it
+            page: Page number, 1-based as users count pages
+            section: Text contained in the section heading (case-insensitive)
+
+        Returns:
+            Set of chunk ids (possibly empty), or None when no filter is given
+        """
+        if file is None and page is None and section is None:
+            return None
+
+        selected: Set[str] = set()
+        for content_hash in self.match_files(file) if file else list(self._files):
+            info = self._files[content_hash]
+            ids = info["pages"].get(page - 1, set()) if page is not None else info["chunk_ids"]
+            if section:
+                wanted = section.strip().lower()
+                in_section = set()
+                for title, section_ids in info["sections"].items():
+                    if wanted in title.lower():
+                        in_section |= section_ids
+                ids = ids & in_section
+            selected |= ids
+        return selected
+
+    def describe(self, max_sections: int = 6) -> str:
+        """
+        One line per indexed file with its page count and section headings, for the agent prompt
+
+        Args:
+            max_sections: Headings listed per file before the rest are counted
+
+        Returns:
+            Bullet list of the files (empty string when nothing is indexed)
+        """
+        lines = []
+        for info in self._files.values():
+            details = []
+            if info["pages"]:
+                pages = max(info["pages"]) + 1
+                details.append(f"{pages} page" + ("s" if pages != 1 else ""))
+            sections = list(info["sections"])
+            if sections:
+                listed = ", ".join(sections[:max_sections])
+                if len(sections) > max_sections:
+                    listed += f", +{len(sections) - max_sections} more"
+                details.append(f"sections: {listed}")
+            lines.append(f"- {info['name']}" + (f" ({'; '.join(details)})" if details else ""))
+        return "\n".join(lines)
@@ -0,0 +1,244 @@
+"""
+NumPy vector store: contiguous (optionally quantized) matrix with flat or IVF cosine search
+"""
+from typing import Dict, List, Optional
+
+import numpy as np
+from langchain_core.documents import Document
+
+from .vector_store import VectorStore, normalize_rows
+
+
+_DTYPES = {"float32": np.float32, "float16": np.float16, "int8": np.int8}
+
+
+class NumpyVectorStore(VectorStore):
+    """
+    Vectors live in one contiguous row-major matrix of unit-length rows, so
+    cosine similarity is a single matrix-vector product followed by an
+    argpartition top-k.
+
+    dtype "float16" halves memory; "int8" quarters it using a per-row scale.
+    With ivf=True, once the store holds ivf_min_vectors rows a spherical
+    k-means coarse quantizer (about sqrt(n) lists) is trained, and queries
+    only score the rows of the nprobe closest lists. The quantizer is
+    retrained whenever the store has doubled since the last training.
+    Deleted rows are tombstoned and compacted away once they exceed a quarter
+    of the matrix.
+    """
+
+    def __init__(self, dtype: str = "float32", ivf: bool = False, ivf_min_vectors: int = 4096, nprobe: int = 8):
+        """
+        Args:
+            dtype: Storage type of the vectors ("float32", "float16" or "int8")
+            ivf: Enable the IVF coarse quantizer for larger stores
+            ivf_min_vectors: Store size at which the quantizer is first trained
+            nprobe: Number of inverted lists scanned per query
+        """
+        if dtype not in _DTYPES:
+            raise ValueError(f"Unsupported vector dtype: {dtype}")
+        self.dtype = dtype
+        self.ivf = ivf
+        self.ivf_min_vectors = ivf_min_vectors
+        self.nprobe = nprobe
+
+        self._matrix: Optional[np.ndarray] = None
+        self._scales: Optional[np.ndarray] = None
+        self._alive = np.zeros(0, dtype=bool)
+        self._size = 0
+        self._deleted = 0
+        self._ids: List[Optional[str]] = []
+        self._texts: List[Optional[str]] = []
+        self._metadatas: List[Optional[Dict]] = []
+        self._rows: Dict[str, int] = {}
+
+        self._centroids: Optional[np.ndarray] = None
+        self._lists = np.zeros(0, dtype=np.int32)
+        self._trained_size = 0
+
+    def __len__(self) -> int:
+        return self._size - self._deleted
+
+    # ----- storage -----
+
+    def _reserve(self, extra: int, dimensions: int):
+        needed = self._size + extra
+        capacity = 0 if self._matrix is None else self._matrix.shape[0]
+        if needed <= capacity:
+            return
+        new_capacity = max(needed, capacity * 2, 64)
+        matrix = np.zeros((new_capacity, dimensions), dtype=_DTYPES[self.dtype])
+        scales = np.ones(new_capacity, dtype=np.float32)
+        alive = np.zeros(new_capacity, dtype=bool)
+        lists = np.full(new_capacity, -1, dtype=np.int32)
+        if self._matrix is not None:
+            matrix[:self._size] = self._matrix[:self._size]
+            scales[:self._size] = self._scales[:self._size]
+            alive[:self._size] = self._alive[:self._size]
+            lists[:self._size] = self._lists[:self._size]
+        self._matrix, self._scales, self._alive, self._lists = matrix, scales, alive, lists
+
+    def _encode(self, unit_rows: np.ndarray):
+        """Convert unit-length float32 rows to the storage type (with per-row scales for int8)"""
+        if self.dtype == "int8":
+            scales = np.abs(unit_rows).max(axis=1) / 127.0
+            scales[scales == 0] = 1.0
+            return np.round(unit_rows / scales[:, None]).astype(np.int8), scales.astype(np.float32)
+        return unit_rows.astype(_DTYPES[self.dtype]), np.ones(len(unit_rows), dtype=np.float32)
+
+    def _decode(self, rows: np.ndarray) -> np.ndarray:
+        """Read stored rows back as float32"""
+        values = self._matrix[rows].astype(np.float32)
+        if self.dtype == "int8":
+            values *= self._scales[rows][:, None]
+        return values
+
+    def add(self, ids, vectors, texts, metadatas):
+        if not ids:
+            return
+        # Upsert semantics: replace existing chunks with the same id
+        self.delete([chunk_id for chunk_id in ids if chunk_id in self._rows])
+
+        unit_rows = normalize_rows(vectors)
+        self._reserve(len(ids), unit_rows.shape[1])
+        encoded, scales = self._encode(unit_rows)
+
+        start, end = self._size, self._size + len(ids)
+        self._matrix[start:end] = encoded
+        self._scales[start:end] = scales
+        self._alive[start:end] = True
+        for offset, chunk_id in enumerate(ids):
+            self._rows[chunk_id] = start + offset
+        self._ids.extend(ids)
+        self._texts.extend(texts)
+        self._metadatas.extend(metadatas)
+        self._size = end
+
+        if self.ivf:
+            if len(self) >= self.ivf_min_vectors and len(self) >= 2 * self._trained_size:
+                self._train_ivf()
+            elif self._centroids is not None:
+                self._lists[start:end] = np.argmax(unit_rows @ self._centroids.T, axis=1)
+
+    def delete(self, ids):
+        for chunk_id in ids:
+            row = self._rows.pop(chunk_id, None)
+            if row is None:
+                continue
+            self._alive[row] = False
+            self._ids[row] = self._texts[row] = self._metadatas[row] = None
+            self._deleted += 1
+
+        if self._deleted > 64 and self._deleted > self._size // 4:
+            self._compact()
+
+    def _compact(self):
+        keep = np.nonzero(self._alive[:self._size])[0]
+        self._matrix = self._matrix[keep].copy()
+        self._scales = self._scales[keep].copy()
+        self._lists = self._lists[keep].copy()
+        self._alive = np.ones(len(keep), dtype=bool)
+        self._ids = [self._ids[row] for row in keep]
+        self._texts = [self._texts[row] for row in keep]
+        self._metadatas = [self._metadatas[row] for row in keep]
+        self._rows = {chunk_id: row for row, chunk_id in enumerate(self._ids)}
+        self._size = len(keep)
+        self._deleted = 0
+
+    def drop(self):
+        self.__init__(self.dtype, self.ivf, self.ivf_min_vectors, self.nprobe)
+
+    @property
+    def nbytes(self) -> int:
+        if self._matrix is None:
+            return 0
+        return self._matrix.nbytes + self._scales.nbytes
+
+    # ----- IVF coarse quantizer -----
+
+    def _train_ivf(self, iterations: int = 10, sample_size: int = 20000):
+        """Spherical k-means over (a sample of) the live rows, then assign every row to a list"""
+        rows = np.nonzero(self._alive[:self._size])[0]
+        rng = np.random.default_rng(0)
+        sample = rows if len(rows) <= sample_size else rng.choice(rows, sample_size, replace=False)
+        data = self._decode(sample)
+
+        n_lists = max(1, int(np.sqrt(len(rows))))
+        centroids = data[rng.choice(len(data), n_lists, replace=False)]
+        for _ in range(iterations):
+            assignment = np.argmax(data @ centroids.T, axis=1)
+            # Per-list sums via one sort + reduceat (much faster than np.add.at)
+            order = np.argsort(assignment, kind="stable")
+            counts = np.bincount(assignment, minlength=n_lists)
+            occupied = np.nonzero(counts)[0]
+            starts = np.concatenate(([0], np.cumsum(counts)[:-1]))[occupied]
+            sums = centroids.copy()
+            sums[occupied] = np.add.reduceat(data[order], starts, axis=0)
+            centroids = normalize_rows(sums)
+
+        self._centroids = centroids
+        for start in range(0, len(rows), 8192):
+            block = rows[start:start + 8192]
+            self._lists[block] = np.argmax(self._decode(block) @ centroids.T, axis=1)
+        self._trained_size = len(rows)
+
+    # ----- queries -----
+
+    def search(self, query_vector, k, candidate_ids=None):
+        if not len(self) or k <= 0:
+            return []
+        query = normalize_rows(query_vector)[0]
+
+        if candidate_ids is not None:
+            rows = np.fromiter((self._rows[c] for c in candidate_ids if c in self._rows), dtype=np.int64)
+        elif self._centroids is not None:
+            probes = np.argsort(-(self._centroids @ query))[:self.nprobe]
+            rows = np.nonzero(np.isin(self._lists[:self._size], probes) & self._alive[:self._size])[0]
+        else:
+            rows = None
+
+        if rows is None:
+            matrix, scales = self._matrix[:self._size], self._scales[:self._size]
+        else:
+            if not len(rows):
+                return []
+            matrix, scales = self._matrix[rows], self._scales[rows]
+
+        if self.dtype == "float32":
+            scores = matrix @ query
+        elif self.dtype == "float16":
+            # NumPy has no BLAS path for float16; upcast in blocks to keep temporaries small
+            scores = np.concatenate([
+                matrix[start:start + 4096].astype(np.float32) @ query for start in range(0, len(matrix), 4096)
+            ])
+        else:
+            scores = (matrix @ query) * scales
+
+        if rows is None:
+            scores = np.where(self._alive[:self._size], scores, -np.inf)
+
+        top = min(k, len(scores))
+        best = np.argpartition(-scores, top - 1)[:top]
+        best = best[np.argsort(-scores[best])]
+
+        results = []
+        for position in best:
+            if not np.isfinite(scores[position]):
+                continue
+            row = int(position if rows is None else rows[position])
+            results.append((
+                self._ids[row],
+                Document(page_content=self._texts[row], metadata=dict(self._metadatas[row] or {})),
+                float(scores[position]),
+            ))
+        return results
+
+    def get(self, ids):
+        rows = np.array([self._rows[chunk_id] for chunk_id in ids], dtype=np.int64)
+        embeddings = self._decode(rows) if len(rows) else np.zeros((0, 0), dtype=np.float32)
+        return {
+            "ids": list(ids),
+            "documents": [self._texts[row] for row in rows],
+            "metadatas": [self._metadatas[row] for row in rows],
+            "embeddings": list(embeddings),
+        }
@@ -0,0 +1,163 @@
+"""
+Parallel document loading on a process pool
+"""
+import io
+import multiprocessing
+import os
+import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+
+import streamlit as st
+from langchain_core.documents import Document
+
+from config.settings import RAG_CONFIG
+from .document_loader import iter_document_pages
+from .loaders import get_backend
+
+
+def _load_buffer(file_name: str, data: bytes, file_type: str) -> List[Document]:
+    """Load a complete file from its bytes (runs in a worker process)"""
+    return list(iter_document_pages(io.BytesIO(data), file_name, file_type))
+
+
+def _load_pdf_pages(file_name: str, file_path: str, start: int, end: int) -> List[Document]:
+    """
+    Extract a page range of a PDF (runs in a worker process)
+
+    Produces the same page_content/metadata layout as a whole-file load so
+    split ranges are indistinguishable from it.
+    """
+    return get_backend("pdf").load_range(file_path, file_name, start, end)
+
+
+def _pdf_page_count(stream: BinaryIO) -> int:
+    """Number of pages in a PDF, or 0 if it cannot be read"""
+    try:
+        stream.seek(0)
+        return get_backend("pdf").page_count(stream)
+    except Exception:
+        return 0
+
+
+def _iter_tasks(files: List[Tuple[str, BinaryIO]], temp_paths: List[str]) -> Iterator[Tuple[int, tuple]]:
+    """
+    Lazily fan files out into load tasks
+
+    PDFs longer than RAG_CONFIG["pdf_pages_per_task"] pages are split into page
+    ranges. Worker processes cannot see our in-memory buffers, so those PDFs are
+    written to one temporary file shared by their range tasks (recorded in
+    temp_paths for cleanup); every other file is shipped to a worker as bytes.
+
+    Yields:
+        (file position, task) pairs in deterministic order
+    """
+    pages_per_task = RAG_CONFIG.get("pdf_pages_per_task", 0)
+    for position, (file_name, stream) in enumerate(files):
+        file_type = file_name.split(".")[-1].lower()
+        page_count = _pdf_page_count(stream) if file_type == "pdf" and pages_per_task else 0
+
+        if page_count > pages_per_task:
+            stream.seek(0)
+            with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
+                tmp_file.write(stream.read())
+                temp_paths.append(tmp_file.name)
+            for start in range(0, page_count, pages_per_task):
+                end = min(start + pages_per_task, page_count)
+                yield position, (_load_pdf_pages, file_name, tmp_file.name, start, end)
+        else:
+            stream.seek(0)
+            yield position, (_load_buffer, file_name, stream.read(), file_type)
+
+
+def _run_task(task: tuple) -> List[Document]:
+    func, *args = task
+    return func(*args)
+
+
+@st.cache_resource
+def get_loader_pool() -> ProcessPoolExecutor:
+    """
+    Return the shared loader process pool
+
+    Workers are spawned rather than forked so they never inherit the
+    Streamlit server's threads and locks.
+    """
+    return ProcessPoolExecutor(
+        max_workers=RAG_CONFIG["loader_workers"],
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+
+
+def iter_loaded_pages(files: List[Tuple[str, BinaryIO]]) -> Iterator[Tuple[int, Optional[Document], Optional[Exception]]]:
+    """
+    Stream the pages of several files, loading them concurrently when a pool is configured
+
+    With loader_workers <= 1 (the default) pages are parsed lazily from the
+    buffers on the calling thread, so memory stays flat however large a file
+    is. Otherwise files and PDF page ranges are submitted to the process pool
+    with at most 2 * loader_workers tasks in flight, and results are yielded
+    strictly in file and page order. That trades memory for parallelism:
+    workers receive whole files as bytes and return whole page lists (or page
+    ranges of PDFs, which are staged in a temporary file), so peak memory
+    grows with file size times the task window.
+
+    Args:
+        files: List of (file_name, binary buffer) pairs
+
+    Yields:
+        (file position, page, None) for every page, or (file position, None, error)
+        once for a file that failed to load
+    """
+    workers = RAG_CONFIG.get("loader_workers", 0)
+    if workers <= 1:
+        for position, (file_name, stream) in enumerate(files):
+            try:
+                for page in iter_document_pages(stream, file_name, file_name.split(".")[-1].lower()):
+                    yield position, page, None
+            except Exception as e:
+                yield position, None, e
+        return
+
+    pool = get_loader_pool()
+    window = deque()
+    temp_paths: List[str] = []
+    failed = set()
+
+    def drain_one():
+        position, future = window.popleft()
+        try:
+            documents = future.result()
+        except BrokenProcessPool as e:
+            # A crashed worker poisons the pool; start a fresh one next time
+            get_loader_pool.clear()
+            documents, error = None, e
+        except Exception as e:
+            documents, error = None, e
+        else:
+            error = None
+
+        if position in failed:
+            return
+        if error is not None:
+            failed.add(position)
+            yield position, None, error
+            return
+        for page in documents:
+            yield position, page, None
+
+    try:
+        for position, task in _iter_tasks(files, temp_paths):
+            window.append((position, pool.submit(_run_task, task)))
+            if len(window) >= workers * 2:
+                yield from drain_one()
+        while window:
+            yield from drain_one()
+    finally:
+        for _, future in window:
+            future.cancel()
+        for path in temp_paths:
+            if os.path.exists(path):
+                os.unlink(path)
@@ -0,0 +1,74 @@
+"""
+Retrieval-only document answers: ranked, deduplicated passages with citations
+"""
+from typing import Dict, List
+
+from langchain_core.documents import Document
+
+from config.settings import RAG_CONFIG
+from .context_packer import pack_context
+
+
+def cite(document: Document) -> str:
+    """
+    Build a human-readable citation for a chunk
+
+    Args:
+        document: Retrieved chunk
+
+    Returns:
+        Citation such as "resume.pdf, p. 2", listing every file that contains the
+        passage when near-duplicate copies were deduplicated
+    """
+    citations = []
+    for metadata in [document.metadata, *document.metadata.get("duplicate_sources", [])]:
+        source = metadata.get("source") or "document"
+        page = metadata.get("page")
+        # Loaders number pages from 0
+        citation = f"{source}, p. {int(page) + 1}" if page is not None else source
+        if citation not in citations:
+            citations.append(citation)
+    # Boilerplate repeated on every page would otherwise produce a huge citation
+    if len(citations) > 4:
+        citations = citations[:3] + [f"+{len(citations) - 3} more"]
+    return "; ".join(citations)
+
+
+def retrieve_passages(index, query: str, k: int = None, filters: Dict = None) -> List[Document]:
+    """
+    Retrieve the top passages for a query without any LLM call
+
+    Args:
+        index: DocumentIndex to search
+        query: Standalone question (the agent resolves follow-ups itself)
+        k: Number of passages (defaults to RAG_CONFIG["retrieval_k"])
+        filters: Optional file/page/section scope (see DocumentIndex.candidate_ids)
+
+    Returns:
+        Ranked chunks, deduplicated, merged and packed into the context token budget
+    """
+    k = k or RAG_CONFIG["retrieval_k"]
+    return pack_context(index.as_retriever(k=k, filters=filters).invoke(query))
+
+
+def format_passages(documents: List[Document]) -> str:
+    """
+    Render passages as numbered, cited excerpts for the agent
+
+    Args:
+        documents: Ranked chunks
+
+    Returns:
+        Text block the agent can answer from and cite
+    """
+    if not documents:
+        return "No relevant passages were found in the uploaded documents."
+
+    blocks = [
+        f"[{number}] ({cite(document)})\n{document.page_content.strip()}"
+        for number, document in enumerate(documents, start=1)
+    ]
+    return (
+        "Relevant passages from the uploaded documents, best match first. "
+        "Answer from these and cite sources as (file, page):\n\n" + "\n\n".join(blocks)
+    )
@@ -1,74 +1,25 @@
 """
 RAG chain creation and management
 """
-import os
-import tempfile
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_community.vectorstores import Chroma
-from langchain_openai import OpenAIEmbeddings, ChatOpenAI
+from langchain_openai import ChatOpenAI
 from langchain.chains import create_history_aware_retriever, create_retrieval_chain
 from langchain.chains.combine_documents import create_stuff_documents_chain
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+from langchain_core.runnables import RunnableLambda
 
-from config.settings import RAG_CONFIG
-from .document_loader import load_document
+from .context_packer import pack_context
 
 
-def process_documents(uploaded_files):
+def create_rag_chain(retriever):
     """
-    Process uploaded files and create a RAG chain
+    Create the conversational RAG chain on top of a retriever
     
     Args:
-        uploaded_files: List of uploaded file objects from Streamlit
+        retriever: Retriever over the indexed document chunks
         
     Returns:
-        RAG chain object or None if processing fails
+        RAG chain object
     """
-    all_documents = [] 
-    
-    # Process each uploaded file
-    for uploaded_file in uploaded_files:
-        # Save to temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix=f".{uploaded_file.name.split('.')[-1]}") as tmp_file:
-            tmp_file.write(uploaded_file.getvalue())
-            tmp_file_path = tmp_file.name
-        
-        # Determine file type
-        file_extension = uploaded_file.name.split(".")[-1].lower()
-        
-        # Load document
-        documents = load_document(tmp_file_path, file_extension)
-        
-        if documents:
-            all_documents.extend(documents)
-        
-        # Clean up temp file
-        os.unlink(tmp_file_path)
-    
-    if not all_documents:
-        return None
-    
-    # Split documents into chunks
-    text_splitter = RecursiveCharacterTextSplitter(
-        chunk_size=RAG_CONFIG["chunk_size"],
-        chunk_overlap=RAG_CONFIG["chunk_overlap"]
-    )
-    splits = text_splitter.split_documents(all_documents)
-    
-    # Create embeddings and vector store
-    embeddings = OpenAIEmbeddings(model=RAG_CONFIG["embedding_model"])
-    vectorstore = Chroma.from_documents(
-        documents=splits,
-        embedding=embeddings,
-        collection_name=RAG_CONFIG["collection_name"]
-    )
-    
-    # Create retriever
-    retriever = vectorstore.as_retriever(
-        search_type="similarity_score_threshold",
-        search_kwargs={"k": RAG_CONFIG["retriever_k"], "score_threshold": RAG_CONFIG["similarity_score_threshold"]}
-    )
-    
     # Create QA chain
     llm = ChatOpenAI(model="gpt-4o")
 
@@ -89,10 +40,13 @@ def process_documents(uploaded_files):
         ("human", "{input}"),
     ])
 
+    # Merge overlapping chunks and cap the context at the token budget before the QA prompt
+    packed_retriever = retriever | RunnableLambda(pack_context)
+
     # Create history-aware retriever
     # This retriever reformulates questions based on chat history before searching
     history_aware_retriever = create_history_aware_retriever(
-        llm, retriever, contextualize_q_prompt
+        llm, packed_retriever, contextualize_q_prompt
     )
     
     # Answer question prompt with chat history
@@ -0,0 +1,217 @@
+"""
+Token-aware text splitter that picks chunk boundaries from precomputed offsets
+"""
+import re
+from typing import Iterable, List, NamedTuple, Tuple
+
+from langchain_core.documents import Document
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+from config.settings import RAG_CONFIG
+from .tokenizer import get_encoding
+
+
+# Segment levels, coarsest first: paragraphs, sentences (or lines), words; then raw characters
+_LEVELS = (
+    re.compile(r"\n[ \t]*\n\s*"),
+    re.compile(r"[.!?][\"')\]]?\s+|\n\s*"),
+    re.compile(r"\s+"),
+)
+_CHARACTERS = len(_LEVELS)
+
+
+class Span(NamedTuple):
+    """A chunk as character offsets into the page text, plus its token count"""
+    start: int
+    end: int
+    tokens: int
+
+
+class TokenAwareSplitter:
+    """
+    Split pages into chunks of at most chunk_tokens tokens.
+
+    Each page is cut at paragraph breaks and every paragraph is tokenized once
+    (in a batch). Chunks are built by walking the resulting (offsets, token
+    count) list: whole paragraphs are packed up to the token limit, and a
+    chunk ends at a paragraph break in its second half when it can. Only the
+    paragraphs at chunk edges are cut further, into sentences, to fill a chunk
+    or to share roughly chunk_overlap_tokens tokens with the next one.
+    Anything longer than a chunk is cut into sentences, then words, then
+    characters.
+
+    split_spans() returns only offsets; split_documents() materializes each
+    chunk once from them and records metadata["start_index"] like LangChain
+    splitters with add_start_index=True.
+    """
+
+    def __init__(self, chunk_tokens: int = 256, chunk_overlap_tokens: int = 48, model: str = None):
+        """
+        Args:
+            chunk_tokens: Maximum tokens per chunk
+            chunk_overlap_tokens: Approximate tokens shared by consecutive chunks
+            model: Model whose tokenizer to use (defaults to the embedding model)
+        """
+        if chunk_overlap_tokens >= chunk_tokens:
+            raise ValueError("chunk_overlap_tokens must be smaller than chunk_tokens")
+        self.chunk_tokens = chunk_tokens
+        self.chunk_overlap_tokens = chunk_overlap_tokens
+        self.encoding = get_encoding(model)
+
+    def _count(self, texts: List[str]) -> List[int]:
+        if self.encoding is None:
+            # ~4 characters per token, rounded up per piece so that the sum over a
+            # chunk's pieces never falls below the estimate for the merged chunk text
+            return [max(1, -(-len(text) // 4)) for text in texts]
+        return [len(tokens) for tokens in self.encoding.encode_ordinary_batch(texts)]
+
+    def _cut(self, text: str, start: int, end: int, level: int) -> List[Tuple]:
+        """
+        Cut text[start:end] at the boundaries of one level and count each piece once
+
+        Returns:
+            (start, end, tokens, level, ends_paragraph) segments
+        """
+        edges = [start]
+        for match in _LEVELS[level].finditer(text, start, end):
+            if edges[-1] < match.end() < end:
+                edges.append(match.end())
+        edges.append(end)
+        counts = self._count([text[a:b] for a, b in zip(edges, edges[1:])])
+        return [(a, b, tokens, level, level == 0) for a, b, tokens in zip(edges, edges[1:], counts)]
+
+    def _refine(self, text: str, segment: Tuple) -> List[Tuple]:
+        """Split a segment at the next finer level (recursively, until every piece fits a chunk)"""
+        start, end, tokens, level, ends_paragraph = segment
+        level += 1
+        if level < _CHARACTERS:
+            pieces = self._cut(text, start, end, level)
+            if len(pieces) == 1:
+                return self._refine(text, (start, end, tokens, level, ends_paragraph))
+        else:
+            # No whitespace left to split on: cut by characters in proportion to tokens
+            step = max(1, (end - start) * self.chunk_tokens // (tokens + 1))
+            pieces = [
+                (a, min(a + step, end), -(-tokens * (min(a + step, end) - a) // (end - start)), level, False)
+                for a in range(start, end, step)
+            ]
+
+        pieces[-1] = pieces[-1][:4] + (ends_paragraph,)
+        refined = []
+        for piece in pieces:
+            if piece[2] > self.chunk_tokens and piece[3] < _CHARACTERS:
+                refined.extend(self._refine(text, piece))
+            else:
+                refined.append(piece)
+        return refined
+
+    def split_spans(self, text: str) -> List[Span]:
+        """
+        Choose chunk boundaries for a text without building any chunk strings
+
+        Args:
+            text: Page text
+
+        Returns:
+            Spans with whitespace trimmed from both ends, in text order
+        """
+        if not text.strip():
+            return []
+        limit, overlap = self.chunk_tokens, self.chunk_overlap_tokens
+
+        segments = []
+        for segment in self._cut(text, 0, len(text), 0):
+            segments.extend(self._refine(text, segment) if segment[2] > limit else [segment])
+
+        spans, first = [], 0
+        while first < len(segments):
+            total, last, paragraph_end = 0, first, None
+            while True:
+                while last < len(segments) and total + segments[last][2] <= limit:
+                    total += segments[last][2]
+                    if segments[last][4] and total >= limit // 2:
+                        paragraph_end = last
+                    last += 1
+                # The next paragraph does not fit whole: fill the chunk with its sentences,
+                # unless the chunk can already end on a paragraph break
+                if last < len(segments) and paragraph_end is None and segments[last][3] == 0:
+                    segments[last:last + 1] = self._refine(text, segments[last])
+                    continue
+                break
+            if last == first:
+                last += 1
+            elif last < len(segments) and paragraph_end is not None:
+                last = paragraph_end + 1
+
+            span = self._trim(text, segments[first][0], segments[last - 1][1],
+                              sum(segment[2] for segment in segments[first:last]))
+            if span is not None:
+                spans.append(span)
+            if last >= len(segments):
+                break
+
+            # Share the tail of the chunk with the next one, at sentence granularity
+            tail = segments[last - 1]
+            if tail[3] == 0 and tail[2] > overlap:
+                pieces = self._refine(text, tail)
+                segments[last - 1:last] = pieces
+                last += len(pieces) - 1
+
+            # Back up a few whole segments for ~overlap tokens, but never so far
+            # that the segment after this chunk no longer fits
+            shared, next_first, room = 0, last, min(overlap, limit - segments[last][2])
+            while next_first - 1 > first and shared + segments[next_first - 1][2] <= room:
+                next_first -= 1
+                shared += segments[next_first][2]
+            first = next_first
+        return spans
+
+    @staticmethod
+    def _trim(text: str, start: int, end: int, tokens: int):
+        while start < end and text[start].isspace():
+            start += 1
+        while end > start and text[end - 1].isspace():
+            end -= 1
+        return Span(start, end, tokens) if end > start else None
+
+    def split_text(self, text: str) -> List[str]:
+        """Split a text into chunk strings"""
+        return [text[span.start:span.end] for span in self.split_spans(text)]
+
+    def split_documents(self, documents: Iterable[Document]) -> List[Document]:
+        """
+        Split documents, keeping their metadata
+
+        Returns:
+            One document per chunk with metadata["start_index"] (character offset in
+            the source document) and metadata["token_count"]
+        """
+        chunks = []
+        for document in documents:
+            text = document.page_content
+            for span in self.split_spans(text):
+                metadata = dict(document.metadata)
+                metadata["start_index"] = span.start
+                metadata["token_count"] = span.tokens
+                chunks.append(Document(page_content=text[span.start:span.end], metadata=metadata))
+        return chunks
+
+
+def create_text_splitter():
+    """
+    Build the splitter selected by RAG_CONFIG["splitter"]
+
+    Returns:
+        TokenAwareSplitter ("token") or RecursiveCharacterTextSplitter ("recursive")
+    """
+    if RAG_CONFIG.get("splitter", "token") == "token":
+        return TokenAwareSplitter(
+            chunk_tokens=RAG_CONFIG["chunk_tokens"],
+            chunk_overlap_tokens=RAG_CONFIG["chunk_overlap_tokens"],
+        )
+    return RecursiveCharacterTextSplitter(
+        chunk_size=RAG_CONFIG["chunk_size"],
+        chunk_overlap=RAG_CONFIG["chunk_overlap"],
+        # Offsets into the page let the context packer merge overlapping chunks
+        add_start_index=True,
+    )
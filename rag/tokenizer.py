@@ -0,0 +1,70 @@
+"""
+Cached tokenizer helpers for token budgeting
+"""
+from functools import lru_cache
+
+from config.settings import RAG_CONFIG
+
+
+@lru_cache(maxsize=8)
+def get_encoding(model: str = None):
+    """
+    Return the tiktoken encoding for a model, loaded once per process
+
+    Args:
+        model: Model name (defaults to the configured embedding model)
+
+    Returns:
+        tiktoken Encoding, or None when tiktoken or its encoding files are unavailable
+    """
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+
+    try:
+        try:
+            return tiktoken.encoding_for_model(model or RAG_CONFIG["embedding_model"])
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        # Encoding files are downloaded on first use; fall back to estimates when offline
+        return None
+
+
+def count_tokens(text: str, model: str = None) -> int:
+    """
+    Count the tokens in a text
+
+    Args:
+        text: Text to measure
+        model: Model whose tokenizer to use (defaults to the embedding model)
+
+    Returns:
+        Token count (estimated as characters / 4 without tiktoken)
+    """
+    encoding = get_encoding(model)
+    if encoding is None:
+        return max(1, len(text) // 4)
+    return len(encoding.encode_ordinary(text))
+
+
+def truncate_to_tokens(text: str, max_tokens: int, model: str = None) -> str:
+    """
+    Cut a text down to at most max_tokens tokens
+
+    Args:
+        text: Text to shorten
+        max_tokens: Token budget
+        model: Model whose tokenizer to use (defaults to the embedding model)
+
+    Returns:
+        The text itself if it fits, otherwise its longest token prefix within the budget
+    """
+    encoding = get_encoding(model)
+    if encoding is None:
+        return text[:max_tokens * 4]
+    tokens = encoding.encode_ordinary(text)
+    if len(tokens) <= max_tokens:
+        return text
+    return encoding.decode(tokens[:max_tokens])
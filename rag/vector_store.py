@@ -0,0 +1,171 @@
+"""
+Pluggable vector store interface used by DocumentIndex
+"""
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+
+from config.settings import RAG_CONFIG
+
+
+class VectorStore(ABC):
+    """
+    Minimal store for precomputed embeddings.
+
+    DocumentIndex embeds chunks itself (through the cache and executor), so
+    backends only need to keep vectors, text and metadata by chunk id and
+    answer cosine top-k queries.
+    """
+
+    @abstractmethod
+    def add(self, ids: List[str], vectors: Sequence[Sequence[float]], texts: List[str], metadatas: List[Dict]):
+        """
+        Insert (or replace) chunks
+
+        Args:
+            ids: Chunk ids
+            vectors: Embedding rows aligned with ids
+            texts: Chunk texts
+            metadatas: Chunk metadata
+        """
+
+    @abstractmethod
+    def delete(self, ids: Iterable[str]):
+        """Remove chunks by id"""
+
+    @abstractmethod
+    def search(self, query_vector: Sequence[float], k: int,
+               candidate_ids: Optional[Iterable[str]] = None) -> List[Tuple[str, Document, float]]:
+        """
+        Find the chunks most similar to a query vector
+
+        Args:
+            query_vector: Query embedding
+            k: Number of results
+            candidate_ids: Restrict the search to these chunk ids
+
+        Returns:
+            Up to k (chunk id, document, cosine similarity) tuples, best first
+        """
+
+    @abstractmethod
+    def get(self, ids: List[str]) -> Dict[str, list]:
+        """
+        Read chunks back
+
+        Returns:
+            Dictionary with ids, documents, metadatas and embeddings aligned with the requested ids
+        """
+
+    @abstractmethod
+    def drop(self):
+        """Release everything the store holds"""
+
+    @property
+    @abstractmethod
+    def nbytes(self) -> int:
+        """Approximate memory used by the stored vectors"""
+
+
+class ChromaVectorStore(VectorStore):
+    """Vector store backed by an in-memory Chroma collection (cosine space)"""
+
+    def __init__(self, collection_name: str):
+        import chromadb
+
+        self.collection_name = collection_name
+        self._client = chromadb.Client()
+        self._collection = self._client.get_or_create_collection(
+            collection_name, metadata={"hnsw:space": "cosine"}
+        )
+        self._dimensions = 0
+
+    def add(self, ids, vectors, texts, metadatas):
+        if not ids:
+            return
+        embeddings = [list(map(float, vector)) for vector in vectors]
+        self._dimensions = len(embeddings[0])
+        self._collection.upsert(ids=ids, embeddings=embeddings, documents=texts, metadatas=metadatas)
+
+    def delete(self, ids):
+        ids = list(ids)
+        if ids:
+            self._collection.delete(ids=ids)
+
+    def search(self, query_vector, k, candidate_ids=None):
+        count = self._collection.count()
+        if not count:
+            return []
+        kwargs = {}
+        if candidate_ids is not None:
+            candidate_ids = list(candidate_ids)
+            if not candidate_ids:
+                return []
+            kwargs["where"] = {"chunk_id": {"$in": candidate_ids}}
+
+        result = self._collection.query(
+            query_embeddings=[list(map(float, query_vector))],
+            n_results=min(k, count),
+            include=["documents", "metadatas", "distances"],
+            **kwargs,
+        )
+        return [
+            (chunk_id, Document(page_content=text, metadata=metadata or {}), 1.0 - distance)
+            for chunk_id, text, metadata, distance in zip(
+                result["ids"][0], result["documents"][0], result["metadatas"][0], result["distances"][0]
+            )
+        ]
+
+    def get(self, ids):
+        data = self._collection.get(ids=ids, include=["embeddings", "documents", "metadatas"])
+        order = {chunk_id: i for i, chunk_id in enumerate(data["ids"])}
+        rows = [order[chunk_id] for chunk_id in ids]
+        return {
+            "ids": list(ids),
+            "documents": [data["documents"][i] for i in rows],
+            "metadatas": [data["metadatas"][i] for i in rows],
+            "embeddings": [data["embeddings"][i] for i in rows],
+        }
+
+    def drop(self):
+        self._client.delete_collection(self.collection_name)
+
+    @property
+    def nbytes(self) -> int:
+        return self._collection.count() * self._dimensions * 4
+
+
+def create_vector_store(collection_name: str, backend: str = None) -> VectorStore:
+    """
+    Instantiate the configured vector store backend
+
+    Args:
+        collection_name: Name of the collection (used by backends that have one)
+        backend: "numpy" or "chroma" (defaults to RAG_CONFIG["vector_backend"])
+
+    Returns:
+        VectorStore instance
+    """
+    backend = backend or RAG_CONFIG.get("vector_backend", "numpy")
+    if backend == "chroma":
+        return ChromaVectorStore(collection_name)
+    if backend == "numpy":
+        from .numpy_store import NumpyVectorStore
+
+        return NumpyVectorStore(
+            dtype=RAG_CONFIG.get("vector_dtype", "float32"),
+            ivf=RAG_CONFIG.get("ivf_enabled", False),
+            ivf_min_vectors=RAG_CONFIG.get("ivf_min_vectors", 4096),
+            nprobe=RAG_CONFIG.get("ivf_nprobe", 8),
+        )
+    raise ValueError(f"Unknown vector backend: {backend}")
+
+
+def normalize_rows(vectors) -> np.ndarray:
+    """Return vectors as a float32 matrix with unit-length rows (zero rows stay zero)"""
+    matrix = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
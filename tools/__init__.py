@@ -1,16 +1,18 @@
 """Tools package - Contains all agent tools"""
 from .web_tools import web_search
 from .weather_tool import get_weather
-from .currency_tool import convert_currency
+from .currency_tool import convert_currency, convert_currency_batch
 from .stock_tool import get_stock_price
-from .calculator_tool import calculator
+from .calculator_tool import calculator, calculator_batch
 from .document_tool import query_documents
 
 __all__ = [
     'web_search',
     'get_weather',
     'convert_currency',
+    'convert_currency_batch',
     'get_stock_price',
     'calculator',
+    'calculator_batch',
     'query_documents'
 ]
\ No newline at end of file
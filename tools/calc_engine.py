@@ -0,0 +1,288 @@
+"""
+Safe arithmetic engine: expressions compiled from the AST, with hard cost limits
+"""
+import ast
+import math
+import operator
+from decimal import Decimal, InvalidOperation, localcontext
+from fractions import Fraction
+from functools import lru_cache
+from typing import Callable, Dict, List, Tuple
+
+from config.settings import TOOL_CONFIG
+
+
+MODES = ("float", "decimal", "fraction")
+
+CONSTANTS = {"pi": math.pi, "e": math.e, "tau": math.tau}
+
+# name -> (function, modes it is available in)
+FUNCTIONS: Dict[str, Tuple[Callable, Tuple[str, ...]]] = {
+    "abs": (abs, MODES),
+    "round": (round, MODES),
+    "floor": (math.floor, MODES),
+    "ceil": (math.ceil, MODES),
+    "min": (min, MODES),
+    "max": (max, MODES),
+    "sqrt": (lambda x: x.sqrt() if isinstance(x, Decimal) else math.sqrt(x), ("float", "decimal")),
+    "exp": (lambda x: x.exp() if isinstance(x, Decimal) else math.exp(x), ("float", "decimal")),
+    "ln": (lambda x: x.ln() if isinstance(x, Decimal) else math.log(x), ("float", "decimal")),
+    "log": (lambda x, base=None: math.log(x) if base is None else math.log(x, base), ("float",)),
+    "log10": (lambda x: x.log10() if isinstance(x, Decimal) else math.log10(x), ("float", "decimal")),
+    "log2": (math.log2, ("float",)),
+    "sin": (math.sin, ("float",)),
+    "cos": (math.cos, ("float",)),
+    "tan": (math.tan, ("float",)),
+    "asin": (math.asin, ("float",)),
+    "acos": (math.acos, ("float",)),
+    "atan": (math.atan, ("float",)),
+    "atan2": (math.atan2, ("float",)),
+    "hypot": (math.hypot, ("float",)),
+    "degrees": (math.degrees, ("float",)),
+    "radians": (math.radians, ("float",)),
+    "factorial": (math.factorial, MODES),
+}
+
+_BINARY = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+}
+
+_UNARY = {ast.UAdd: operator.pos, ast.USub: operator.neg}
+
+
+class CalcError(ValueError):
+    """Invalid expression, unsupported operation, or a cost limit exceeded"""
+
+
+def _limits() -> Tuple[int, int, int, int]:
+    return (
+        TOOL_CONFIG["calc_max_nodes"],
+        TOOL_CONFIG["calc_max_exponent"],
+        TOOL_CONFIG["calc_max_result_digits"],
+        TOOL_CONFIG["calc_decimal_precision"],
+    )
+
+
+def _check(value, max_digits: int):
+    """Reject results whose magnitude is beyond the limit (keeps every later operation cheap)"""
+    if isinstance(value, int):
+        # bit_length is exact and O(1); 3.33 bits per decimal digit
+        if value.bit_length() > max_digits * 3.33:
+            raise CalcError(f"result exceeds {max_digits} digits")
+    elif isinstance(value, float):
+        if not math.isfinite(value):
+            raise CalcError("result is not a finite number")
+    elif isinstance(value, Decimal):
+        if not value.is_finite() or value.adjusted() > max_digits:
+            raise CalcError(f"result exceeds {max_digits} digits")
+    elif isinstance(value, Fraction):
+        if max(value.numerator.bit_length(), value.denominator.bit_length()) > max_digits * 3.33:
+            raise CalcError(f"result exceeds {max_digits} digits")
+    elif isinstance(value, complex):
+        raise CalcError("result is not a real number")
+    else:
+        raise CalcError(f"unsupported value {value!r}")
+    return value
+
+
+def _check_power(base, exponent, max_exponent: int, max_digits: int):
+    """
+    Refuse a power before computing it when its result would be too large (e.g. 9**9**9)
+
+    Fractions are bounded on numerator and denominator separately, since
+    both are raised exactly: ((10**999+1)/10**999)**1000 is close to 1 but
+    has million-digit parts. Other bases are bounded on the magnitude of
+    the result, which also covers sub-unit bases with negative exponents.
+    """
+    if abs(exponent) > max_exponent:
+        raise CalcError(f"exponent {exponent} is larger than {max_exponent}")
+    if not base or not exponent:
+        return
+    if isinstance(base, Fraction):
+        digits = abs(exponent) * max(math.log10(abs(base.numerator)), math.log10(base.denominator))
+    else:
+        digits = float(exponent) * math.log10(abs(base))
+    if digits > max_digits:
+        raise CalcError(f"result exceeds {max_digits} digits")
+
+
+def _literal(value, mode: str):
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise CalcError(f"unsupported literal {value!r}")
+    if isinstance(value, float) and not math.isfinite(value):
+        raise CalcError("number is too large")
+    if mode == "decimal":
+        return Decimal(repr(value)) if isinstance(value, float) else Decimal(value)
+    if mode == "fraction":
+        return Fraction(repr(value)) if isinstance(value, float) else Fraction(value)
+    return value
+
+
+def _compile(node, mode: str, limits) -> Callable[[], object]:
+    """Turn an AST node into a closure; everything is validated here, once per expression"""
+    _, max_exponent, max_digits, _ = limits
+
+    if isinstance(node, ast.Constant):
+        value = _check(_literal(node.value, mode), max_digits)
+        return lambda: value
+
+    if isinstance(node, ast.Name):
+        if node.id not in CONSTANTS:
+            raise CalcError(f"unknown name '{node.id}'")
+        if mode == "fraction":
+            raise CalcError(f"'{node.id}' is irrational; use float or decimal mode")
+        value = _literal(CONSTANTS[node.id], mode)
+        return lambda: value
+
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY:
+        op, operand = _UNARY[type(node.op)], _compile(node.operand, mode, limits)
+        return lambda: op(operand())
+
+    if isinstance(node, ast.BinOp) and type(node.op) in _BINARY:
+        left, right = _compile(node.left, mode, limits), _compile(node.right, mode, limits)
+        if isinstance(node.op, ast.Pow):
+            def power():
+                base, exponent = left(), right()
+                _check_power(base, exponent, max_exponent, max_digits)
+                if mode == "fraction" and getattr(exponent, "denominator", 1) != 1:
+                    raise CalcError("fraction mode needs whole-number exponents")
+                return _check(base ** exponent, max_digits)
+            return power
+        op = _BINARY[type(node.op)]
+        return lambda: _check(op(left(), right()), max_digits)
+
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and not node.keywords:
+        name = node.func.id
+        if name not in FUNCTIONS:
+            raise CalcError(f"unknown function '{name}'")
+        function, modes = FUNCTIONS[name]
+        if mode not in modes:
+            raise CalcError(f"'{name}' is not available in {mode} mode")
+        args = [_compile(arg, mode, limits) for arg in node.args]
+        if name == "factorial":
+            def factorial():
+                (value,) = [arg() for arg in args]
+                if value != int(value) or not 0 <= value <= max_exponent:
+                    raise CalcError(f"factorial needs a whole number between 0 and {max_exponent}")
+                return _check(_literal(math.factorial(int(value)), mode), max_digits)
+            return factorial
+        if name == "round" and len(args) == 2:
+            # round(x, n) computes 10**abs(n) for ints and fractions
+            def round_digits():
+                value, digits = [arg() for arg in args]
+                if digits != int(digits) or abs(digits) > max_exponent:
+                    raise CalcError(f"round needs a whole number of digits between -{max_exponent} and {max_exponent}")
+                return _check(round(value, int(digits)), max_digits)
+            return round_digits
+        return lambda: _check(function(*[arg() for arg in args]), max_digits)
+
+    raise CalcError(f"unsupported syntax: {type(node).__name__}")
+
+
+@lru_cache(maxsize=1024)
+def compile_expression(expression: str, mode: str = "float") -> Callable[[], object]:
+    """
+    Parse and validate an expression into a reusable closure
+
+    Args:
+        expression: Arithmetic expression, e.g. "sqrt(2) * (3 + 4)^2"
+        mode: "float", "decimal" (exact decimal arithmetic) or "fraction" (exact rationals)
+
+    Returns:
+        Zero-argument function computing the value
+
+    Raises:
+        CalcError: If the expression is too long, too complex or uses anything unsupported
+    """
+    if mode not in MODES:
+        raise CalcError(f"unknown mode '{mode}' (use {', '.join(MODES)})")
+    if len(expression) > TOOL_CONFIG["calc_max_length"]:
+        raise CalcError(f"expression longer than {TOOL_CONFIG['calc_max_length']} characters")
+    # "^" is what people usually mean by a power
+    source = expression.replace("^", "**").replace("×", "*").replace("÷", "/")
+    try:
+        tree = ast.parse(source, mode="eval")
+    except SyntaxError:
+        raise CalcError("invalid expression") from None
+
+    limits = _limits()
+    if sum(1 for _ in ast.walk(tree)) > limits[0]:
+        raise CalcError(f"expression has more than {limits[0]} elements")
+    return _compile(tree.body, mode, limits)
+
+
+def evaluate(expression: str, mode: str = "float"):
+    """
+    Evaluate an expression within the cost limits
+
+    Args:
+        expression: Arithmetic expression
+        mode: "float", "decimal" or "fraction"
+
+    Returns:
+        int/float, Decimal or Fraction depending on the mode
+
+    Raises:
+        CalcError: On invalid input, math errors or exceeded limits
+    """
+    compiled = compile_expression(expression.strip(), mode)
+    try:
+        if mode == "decimal":
+            with localcontext() as context:
+                context.prec = TOOL_CONFIG["calc_decimal_precision"]
+                return +compiled()
+        return compiled()
+    except CalcError:
+        raise
+    except ZeroDivisionError:
+        raise CalcError("division by zero") from None
+    except (ArithmeticError, InvalidOperation, ValueError, TypeError) as e:
+        raise CalcError(str(e) or type(e).__name__) from None
+
+
+def format_result(value) -> str:
+    """Readable result: integers exactly, floats to 15 significant digits, fractions with their decimal value"""
+    if isinstance(value, Fraction):
+        if value.denominator == 1:
+            return str(value.numerator)
+        return f"{value} (≈ {float(value):.15g})"
+    if isinstance(value, float):
+        return str(int(value)) if value.is_integer() and abs(value) < 1e15 else f"{value:.15g}"
+    if isinstance(value, Decimal):
+        return format(value.normalize() if value == value.to_integral_value() else value, "f")
+    return str(value)
+
+
+def evaluate_many(expressions: List[str], mode: str = "float",
+                  calculate: Callable[[str, str], str] = None) -> List[Tuple[str, str]]:
+    """
+    Evaluate several expressions; one failing does not affect the others
+
+    Args:
+        expressions: Arithmetic expressions
+        mode: "float", "decimal" or "fraction"
+        calculate: Computes one formatted result from (expression, mode), raising CalcError
+            (defaults to evaluate plus format_result)
+
+    Returns:
+        (expression, formatted result or "error: ...") pairs, in order
+
+    Raises:
+        CalcError: If there are more expressions than TOOL_CONFIG["calc_max_batch"]
+    """
+    if len(expressions) > TOOL_CONFIG["calc_max_batch"]:
+        raise CalcError(f"at most {TOOL_CONFIG['calc_max_batch']} expressions per call")
+    calculate = calculate or (lambda expression, mode: format_result(evaluate(expression, mode)))
+    results = []
+    for expression in expressions:
+        try:
+            results.append((expression, calculate(expression, mode)))
+        except CalcError as e:
+            results.append((expression, f"error: {e}"))
+    return results
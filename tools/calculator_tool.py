@@ -1,25 +1,56 @@
 """
 Calculator tool for mathematical operations
 """
+from typing import List
+
 from langchain.tools import tool
 from langchain.pydantic_v1 import BaseModel, Field
 
+from tools.calc_engine import CalcError, evaluate, evaluate_many, format_result
+from tools.tool_cache import cached
+
+
+MODE_DESCRIPTION = (
+    "'float' (default), 'decimal' for exact decimal arithmetic (money), "
+    "or 'fraction' for exact rational results"
+)
+
+
+@cached("calculator", normalize=False)
+def calculate(expression: str, mode: str) -> str:
+    """Formatted result of one expression (deterministic, so cached without expiry; errors are not cached)"""
+    return format_result(evaluate(expression, mode))
+
 
 class CalculatorInput(BaseModel):
-    expression: str = Field(description="A mathematical expression to calculate (e.g., '25*8+10' or '(100-25)/3')")
+    expression: str = Field(description="A mathematical expression to calculate (e.g., '25*8+10', '(100-25)/3' or 'sqrt(2)*3^2')")
+    mode: str = Field("float", description=MODE_DESCRIPTION)
+
+
+class CalculatorBatchInput(BaseModel):
+    expressions: List[str] = Field(description="The expressions to calculate")
+    mode: str = Field("float", description=MODE_DESCRIPTION)
 
 
 @tool(args_schema=CalculatorInput)
-def calculator(expression: str) -> str:
-    """Perform mathematical calculations. Supports basic operations: +, -, *, /, and parentheses.
+def calculator(expression: str, mode: str = "float") -> str:
+    """Perform mathematical calculations. Supports +, -, *, /, //, %, ** (or ^), parentheses,
+    pi, e and functions such as sqrt, exp, ln, log, log10, sin, cos, tan, abs, round, floor, ceil, min, max, factorial.
     Use this for any math problems or calculations."""
     try:
-        # Security: only allow safe mathematical characters
-        allowed_chars = set('0123456789+-*/.() ')
-        if not set(expression).issubset(allowed_chars):
-            return "Error: Only basic math operations allowed (+, -, *, /, parentheses)"
-        
-        result = eval(expression)
-        return f"Calculation: {expression} = {result}"
-    except Exception as e:
-        return f"Calculation error: {e}"
\ No newline at end of file
+        return f"Calculation: {expression} = {calculate(expression.strip(), mode)}"
+    except CalcError as e:
+        return f"Calculation error: {e}"
+
+
+@tool(args_schema=CalculatorBatchInput)
+def calculator_batch(expressions: List[str], mode: str = "float") -> str:
+    """Calculate several independent expressions in one call (e.g. a column of totals).
+    Same syntax as calculator; prefer this over repeated calculator calls."""
+    if not expressions:
+        return "Please give at least one expression."
+    try:
+        results = evaluate_many([expression.strip() for expression in expressions], mode, calculate)
+    except CalcError as e:
+        return f"Calculation error: {e}"
+    return "\n".join(f"{expression} = {result}" for expression, result in results)
@@ -1,10 +1,13 @@
 """
 Currency conversion tool
 """
-import requests
+from typing import List
+
 from langchain.tools import tool
 from langchain.pydantic_v1 import BaseModel, Field
 
+from tools.fx_rates import get_fx_engine, format_conversions
+
 
 class CurrencyInput(BaseModel):
     amount: float = Field(description="The amount of money to convert")
@@ -12,20 +15,40 @@ class CurrencyInput(BaseModel):
     to_currency: str = Field(description="The target currency code (e.g., USD, EUR, GBP)")
 
 
+class CurrencyBatchInput(BaseModel):
+    amounts: List[float] = Field(description="The amounts of money to convert, all in from_currency")
+    from_currency: str = Field(description="The source currency code (e.g., USD)")
+    to_currencies: List[str] = Field(description="The target currency codes (e.g., ['EUR', 'GBP', 'JPY'])")
+
+
 @tool(args_schema=CurrencyInput)
 def convert_currency(amount: float, from_currency: str, to_currency: str) -> str:
-    """Convert money from one currency to another. 
+    """Convert money from one currency to another.
     Supports major currencies like USD, EUR, GBP, JPY, CAD, AUD, CHF, CNY."""
     try:
-        url = f"https://api.exchangerate-api.com/v4/latest/{from_currency.upper()}"
-        response = requests.get(url)
-        data = response.json()
-        
-        if to_currency.upper() in data['rates']:
-            rate = data['rates'][to_currency.upper()]
-            converted = amount * rate
-            return f"{amount} {from_currency.upper()} = {converted:.2f} {to_currency.upper()}\nExchange Rate: 1 {from_currency.upper()} = {rate:.4f} {to_currency.upper()}"
-        else:
-            return f"Currency {to_currency} not found. Please use valid currency codes."
+        # Cross rates come from one shared base table, so no request per currency pair
+        rate = get_fx_engine().rate(from_currency, to_currency)
+        converted = amount * rate
+        return f"{amount} {from_currency.upper()} = {converted:.2f} {to_currency.upper()}\nExchange Rate: 1 {from_currency.upper()} = {rate:.4f} {to_currency.upper()}"
+    except KeyError as e:
+        return f"Currency {e.args[0]} not found. Please use valid currency codes."
+    except Exception as e:
+        return f"Currency conversion failed: {e}"
+
+
+@tool(args_schema=CurrencyBatchInput)
+def convert_currency_batch(amounts: List[float], from_currency: str, to_currencies: List[str]) -> str:
+    """Convert several amounts and/or into several currencies in one call
+    (e.g. 100 USD into EUR, GBP and JPY, or a list of prices into EUR).
+    Prefer this over repeated convert_currency calls."""
+    try:
+        if not amounts or not to_currencies:
+            return "Please give at least one amount and one target currency."
+        table = get_fx_engine().table()
+        rates = table.cross_rates(from_currency, to_currencies)
+        converted = table.convert(amounts, from_currency, to_currencies)
+        return format_conversions(amounts, from_currency, to_currencies, converted, rates)
+    except KeyError as e:
+        return f"Currency {e.args[0]} not found. Please use valid currency codes."
     except Exception as e:
-        return f"Currency conversion failed: {e}"
\ No newline at end of file
+        return f"Currency conversion failed: {e}"
@@ -1,19 +1,34 @@
 """
 Document query tool for RAG-based question answering with conversational support
 """
+import hashlib
+import json
+from typing import Dict, Optional
+
 import streamlit as st
 from langchain.tools import tool
 from langchain.pydantic_v1 import BaseModel, Field
 from langchain_core.messages import HumanMessage, AIMessage
 
+from config.settings import RAG_CONFIG
+from rag.answer_cache import get_answer_cache
+from rag.index_store import restore_pending_index
+from rag.ingest_jobs import describe_pending
+from rag.passages import retrieve_passages, format_passages
+from rag.rag_chain import create_rag_chain
+
 
 
 class DocumentQueryInput(BaseModel):
     query: str = Field(description="The question to ask about the uploaded documents")
+    file: Optional[str] = Field(None, description="Only search this uploaded file (its name or part of it, e.g. 'contract')")
+    page: Optional[int] = Field(None, description="Only search this page number (1-based)")
+    section: Optional[str] = Field(None, description="Only search sections whose heading contains this text (e.g. 'education')")
 
 
 @tool(args_schema=DocumentQueryInput)
-def query_documents(query: str) -> str:
+def query_documents(query: str, file: Optional[str] = None, page: Optional[int] = None,
+                    section: Optional[str] = None) -> str:
     """Search and answer questions from the user's uploaded documents (resume, CV, reports, PDFs, etc.).
     
     ALWAYS use this tool when the user asks about:
@@ -24,26 +39,77 @@ def query_documents(query: str) -> str:
     - Any question that requires reading uploaded content
     
     This tool has access to ALL uploaded PDFs, Word docs, and text files.
-    It supports conversational context, so follow-up questions work correctly.
+    Pass a standalone question: resolve follow-ups like "tell me more about it" from the conversation first.
+    Returns the most relevant passages with (file, page) citations to answer from.
+    When the user means a specific document, page or section ("the contract", "page 3 of the report"),
+    set file/page/section so only that part is searched.
     
     Before saying you don't have access to user data, CHECK if documents are uploaded and use this tool first."""
     try:
+        # Rehydrate the saved index of a resumed chat session on first use
+        restore_pending_index()
+
+        index = st.session_state.get("document_index")
+        # Files finished by a background ingestion job are searchable before the sidebar reruns
+        if index is not None and index.files and st.session_state.get("rag_chain") is None:
+            st.session_state.rag_chain = create_rag_chain(index.as_retriever())
+        pending = describe_pending(st.session_state.get("rag_namespace", ""))
+
         # Check if RAG system is available
         if "rag_chain" not in st.session_state or st.session_state.rag_chain is None:
+            if pending:
+                return f"The uploaded documents are still being indexed ({pending}). Ask again in a moment."
             return "No documents have been uploaded yet. Please upload a document first using the sidebar."
-        
-        # Get chat history for conversational context
-        chat_history = get_rag_chat_history()
-        
-        # Query the RAG system with chat history
-        result = st.session_state.rag_chain.invoke({
-            "input": query,
-            "chat_history": chat_history
-        })
-        answer = result["answer"]
-        
-        # Update chat history
-        update_rag_chat_history(query, answer)
+
+        filters = {name: value for name, value in (("file", file), ("page", page), ("section", section))
+                   if value not in (None, "")}
+        # Scoped questions are always answered from filtered passages; the RAG chain searches everything
+        retrieval_mode = (RAG_CONFIG.get("query_mode") == "retrieval" or bool(filters)) and index is not None
+
+        if filters and index is not None and not index.candidate_ids(**filters):
+            return (
+                f"No indexed passages match {describe_filters(filters)}. "
+                f"Uploaded documents:\n{index.metadata.describe()}"
+            )
+
+        # Serve near-identical questions about the same documents from the answer cache
+        # (not while files are being indexed: answers from a partial index must not outlive it)
+        use_cache = RAG_CONFIG.get("answer_cache_enabled") and index is not None and not pending
+        cache = get_answer_cache() if use_cache else None
+        if cache is not None:
+            fingerprint = index.fingerprint
+            context = get_cache_context(retrieval_mode, filters)
+            answer = cache.lookup_exact(fingerprint, context, query)
+            if answer is None:
+                query_vector = index.embeddings.embed_query(query)
+                answer = cache.lookup(fingerprint, context, query_vector)
+            if answer is not None:
+                if not retrieval_mode:
+                    update_rag_chat_history(query, answer)
+                return answer
+
+        # Retrieval-only mode: hand cited passages to the agent, which answers in its next step
+        if retrieval_mode:
+            answer = format_passages(retrieve_passages(index, query, filters=filters))
+        else:
+            # Get chat history for conversational context
+            chat_history = get_rag_chat_history()
+            
+            # Query the RAG system with chat history
+            result = st.session_state.rag_chain.invoke({
+                "input": query,
+                "chat_history": chat_history
+            })
+            answer = result["answer"]
+            
+            # Update chat history
+            update_rag_chat_history(query, answer)
+
+        if cache is not None:
+            cache.put(fingerprint, context, query, query_vector, answer)
+
+        if pending and retrieval_mode:
+            answer += f"\n\n(Still indexing: {pending}; passages from these files may be missing.)"
         
         return answer
     except Exception as e:
@@ -51,6 +117,35 @@ def query_documents(query: str) -> str:
     
 
 
+def describe_filters(filters: Dict) -> str:
+    """Human-readable scope such as 'file "contract", page 3'"""
+    parts = []
+    if "file" in filters:
+        parts.append(f'file "{filters["file"]}"')
+    if "page" in filters:
+        parts.append(f"page {filters['page']}")
+    if "section" in filters:
+        parts.append(f'section "{filters["section"]}"')
+    return ", ".join(parts)
+
+
+def get_cache_context(retrieval_mode: bool, filters: Dict = None) -> str:
+    """
+    Key for the part of the conversation an answer depends on
+
+    Retrieval-mode queries are standalone, so they share one context per
+    file/page/section scope. The RAG chain reformulates follow-ups with the
+    chat history, so its answers are only reused after the same previous exchange.
+    
+    Returns:
+        Context key for the answer cache
+    """
+    if retrieval_mode:
+        return "retrieval" + (":" + json.dumps(filters, sort_keys=True) if filters else "")
+    recent = "\0".join(message.content for message in get_rag_chat_history()[-2:])
+    return "chain:" + hashlib.sha256(recent.encode("utf-8")).hexdigest()
+
+
 def get_rag_chat_history():
     """
     Get chat history for RAG in the correct format
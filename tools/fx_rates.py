@@ -0,0 +1,167 @@
+"""
+Exchange-rate engine: one rate table per refresh, every cross rate derived locally
+"""
+import threading
+import time
+from typing import Dict, List, Sequence
+
+import numpy as np
+import streamlit as st
+
+from config.settings import TOOL_CONFIG
+from tools.http_client import http_get
+from tools.tool_cache import cached
+
+
+@cached("fx_rates")
+def fetch_rates(base_currency: str) -> dict:
+    """
+    Exchange rates from one base currency
+
+    Returns:
+        Mapping of currency code to units per 1 base_currency
+    """
+    url = f"https://api.exchangerate-api.com/v4/latest/{base_currency.upper()}"
+    response = http_get(url)
+    response.raise_for_status()
+    return response.json()['rates']
+
+
+class RateTable:
+    """
+    Rates of every currency against one base, as a vector
+
+    A cross rate is a ratio of two entries (triangulation through the base),
+    so one table answers every currency pair.
+    """
+
+    def __init__(self, base: str, rates: Dict[str, float]):
+        """
+        Args:
+            base: Currency the rates are quoted against
+            rates: Currency code -> units per 1 base
+        """
+        self.base = base.upper()
+        self.codes = {code.upper(): position for position, code in enumerate(rates)}
+        self.codes.setdefault(self.base, len(self.codes))
+        self.rates = np.ones(len(self.codes), dtype=np.float64)
+        self.rates[:len(rates)] = np.fromiter(rates.values(), dtype=np.float64, count=len(rates))
+
+    def positions(self, currencies: Sequence[str]) -> np.ndarray:
+        """
+        Table positions of currency codes
+
+        Raises:
+            KeyError: With the first unknown code
+        """
+        try:
+            return np.fromiter((self.codes[code.strip().upper()] for code in currencies), dtype=np.intp,
+                               count=len(currencies))
+        except KeyError as e:
+            raise KeyError(e.args[0]) from None
+
+    def cross_rates(self, from_currency: str, to_currencies: Sequence[str]) -> np.ndarray:
+        """Units of each target currency per 1 from_currency"""
+        source = self.positions([from_currency])[0]
+        return self.rates[self.positions(to_currencies)] / self.rates[source]
+
+    def convert(self, amounts: Sequence[float], from_currency: str, to_currencies: Sequence[str]) -> np.ndarray:
+        """
+        Convert many amounts into many currencies at once
+
+        Args:
+            amounts: Amounts in from_currency
+            from_currency: Source currency code
+            to_currencies: Target currency codes
+
+        Returns:
+            Matrix of shape (len(amounts), len(to_currencies))
+        """
+        return np.outer(np.asarray(amounts, dtype=np.float64), self.cross_rates(from_currency, to_currencies))
+
+
+class FxRateEngine:
+    """
+    Serves conversions for the whole process from a single base rate table.
+
+    Within the refresh interval a conversion is pure in-memory arithmetic;
+    after it, the table is fetched again through fetch_rates (so concurrent
+    refreshes are coalesced into one request). If a refresh fails, the
+    previous table keeps serving and the refresh is retried a minute later.
+    """
+
+    def __init__(self, base: str = "USD", refresh_seconds: float = 3600):
+        """
+        Args:
+            base: Currency whose table is fetched
+            refresh_seconds: Age after which the table is refetched
+        """
+        self.base = base.upper()
+        self.refresh_seconds = refresh_seconds
+        self._source = None
+        self._table = None
+        self._expires = 0.0
+        self._lock = threading.Lock()
+
+    def table(self) -> RateTable:
+        """Current rate table, refetched once it is older than refresh_seconds"""
+        table = self._table
+        if table is not None and time.monotonic() < self._expires:
+            return table
+        try:
+            rates = fetch_rates(self.base)
+        except Exception:
+            if table is None:
+                raise
+            # Serve the previous table; try the upstream again in a minute, not on every call
+            self._expires = time.monotonic() + min(60.0, self.refresh_seconds)
+            return table
+        with self._lock:
+            # The tool cache may still hold the same table; only parse a new one
+            if rates is not self._source:
+                self._table = RateTable(self.base, rates)
+                self._source = rates
+            self._expires = time.monotonic() + self.refresh_seconds
+            return self._table
+
+    def convert(self, amounts: Sequence[float], from_currency: str, to_currencies: Sequence[str]) -> np.ndarray:
+        """Convert many amounts into many currencies (see RateTable.convert)"""
+        return self.table().convert(amounts, from_currency, to_currencies)
+
+    def rate(self, from_currency: str, to_currency: str) -> float:
+        """Units of to_currency per 1 from_currency"""
+        return float(self.table().cross_rates(from_currency, [to_currency])[0])
+
+
+@st.cache_resource
+def get_fx_engine() -> FxRateEngine:
+    """Return the process-wide exchange-rate engine"""
+    return FxRateEngine(
+        base=TOOL_CONFIG["fx_base_currency"],
+        refresh_seconds=TOOL_CONFIG["cache_ttl_seconds"]["fx_rates"],
+    )
+
+
+def format_conversions(amounts: List[float], from_currency: str, to_currencies: List[str],
+                       converted: np.ndarray, rates: np.ndarray) -> str:
+    """
+    Text table of a batch conversion
+
+    Args:
+        amounts: Source amounts
+        from_currency: Source currency code
+        to_currencies: Target currency codes
+        converted: Result of FxRateEngine.convert
+        rates: Cross rate of each target currency
+
+    Returns:
+        One line per amount, then the exchange rates used
+    """
+    source = from_currency.strip().upper()
+    targets = [code.strip().upper() for code in to_currencies]
+    lines = []
+    for amount, row in zip(amounts, converted):
+        values = ", ".join(f"{value:,.2f} {code}" for value, code in zip(row, targets))
+        lines.append(f"{amount:,.2f} {source} = {values}")
+    lines.append("Exchange Rates: " + ", ".join(f"1 {source} = {rate:.4f} {code}" for rate, code in zip(rates, targets)))
+    return "\n".join(lines)
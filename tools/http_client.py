@@ -0,0 +1,89 @@
+"""
+Shared HTTP session for the external tools: keep-alive pools, timeouts and retries
+"""
+import random
+from typing import Optional
+
+import requests
+import streamlit as st
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from config.settings import TOOL_CONFIG
+
+
+# Requests worth retrying: rate limits and transient server errors
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class JitteredRetry(Retry):
+    """
+    Retry policy with full-jitter exponential backoff, so concurrent callers don't retry in lockstep
+
+    A Retry-After header is honored up to TOOL_CONFIG["http_max_retry_after_seconds"],
+    so an upstream cannot park a tool call (and its worker) for minutes.
+    """
+
+    def get_backoff_time(self) -> float:
+        backoff = super().get_backoff_time()
+        return random.uniform(0, backoff) if backoff > 0 else 0
+
+    def get_retry_after(self, response) -> Optional[float]:
+        retry_after = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+        return min(retry_after, TOOL_CONFIG["http_max_retry_after_seconds"])
+
+
+@st.cache_resource
+def get_http_session() -> requests.Session:
+    """
+    Return the process-wide HTTP session used by all tools
+
+    Connections are kept alive and reused across calls and sessions (no
+    TCP+TLS handshake per call). Each host gets its own pool of at most
+    http_pool_per_host connections; callers beyond that wait for a free
+    connection instead of opening more.
+
+    Returns:
+        requests.Session with retrying, pooled adapters for http and https
+    """
+    retry = JitteredRetry(
+        total=TOOL_CONFIG["http_max_retries"],
+        backoff_factor=TOOL_CONFIG["http_backoff_seconds"],
+        status_forcelist=RETRY_STATUSES,
+        # The tools only read, so every method they use is safe to retry
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=TOOL_CONFIG["http_pool_hosts"],
+        pool_maxsize=TOOL_CONFIG["http_pool_per_host"],
+        pool_block=True,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def default_timeout():
+    """(connect, read) timeout in seconds for tool requests"""
+    return (TOOL_CONFIG["http_connect_timeout"], TOOL_CONFIG["http_read_timeout"])
+
+
+def http_get(url: str, **kwargs) -> requests.Response:
+    """
+    GET through the shared session
+
+    Args:
+        url: Request URL
+        **kwargs: Passed to requests (timeout defaults to default_timeout())
+
+    Returns:
+        The response (after retries; status errors are not raised)
+    """
+    kwargs.setdefault("timeout", default_timeout())
+    return get_http_session().get(url, **kwargs)
+
@@ -0,0 +1,234 @@
+"""
+Stock quote service: structured quotes for many tickers per call, fetched concurrently
+"""
+import os
+import re
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Union
+
+import streamlit as st
+from langchain_community.utilities import SerpAPIWrapper
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from config.settings import TOOL_CONFIG
+from tools.script_context import script_run_ctx
+from tools.tool_cache import get_tool_cache, make_key
+
+
+class Quote(NamedTuple):
+    """Latest quote of one ticker (immutable, so cached quotes can be shared)"""
+    ticker: str
+    price: Optional[float] = None
+    currency: Optional[str] = None
+    change: Optional[float] = None
+    change_percent: Optional[float] = None
+    name: Optional[str] = None
+    exchange: Optional[str] = None
+    as_of: Optional[str] = None
+    # Free-text fallback when the source had no structured quote
+    summary: Optional[str] = None
+
+
+def _number(value) -> Optional[float]:
+    """Parse numbers such as 189.84, "1,234.50" or "+0.65%" """
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    match = re.search(r"[-+]?\d[\d,]*(?:\.\d+)?", str(value))
+    return float(match.group().replace(",", "")) if match else None
+
+
+class QuoteFetcher(ABC):
+    """
+    A source of quotes for single tickers.
+
+    Subclasses set name and implement fetch(); register_fetcher() makes them
+    selectable through TOOL_CONFIG["quote_fetcher"].
+    """
+
+    name = ""
+
+    @abstractmethod
+    def fetch(self, ticker: str) -> Quote:
+        """
+        Fetch the latest quote of one (normalized, upper-case) ticker
+
+        Raises:
+            LookupError: If the source has nothing for the ticker
+        """
+
+
+@st.cache_resource
+def get_serpapi(api_key: str) -> SerpAPIWrapper:
+    """Long-lived SerpAPI client (one per API key)"""
+    return SerpAPIWrapper(serpapi_api_key=api_key)
+
+
+class SerpApiQuoteFetcher(QuoteFetcher):
+    """Quotes from the finance answer box of a Google search through SerpAPI"""
+
+    name = "serpapi"
+
+    def fetch(self, ticker):
+        results = get_serpapi(os.getenv("SERPAPI_API_KEY")).results(f"{ticker} stock price")
+        box = results.get("answer_box") or {}
+        if box.get("type") == "finance_results" and box.get("price") is not None:
+            movement = box.get("price_movement") or {}
+            sign = -1 if str(movement.get("movement", "")).lower() == "down" else 1
+            change, percent = _number(movement.get("value")), _number(movement.get("percentage"))
+            return Quote(
+                ticker=ticker,
+                price=_number(box.get("price")),
+                currency=box.get("currency"),
+                change=None if change is None else sign * abs(change),
+                change_percent=None if percent is None else sign * abs(percent),
+                name=box.get("title"),
+                exchange=box.get("exchange"),
+                as_of=movement.get("date"),
+            )
+        # No finance box: keep the top snippet rather than failing
+        for result in results.get("organic_results", [])[:1]:
+            if result.get("snippet"):
+                return Quote(ticker=ticker, summary=result["snippet"])
+        raise LookupError(f"no quote found for {ticker}")
+
+
+class StaticQuoteFetcher(QuoteFetcher):
+    """Fixed quotes from memory, for tests and offline demos"""
+
+    name = "static"
+
+    def __init__(self, quotes: Dict[str, Quote] = None):
+        """
+        Args:
+            quotes: Ticker -> Quote
+        """
+        self.quotes = {ticker.upper(): quote for ticker, quote in (quotes or {}).items()}
+
+    def fetch(self, ticker):
+        if ticker not in self.quotes:
+            raise LookupError(f"no quote found for {ticker}")
+        return self.quotes[ticker]
+
+
+_REGISTRY: Dict[str, QuoteFetcher] = {}
+
+
+def register_fetcher(fetcher: QuoteFetcher):
+    """Add a quote fetcher to the registry (replacing one with the same name)"""
+    _REGISTRY[fetcher.name] = fetcher
+
+
+for _fetcher in (SerpApiQuoteFetcher(), StaticQuoteFetcher()):
+    register_fetcher(_fetcher)
+
+
+def get_fetcher(name: str = None) -> QuoteFetcher:
+    """
+    Look up a quote fetcher
+
+    Args:
+        name: Fetcher name (defaults to TOOL_CONFIG["quote_fetcher"])
+
+    Raises:
+        ValueError: If the fetcher is unknown
+    """
+    name = name or TOOL_CONFIG.get("quote_fetcher", "serpapi")
+    if name not in _REGISTRY:
+        raise ValueError(f"Unknown quote fetcher: {name}")
+    return _REGISTRY[name]
+
+
+def normalize_tickers(tickers: List[str]) -> List[str]:
+    """Upper-case, strip "$", split "AAPL, MSFT" strings and drop duplicates (keeping order)"""
+    seen = []
+    for entry in tickers:
+        for ticker in re.split(r"[\s,;]+", entry.strip().upper()):
+            ticker = ticker.lstrip("$")
+            if ticker and ticker not in seen:
+                seen.append(ticker)
+    return seen
+
+
+class QuoteService:
+    """
+    Quotes for many tickers in one round of network I/O.
+
+    Tickers are fetched concurrently on a bounded pool. Each ticker's quote
+    goes through the shared tool cache ("stock" TTL), so a quote fetched for
+    one question or session is reused briefly by every other one, and
+    concurrent requests for the same ticker make a single upstream call.
+    """
+
+    def __init__(self, fetcher: QuoteFetcher = None, max_workers: int = 8):
+        """
+        Args:
+            fetcher: Quote source (defaults to get_fetcher() at call time)
+            max_workers: Tickers fetched at once
+        """
+        self.fetcher = fetcher
+        self._pool = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="quotes")
+
+    @staticmethod
+    def _fetch_cached(cache, fetcher: QuoteFetcher, ticker: str) -> Quote:
+        if cache is None:
+            return fetcher.fetch(ticker)
+        key = make_key("stock", (fetcher.name, ticker), {})
+        return cache.get_or_call("stock", key, lambda: fetcher.fetch(ticker))
+
+    def get_quotes(self, tickers: List[str]) -> Dict[str, Union[Quote, Exception]]:
+        """
+        Fetch quotes for several tickers at once
+
+        Args:
+            tickers: Ticker symbols (normalized, duplicates dropped)
+
+        Returns:
+            Ticker -> Quote, or the exception its fetch raised, in request order
+        """
+        fetcher = self.fetcher or get_fetcher()
+        cache = get_tool_cache() if TOOL_CONFIG.get("cache_enabled", True) else None
+        tickers = normalize_tickers(tickers)
+        # Fetchers may use st.cache_resource clients, which need the calling script run's context
+        ctx = get_script_run_ctx()
+
+        def fetch(ticker):
+            with script_run_ctx(ctx):
+                return self._fetch_cached(cache, fetcher, ticker)
+
+        # A single ticker is fetched on the calling thread
+        futures = {ticker: self._pool.submit(fetch, ticker) for ticker in tickers} if len(tickers) > 1 else {}
+
+        quotes = {}
+        for ticker in tickers:
+            try:
+                quotes[ticker] = futures[ticker].result() if futures else self._fetch_cached(cache, fetcher, ticker)
+            except Exception as e:
+                quotes[ticker] = e
+        return quotes
+
+
+@st.cache_resource
+def get_quote_service() -> QuoteService:
+    """Return the process-wide quote service"""
+    return QuoteService(max_workers=TOOL_CONFIG["quote_workers"])
+
+
+def format_quote(quote: Quote) -> str:
+    """One line such as "AAPL (Apple Inc, NASDAQ): 189.84 USD, +1.23 (+0.65%)" """
+    label = quote.ticker
+    details = ", ".join(part for part in (quote.name, quote.exchange) if part)
+    if details:
+        label += f" ({details})"
+    if quote.price is None:
+        return f"{label}: {quote.summary or 'no price available'}"
+    line = f"{label}: {quote.price:,.2f}" + (f" {quote.currency}" if quote.currency else "")
+    if quote.change is not None:
+        line += f", {quote.change:+,.2f}"
+        if quote.change_percent is not None:
+            line += f" ({quote.change_percent:+.2f}%)"
+    if quote.as_of:
+        line += f" as of {quote.as_of}"
+    return line
@@ -0,0 +1,39 @@
+"""
+Streamlit script-run context for tool code running on shared pool threads
+"""
+import threading
+from contextlib import contextmanager
+
+try:
+    from streamlit.runtime.scriptrunner import SCRIPT_RUN_CONTEXT_ATTR_NAME
+except ImportError:  # Moved in newer Streamlit releases
+    from streamlit.runtime.scriptrunner_utils.script_run_context import SCRIPT_RUN_CONTEXT_ATTR_NAME
+
+
+def _set_ctx(thread: threading.Thread, ctx):
+    if ctx is None:
+        if hasattr(thread, SCRIPT_RUN_CONTEXT_ATTR_NAME):
+            delattr(thread, SCRIPT_RUN_CONTEXT_ATTR_NAME)
+    else:
+        setattr(thread, SCRIPT_RUN_CONTEXT_ATTR_NAME, ctx)
+
+
+@contextmanager
+def script_run_ctx(ctx):
+    """
+    Run a block on the current thread under a given script-run context
+
+    Pool threads are reused across sessions, so the context is always set,
+    cleared when ctx is None, and the thread's previous context is restored
+    afterwards. Otherwise a tool could read another user's st.session_state.
+
+    Args:
+        ctx: Context captured on the calling script thread (get_script_run_ctx()), or None
+    """
+    thread = threading.current_thread()
+    previous = getattr(thread, SCRIPT_RUN_CONTEXT_ATTR_NAME, None)
+    _set_ctx(thread, ctx)
+    try:
+        yield
+    finally:
+        _set_ctx(thread, previous)
@@ -1,24 +1,33 @@
 """
 Stock price lookup tool
 """
-import os
+from typing import List
+
 from langchain.tools import tool
 from langchain.pydantic_v1 import BaseModel, Field
-from langchain_community.utilities import SerpAPIWrapper
+
+from tools.quote_service import get_quote_service, format_quote
 
 
 class StockInput(BaseModel):
-    ticker: str = Field(description="The stock ticker symbol (e.g., AAPL, GOOGL, TSLA)")
+    tickers: List[str] = Field(description="One or more stock ticker symbols (e.g., ['AAPL'] or ['AAPL', 'MSFT', 'NVDA'])")
 
 
 @tool(args_schema=StockInput)
-def get_stock_price(ticker: str) -> str:
-    """Get current stock price and information for a given stock ticker symbol.
-    Works with major stock exchanges like NYSE, NASDAQ, etc."""
+def get_stock_price(tickers: List[str]) -> str:
+    """Get current stock prices and information for one or more stock ticker symbols.
+    Works with major stock exchanges like NYSE, NASDAQ, etc.
+    To compare several stocks, pass all their tickers in ONE call."""
     try:
-        serpapi_key = os.getenv("SERPAPI_API_KEY")
-        search = SerpAPIWrapper(serpapi_api_key=serpapi_key)
-        stock_data = search.run(f"{ticker} stock price today current")
-        return f"Stock information for {ticker.upper()}:\n{stock_data}"
+        quotes = get_quote_service().get_quotes(tickers)
+        if not quotes:
+            return "Please give at least one stock ticker symbol."
+        lines = []
+        for ticker, quote in quotes.items():
+            if isinstance(quote, Exception):
+                lines.append(f"{ticker}: lookup failed: {quote}")
+            else:
+                lines.append(format_quote(quote))
+        return "Stock information:\n" + "\n".join(f"- {line}" for line in lines)
     except Exception as e:
-        return f"Stock price lookup failed: {e}"
\ No newline at end of file
+        return f"Stock price lookup failed: {e}"
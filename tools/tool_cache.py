@@ -0,0 +1,191 @@
+"""
+Shared cache of tool results with per-tool TTLs and request coalescing
+"""
+import functools
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import streamlit as st
+
+from config.settings import TOOL_CONFIG
+
+
+def normalize_arg(value):
+    """Case- and whitespace-insensitive form of a tool argument, so trivial rewrites share an entry"""
+    if isinstance(value, str):
+        return " ".join(value.casefold().split())
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, (list, tuple)):
+        return [normalize_arg(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): normalize_arg(item) for key, item in value.items()}
+    return value
+
+
+def make_key(namespace: str, args: Tuple, kwargs: Dict, normalize: bool = True) -> str:
+    """
+    Cache key of a call
+
+    Args:
+        namespace: Tool/policy name (e.g. "weather")
+        args: Positional arguments
+        kwargs: Keyword arguments
+        normalize: Apply normalize_arg (off for case-sensitive arguments such as expressions)
+
+    Returns:
+        Namespace plus the (normalized) arguments as canonical JSON
+    """
+    if normalize:
+        args, kwargs = normalize_arg(list(args)), normalize_arg(kwargs)
+    payload = json.dumps([list(args), kwargs], sort_keys=True, default=str)
+    return f"{namespace}:{payload}"
+
+
+class _InFlight:
+    """A call being made upstream that identical concurrent calls wait for"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error: Optional[BaseException] = None
+
+
+class ToolResultCache:
+    """
+    In-memory cache of upstream tool results, shared by all sessions.
+
+    Each namespace (weather, fx_rates, stock, web_search, calculator) has its
+    own TTL; a TTL of None keeps results until they are evicted. The least
+    recently used entries are evicted beyond max_entries. Identical calls
+    that arrive while the first is still in flight wait for its result instead
+    of making their own upstream request. Exceptions are never cached: every
+    waiter of a failed call gets the exception and the next call retries.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: Dict[str, Optional[float]], default_ttl: Optional[float]):
+        """
+        Args:
+            max_entries: Maximum number of stored results
+            ttl_seconds: Lifetime per namespace (None = no expiry)
+            default_ttl: Lifetime for namespaces not listed in ttl_seconds
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = dict(ttl_seconds)
+        self.default_ttl = default_ttl
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._entries: "OrderedDict[str, Tuple[Any, Optional[float]]]" = OrderedDict()
+        self._in_flight: Dict[str, _InFlight] = {}
+        self._lock = threading.Lock()
+
+    def ttl(self, namespace: str) -> Optional[float]:
+        """Lifetime of the results of a namespace"""
+        return self.ttl_seconds.get(namespace, self.default_ttl)
+
+    def get_or_call(self, namespace: str, key: str, fetch: Callable[[], Any]):
+        """
+        Return a fresh cached result, or fetch it (once, however many callers ask at the same time)
+
+        Args:
+            namespace: TTL policy of the result
+            key: Cache key (see make_key)
+            fetch: Makes the upstream request; may raise
+
+        Returns:
+            The (possibly shared) result; callers must not mutate it
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires = entry
+                if expires is None or expires > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+
+            call = self._in_flight.get(key)
+            leader = call is None
+            if leader:
+                call = self._in_flight[key] = _InFlight()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = fetch()
+        except BaseException as e:
+            call.error = e
+            raise
+        else:
+            ttl = self.ttl(namespace)
+            with self._lock:
+                self._entries[key] = (call.value, None if ttl is None else time.monotonic() + ttl)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            return call.value
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+            call.done.set()
+
+    def invalidate(self, namespace: str = None):
+        """Drop the results of one namespace, or everything when namespace is None"""
+        with self._lock:
+            for key in list(self._entries):
+                if namespace is None or key.startswith(namespace + ":"):
+                    del self._entries[key]
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss/coalesced counters and the number of stored results"""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "coalesced": self.coalesced,
+                    "entries": len(self._entries)}
+
+
+@st.cache_resource
+def get_tool_cache() -> ToolResultCache:
+    """Return the process-wide tool result cache"""
+    return ToolResultCache(
+        max_entries=TOOL_CONFIG["cache_max_entries"],
+        ttl_seconds=TOOL_CONFIG["cache_ttl_seconds"],
+        default_ttl=TOOL_CONFIG["cache_default_ttl_seconds"],
+    )
+
+
+def cached(namespace: str, normalize: bool = True):
+    """
+    Cache a tool's upstream call under a TTL policy
+
+    The decorated function should raise on failure (failures are not cached)
+    and return a value that is safe to share between callers.
+
+    Args:
+        namespace: Key prefix and TTL policy name, e.g. "weather"
+        normalize: Share entries between case/whitespace variants of the arguments (see make_key)
+
+    Returns:
+        Decorator
+    """
+    def decorator(fetch):
+        @functools.wraps(fetch)
+        def wrapper(*args, **kwargs):
+            if not TOOL_CONFIG.get("cache_enabled", True):
+                return fetch(*args, **kwargs)
+            return get_tool_cache().get_or_call(
+                namespace, make_key(namespace, args, kwargs, normalize), lambda: fetch(*args, **kwargs)
+            )
+        return wrapper
+    return decorator
@@ -2,9 +2,30 @@
 Web search tool for finding current information
 """
 import os
+
+import streamlit as st
 from langchain.tools import tool
 from tavily import TavilyClient
 
+from tools.tool_cache import cached
+
+
+@st.cache_resource
+def get_tavily(api_key: str) -> TavilyClient:
+    """Long-lived Tavily client (one per API key)"""
+    return TavilyClient(api_key=api_key)
+
+
+@cached("web_search")
+def fetch_search_results(query: str) -> dict:
+    """Tavily search results (with a direct answer when Tavily has one)"""
+    return get_tavily(os.getenv("TAVILY_API_KEY")).search(
+        query=query,
+        max_results=5,  # Number of results
+        include_answer=True,  # Get AI-generated answer
+        include_raw_content=False,  # Don't need raw HTML
+    )
+
 
 @tool
 def web_search(query: str) -> str:
@@ -15,15 +36,8 @@ def web_search(query: str) -> str:
         if not api_key:
             return "Tavily API key not configured. Please add TAVILY_API_KEY to your .env file"
         
-        client = TavilyClient(api_key=api_key)
-        
-        # Search with Tavily
-        results = client.search(
-            query=query,
-            max_results=5,  # Number of results
-            include_answer=True,  # Get AI-generated answer
-            include_raw_content=False,  # Don't need raw HTML
-        )
+        # Search with Tavily (repeated queries are served from the tool cache)
+        results = fetch_search_results(query)
 
         # Format results
         if results.get('answer'):
@@ -3,8 +3,10 @@ Chat interface components
 """
 import streamlit as st
 from langchain_core.messages import HumanMessage, AIMessage
+from config.settings import AGENT_CONFIG
 from audio_recorder_streamlit import audio_recorder
 from utils.voice_utils import speech_to_text_whisper, text_to_speech_openai, autoplay_audio, get_available_voices
+from ui.stream_handler import ChatStreamHandler
 
 
 
@@ -131,50 +133,71 @@ def _process_user_input(prompt: str, agent_executor, auto_speak: bool = False):
     
     # Generate AI response using agent
     with st.chat_message("assistant"):
-        with st.spinner("🤔 Thinking and using tools..."):
-            try:
-                # Build chat history for agent (last 5 exchanges for context)
-                agent_chat_history = []
-                recent_messages = st.session_state.messages[-10:]  # Last 10 messages (5 exchanges)
-
-                for msg in recent_messages[:-1]:  # Exclude the current message
-                    if msg["role"] == "user":
-                        agent_chat_history.append(HumanMessage(content=msg["content"]))
-                    elif msg["role"] == "assistant":
-                        agent_chat_history.append(AIMessage(content=msg["content"]))
-
-
-                # Invoke the agent with input and chat history
-                response = agent_executor.invoke({
-                    "input": prompt,
-                    "chat_history": agent_chat_history
-                    })
+        try:
+            # Build chat history for agent (last 5 exchanges for context)
+            agent_chat_history = []
+            recent_messages = st.session_state.messages[-10:]  # Last 10 messages (5 exchanges)
+
+            for msg in recent_messages[:-1]:  # Exclude the current message
+                if msg["role"] == "user":
+                    agent_chat_history.append(HumanMessage(content=msg["content"]))
+                elif msg["role"] == "assistant":
+                    agent_chat_history.append(AIMessage(content=msg["content"]))
+
+            agent_input = {
+                "input": prompt,
+                "chat_history": agent_chat_history,
+                "available_documents": _describe_documents(),
+            }
+
+            if AGENT_CONFIG.get("stream_responses", True):
+                # Tool status and answer tokens are rendered while the agent runs
+                handler = ChatStreamHandler(st.empty(), st.empty())
+                try:
+                    response = agent_executor.invoke(agent_input, config={"callbacks": [handler]})
+                except Exception:
+                    handler.fail()
+                    raise
+                answer = response["output"]
+                handler.finish(answer)
+            else:
+                with st.spinner("🤔 Thinking and using tools..."):
+                    # Invoke the agent with input and chat history
+                    response = agent_executor.invoke(agent_input)
                 answer = response["output"]
-                
                 st.markdown(answer)
-                
-                # Add assistant response to chat
-                st.session_state.messages.append({"role": "assistant", "content": answer})
-                
-                # Auto-save assistant message if enabled
-                if st.session_state.get("auto_save_enabled", False):
-                    if "firestore_manager" in st.session_state:
-                        firestore_manager = st.session_state.firestore_manager
-                        session_id = st.session_state.get("session_id", "default")
-                        firestore_manager.save_message(session_id, "assistant", answer)
-
-                # Atuo-speak the response if enabled
-                if auto_speak:
-                    with st.spinner("🔊 Generating speech..."):
-                        voice = st.session_state.get("selected_voice", "alloy")
-                        audio_bytes = text_to_speech_openai(answer, voice=voice)
-                        if audio_bytes:
-                            autoplay_audio(audio_bytes)
-                
-            except Exception as e:
-                error_msg = f"I encountered an error: {str(e)}"
-                st.error(error_msg)
-                st.session_state.messages.append({"role": "assistant", "content": error_msg})
+            
+            # Add assistant response to chat
+            st.session_state.messages.append({"role": "assistant", "content": answer})
+            
+            # Auto-save assistant message if enabled
+            if st.session_state.get("auto_save_enabled", False):
+                if "firestore_manager" in st.session_state:
+                    firestore_manager = st.session_state.firestore_manager
+                    session_id = st.session_state.get("session_id", "default")
+                    firestore_manager.save_message(session_id, "assistant", answer)
+
+            # Atuo-speak the response if enabled
+            if auto_speak:
+                with st.spinner("🔊 Generating speech..."):
+                    voice = st.session_state.get("selected_voice", "alloy")
+                    audio_bytes = text_to_speech_openai(answer, voice=voice)
+                    if audio_bytes:
+                        autoplay_audio(audio_bytes)
+            
+        except Exception as e:
+            error_msg = f"I encountered an error: {str(e)}"
+            st.error(error_msg)
+            st.session_state.messages.append({"role": "assistant", "content": error_msg})
+
+
+def _describe_documents() -> str:
+    """List the uploaded documents (with pages and section headings once indexed) for the agent prompt"""
+    index = st.session_state.get("document_index")
+    if index is not None and index.files:
+        return index.metadata.describe()
+    names = st.session_state.get("uploaded_files_names") or []
+    return "\n".join(f"- {name}" for name in names) or "None yet"
 
 
 def _render_chat_stats():
@@ -3,11 +3,21 @@ Sidebar UI components
 """
 import uuid
 import streamlit as st
-from config.settings import TOOL_DESCRIPTIONS, EXAMPLE_QUESTIONS, SUPPORTED_FILE_TYPES, FIRESTORE_CONFIG
-from rag.rag_chain import process_documents
+from config.settings import TOOL_DESCRIPTIONS, EXAMPLE_QUESTIONS, SUPPORTED_FILE_TYPES, FIRESTORE_CONFIG, RAG_CONFIG
+from rag.collection_manager import get_collection_manager
+from rag.document_index import DocumentIndex
+from rag.rag_chain import create_rag_chain
+from rag.embedding_cache import get_embedding_cache, get_embedding_executor
+from rag.embedding_providers import get_provider
+from rag.index_store import save_index, delete_saved_index, has_saved_index
+from rag.ingest_jobs import get_ingest_manager
 from utils.firestore_manager import init_firestore, load_chat_from_cloud
 
 
+# Re-runs only the progress panel on a timer (Streamlit >= 1.33); older versions get a refresh button
+_fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+
+
 def render_sidebar():
     """Render the complete sidebar with all components"""
     
@@ -38,6 +48,7 @@ def render_sidebar():
     with col2:
         if st.sidebar.button("➕ New Chat", use_container_width=True):
             # Create new session
+            _reset_session_documents()
             st.session_state.session_id = str(uuid.uuid4())
             st.session_state.messages = []
             st.session_state.rag_chat_history = []
@@ -146,19 +157,25 @@ def _render_session_list(firestore_manager):
             ):
                 if not is_current:
                     with st.spinner(f"Loading {session['title']}..."):
+                        _reset_session_documents()
                         st.session_state.session_id = session["id"]
                         st.session_state.session_name = session["title"]
                         load_chat_from_cloud(session["id"])
+                        # Documents are rehydrated lazily, on the first document question
+                        if has_saved_index(session["id"]):
+                            st.session_state.pending_index_restore = session["id"]
                     st.rerun()
     
         with col2:  
             if st.button("🗑️", key=f"del_{session['id']}", help="Delete chat"):
                 firestore_manager.clear_session(session["id"])
+                delete_saved_index(session["id"])
                 # Clear from cache
                 if session["id"] in st.session_state.session_cache:
                     del st.session_state.session_cache[session["id"]]
                 # If deleting current session, create new one
                 if session["id"] == st.session_state.session_id:
+                    _reset_session_documents()
                     st.session_state.session_id = str(uuid.uuid4())
                     st.session_state.messages = []
                     st.session_state.rag_chat_history = []
@@ -169,9 +186,29 @@ def _render_document_upload():
     """Render the document upload section"""
     st.sidebar.subheader("📁 Upload Documents")
 
+    manager = get_collection_manager()
+    jobs = get_ingest_manager()
+    namespace = st.session_state.rag_namespace
+    index = manager.get(namespace)
+
+    # The collection was garbage-collected while idle: drop our references so the files get re-indexed
+    if st.session_state.get("document_index") is not None and st.session_state.document_index is not index:
+        st.session_state.document_index = None
+        st.session_state.rag_chain = None
+        st.session_state.uploaded_files_names = []
+        st.session_state.upload_hashes = []
+
+    # Files finished by a background job are queryable right away
+    if index is not None and index.files and st.session_state.get("rag_chain") is None:
+        st.session_state.rag_chain = create_rag_chain(index.as_retriever())
+
     # Show status if documents are loaded
     if st.session_state.get('rag_chain') is not None:
         st.sidebar.success("✅ Documents loaded!")
+    elif st.session_state.get("pending_index_restore"):
+        st.sidebar.success("📎 Saved documents will load on your first question")
+    elif jobs.active(namespace):
+        st.sidebar.info("⏳ Indexing your files...")
     else:
         st.sidebar.info("📤 Upload files")
     
@@ -184,30 +221,196 @@ def _render_document_upload():
         key="file_uploader"
     )
     
+    # Files restored from a saved chat are not in the uploader; only ever diff against what it added
+    upload_hashes = st.session_state.get("upload_hashes", [])
+
     if uploaded_files:
         current_files = [f.name for f in uploaded_files]
-        
-        # Check if files have changed
-        if current_files != st.session_state.get('uploaded_files_names', []):
-            with st.sidebar:
-                with st.spinner("Processing..."):
-                    rag_chain = process_documents(uploaded_files)
-                    if rag_chain:
-                        st.session_state.rag_chain = rag_chain
-                        st.session_state.uploaded_files_names = current_files
-                        st.session_state.rag_chat_history = []
-                        st.success(f"✅ {len(uploaded_files)} file(s) ready!")
-                    else:
-                        st.error("Failed to process")
+        current_hashes = {_file_hash(f): f for f in uploaded_files}
+
+        if index is None:
+            index = manager.get_or_create(namespace)
+            st.session_state.document_index = index
+
+        # Only the delta is loaded/embedded; unchanged files keep their chunks, and files
+        # already being indexed (or that failed) are not submitted again on reruns
+        tracked = jobs.tracked_hashes(namespace)
+        new_files = [
+            (content_hash, f) for content_hash, f in current_hashes.items()
+            if not index.has_file(content_hash) and content_hash not in tracked
+        ]
+        stale_hashes = [content_hash for content_hash in upload_hashes if content_hash not in current_hashes]
+
+        if new_files or stale_hashes:
+            # Parsing and embedding run on a background worker; the chat stays usable meanwhile
+            job = jobs.submit(namespace, index, new_files, stale_hashes)
+            if job.id != st.session_state.get("ingest_job_id"):
+                st.session_state.ingest_job_id = job.id
+                st.session_state.ingest_seen_files = 0
+                st.session_state.rag_chat_history = []
+            st.session_state.upload_hashes = list(current_hashes)
+        st.session_state.uploaded_files_names = current_files
         
         # Show uploaded files (compact)
         with st.sidebar.expander(f"📄 {len(uploaded_files)} file(s)"):
             for file in uploaded_files:
                 st.text(file.name)
     else:
-        st.session_state.rag_chain = None
+        if index is not None and upload_hashes:
+            # Removing is quick; wait briefly so the sidebar reflects it on this run
+            jobs.submit(namespace, index, [], upload_hashes).wait(timeout=5)
+        if index is not None and not index.files and not jobs.active(namespace):
+            manager.release(namespace)
+            index = None
+        if upload_hashes:
+            st.session_state.rag_chat_history = []
+        st.session_state.upload_hashes = []
+        st.session_state.document_index = index
+        if index is None or not index.files:
+            st.session_state.rag_chain = None
         st.session_state.uploaded_files_names = []
-        st.session_state.rag_chat_history = []
+
+    _render_ingest_status()
+    _save_session_index(index)
+
+
+def _render_ingest_status():
+    """Show the progress of the session's ingestion job, then its outcome once"""
+    job_id = st.session_state.get("ingest_job_id")
+    job = get_ingest_manager().get(job_id) if job_id else None
+    if job is None:
+        return
+
+    with st.sidebar:
+        if not job.done:
+            if _fragment is not None:
+                _ingest_progress_panel()
+            else:
+                _render_ingest_progress(job.snapshot())
+                st.button("🔄 Refresh progress", use_container_width=True)
+        else:
+            if st.session_state.get("ingest_reported") != job.id:
+                st.session_state.ingest_reported = job.id
+                _render_ingest_report(job)
+            # The retry button stays until clicked, so its click survives the rerun
+            snapshot = job.snapshot()
+            if snapshot["status"] == "failed" or any(info["status"] == "failed" for info in snapshot["files"]):
+                if st.button("🔁 Retry failed files", use_container_width=True):
+                    get_ingest_manager().forget(job.id)
+                    st.rerun()
+
+
+def _ingest_progress_panel():
+    """Progress of the running job; re-runs the whole app whenever a file (or the job) finishes"""
+    job = get_ingest_manager().get(st.session_state.get("ingest_job_id"))
+    if job is None:
+        return
+    snapshot = job.snapshot()
+    _render_ingest_progress(snapshot)
+    if job.done or snapshot["finished_files"] != st.session_state.get("ingest_seen_files"):
+        st.session_state.ingest_seen_files = snapshot["finished_files"]
+        st.rerun()
+
+
+if _fragment is not None:
+    _ingest_progress_panel = _fragment(run_every=RAG_CONFIG["ingest_poll_seconds"])(_ingest_progress_panel)
+
+
+def _render_ingest_progress(snapshot):
+    """Progress bar plus one line per file"""
+    finished, total = snapshot["finished_files"], snapshot["total_files"]
+    st.progress(
+        finished / total if total else 0.0,
+        text=f"⏳ Indexing {finished}/{total} file(s) in the background, you can keep chatting",
+    )
+    icons = {"queued": "🕓", "indexing": "🔄", "done": "✅", "failed": "❌"}
+    for info in snapshot["files"]:
+        line = f"{icons[info['status']]} {info['name']}"
+        if info["chunks"]:
+            line += f" ({info['chunks']} chunks)"
+        st.caption(line)
+
+
+def _render_ingest_report(job):
+    """Outcome of a finished job: ready/failed files, dedup and embedding statistics"""
+    snapshot = job.snapshot()
+    failed = [info for info in snapshot["files"] if info["status"] == "failed"]
+    ready = snapshot["total_files"] - len(failed)
+
+    if snapshot["status"] == "failed":
+        st.error(f"Failed to process: {snapshot['error']}")
+    if ready:
+        st.success(f"✅ {ready} file(s) ready!")
+    for info in failed:
+        st.error(f"Error loading {info['name']}: {info['error']}")
+
+    if snapshot["duplicates"]:
+        st.caption(
+            f"♻️ Dedup: {snapshot['duplicates']} of {snapshot['chunks']} chunks were near-duplicates "
+            f"({snapshot['duplicates'] / snapshot['chunks']:.0%} fewer embeddings)"
+        )
+    if not snapshot["chunks"]:
+        return
+    provider = get_provider()
+    if RAG_CONFIG.get("embedding_cache_enabled", True) and provider.cacheable:
+        stats = get_embedding_cache().stats()
+        st.caption(f"🧠 Embedding cache: {stats['hits']} hits / {stats['misses']} misses")
+    if provider.remote:
+        metrics = get_embedding_executor().metrics()
+        if metrics["chunks"]:
+            st.caption(
+                f"⚡ Embedding: {metrics['chunks_per_second']:.0f} chunks/s, "
+                f"{metrics['tokens_per_second']:.0f} tokens/s"
+            )
+
+
+def _save_session_index(index):
+    """Keep the saved index of the current chat session in sync with the live one"""
+    if not (RAG_CONFIG.get("persist_index", False) and st.session_state.get("auto_save_enabled", False)):
+        return
+    # Nothing to sync until a pending restore has been applied, or while files are still being indexed
+    if st.session_state.get("pending_index_restore") or get_ingest_manager().active(st.session_state.rag_namespace):
+        return
+
+    session_id = st.session_state.session_id
+    state = (session_id, index.version if index is not None else None)
+    if st.session_state.get("index_saved_for") == state:
+        return
+
+    if index is not None and index.files:
+        save_index(session_id, index)
+    elif st.session_state.get("index_saved_for", (None,))[0] == session_id:
+        delete_saved_index(session_id)
+    st.session_state.index_saved_for = state
+
+
+def _reset_session_documents():
+    """Drop documents restored for the previous chat session; uploaded files stay indexed"""
+    st.session_state.pending_index_restore = None
+    index = st.session_state.get("document_index")
+    if index is None:
+        return
+    upload_hashes = set(st.session_state.get("upload_hashes", []))
+    # A background ingestion job may be changing index.files: pick the files from a snapshot
+    with index.lock:
+        restored = [content_hash for content_hash in index.files if content_hash not in upload_hashes]
+    index.remove_files(restored)
+    namespace = st.session_state.rag_namespace
+    if not index.files and not get_ingest_manager().active(namespace):
+        get_collection_manager().release(namespace)
+        st.session_state.document_index = None
+        st.session_state.rag_chain = None
+
+
+def _file_hash(uploaded_file) -> str:
+    """Content hash of an uploaded file, memoized per upload so reruns don't rehash"""
+    if "file_hashes" not in st.session_state:
+        st.session_state.file_hashes = {}
+
+    upload_key = getattr(uploaded_file, "file_id", None) or f"{uploaded_file.name}:{uploaded_file.size}"
+    if upload_key not in st.session_state.file_hashes:
+        st.session_state.file_hashes[upload_key] = DocumentIndex.hash_upload(uploaded_file)
+    return st.session_state.file_hashes[upload_key]
 
 
 def _render_example_questions():
@@ -0,0 +1,99 @@
+"""
+Live rendering of an agent run: tool-call status and streamed answer tokens
+"""
+import threading
+import time
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from agents.agent_setup import ANSWER_TAG
+
+
+def _preview(text, limit: int = 60) -> str:
+    text = " ".join(str(text).split())
+    return text if len(text) <= limit else text[:limit - 1] + "…"
+
+
+class ChatStreamHandler(BaseCallbackHandler):
+    """
+    Callback handler that renders an agent run into the assistant's chat bubble.
+
+    Tokens of the agent's LLM are written into the answer placeholder as they
+    arrive, so the answer starts showing with its first token instead of after
+    the whole multi-step run. Tool calls are listed in a status box above the
+    answer. Tool callbacks may arrive from the executor's tool threads, which
+    carry the script run context; a lock keeps their updates in order.
+    """
+
+    def __init__(self, status_slot, answer_placeholder):
+        """
+        Args:
+            status_slot: Empty placeholder the tool status box is created in (on the first tool call)
+            answer_placeholder: Empty placeholder the answer is streamed into
+        """
+        self.status_slot = status_slot
+        self.answer = answer_placeholder
+        self.text = ""
+        self.status = None
+        self._answer_runs = set()
+        self._tools = {}
+        self._lock = threading.Lock()
+
+        self.answer.caption("🤔 Thinking...")
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, tags=None, **kwargs):
+        if ANSWER_TAG in (tags or []):
+            self._answer_runs.add(run_id)
+            self.text = ""
+
+    def on_llm_new_token(self, token: str, *, run_id, **kwargs):
+        if run_id not in self._answer_runs or not token:
+            return
+        self.text += token
+        self.answer.markdown(self.text + "▌")
+
+    def on_tool_start(self, serialized, input_str, *, run_id, **kwargs):
+        name = (serialized or {}).get("name") or kwargs.get("name") or "tool"
+        with self._lock:
+            # Text streamed before a tool call was a preamble, not the answer
+            if self.text:
+                self.text = ""
+                self.answer.caption("🤔 Thinking...")
+            if self.status is None:
+                self.status = self.status_slot.status("🛠️ Using tools...", expanded=True)
+            line = self.status.empty()
+            line.markdown(f"⏳ `{name}` {_preview(input_str)}")
+            self._tools[run_id] = (name, line, time.perf_counter())
+            self.status.update(label=f"🛠️ Running {name}...", state="running")
+
+    def on_tool_end(self, output, *, run_id, **kwargs):
+        self._finish_tool(run_id, "✅")
+
+    def on_tool_error(self, error, *, run_id, **kwargs):
+        self._finish_tool(run_id, "❌")
+
+    def _finish_tool(self, run_id, icon: str):
+        with self._lock:
+            if run_id not in self._tools:
+                return
+            name, line, started = self._tools[run_id]
+            line.markdown(f"{icon} `{name}` ({time.perf_counter() - started:.1f}s)")
+
+    def finish(self, answer: str):
+        """
+        Show the final answer and collapse the tool status
+
+        Args:
+            answer: The executor's output (authoritative over the streamed text)
+        """
+        self.answer.markdown(answer)
+        with self._lock:
+            if self.status is not None:
+                self.status.update(label=f"🛠️ Used {len(self._tools)} tool call(s)", state="complete", expanded=False)
+
+    def fail(self):
+        """Mark the tool status as failed after an error"""
+        self.answer.empty()
+        with self._lock:
+            if self.status is not None:
+                self.status.update(state="error", expanded=False)